@@ -0,0 +1,60 @@
+/**
+ * Tests for Aho-Corasick Multi-Pattern Matcher
+ */
+
+import { AhoCorasick } from '../utils/ahoCorasick.js';
+
+describe('AhoCorasick', () => {
+    test('should flag every pattern that occurs in the text', () => {
+        const matcher = new AhoCorasick(['he', 'she', 'his', 'hers']);
+        const hits = matcher.search('ushers');
+
+        expect(Array.from(hits)).toEqual([1, 1, 0, 1]);
+    });
+
+    test('should find overlapping and nested patterns', () => {
+        const matcher = new AhoCorasick(['seed phrase', 'phrase', 'recovery phrase', 'ssn']);
+        const hits = matcher.search('send your seed phrase');
+
+        expect(hits[0]).toBe(1);
+        expect(hits[1]).toBe(1);
+        expect(hits[2]).toBe(0);
+        expect(hits[3]).toBe(0);
+    });
+
+    test('should agree with String.includes on random inputs', () => {
+        const alphabet = 'abc';
+        const randomString = (length) => Array.from(
+            { length },
+            (_, i) => alphabet[(i * 7 + length * 13) % alphabet.length]
+        ).join('');
+
+        const patterns = ['a', 'ab', 'bca', 'cab', 'abcabc', 'ccc', 'bb'];
+        const matcher = new AhoCorasick(patterns);
+
+        for (let length = 0; length < 40; length++) {
+            const text = randomString(length);
+            const hits = matcher.search(text);
+            patterns.forEach((pattern, id) => {
+                expect(hits[id] === 1).toBe(text.includes(pattern));
+            });
+        }
+    });
+
+    test('should report the position of every occurrence', () => {
+        const matcher = new AhoCorasick(['he', 'she', 'hers']);
+
+        expect(matcher.findAll('ushers she')).toEqual([
+            { id: 1, start: 1, end: 4 },
+            { id: 0, start: 2, end: 4 },
+            { id: 2, start: 2, end: 6 },
+            { id: 1, start: 7, end: 10 },
+            { id: 0, start: 8, end: 10 },
+        ]);
+    });
+
+    test('should return no hits for empty text', () => {
+        const matcher = new AhoCorasick(['urgent']);
+        expect(Array.from(matcher.search(''))).toEqual([0]);
+    });
+});
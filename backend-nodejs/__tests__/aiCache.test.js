@@ -0,0 +1,84 @@
+/**
+ * Tests for AI Verdict Cache
+ */
+
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { AIVerdictCache, normalizeMessage } from '../services/aiCache.js';
+
+const verdict = { isPhishing: true, confidence: 0.9, phishingProbability: 0.92, legitimateProbability: 0.08, riskFactors: ['urgency'] };
+
+describe('AI Verdict Cache', () => {
+    let snapshotPath;
+
+    beforeEach(() => {
+        snapshotPath = path.join(fs.mkdtempSync(path.join(os.tmpdir(), 'phishguard-')), 'ai-cache.json');
+    });
+
+    test('should key messages by normalized content', () => {
+        const cache = new AIVerdictCache({ namespace: 'v1' });
+
+        expect(normalizeMessage('  Verify\r\n your   account ')).toBe('Verify your account');
+        expect(cache.keyFor('Verify  your\naccount')).toBe(cache.keyFor('Verify your account'));
+        expect(cache.keyFor('Verify your account')).not.toBe(cache.keyFor('VERIFY your account'));
+    });
+
+    test('should isolate namespaces so prompt or model changes miss', () => {
+        const v1 = new AIVerdictCache({ namespace: 'model-a:prompt-1' });
+        const v2 = new AIVerdictCache({ namespace: 'model-a:prompt-2' });
+
+        expect(v1.keyFor('hello')).not.toBe(v2.keyFor('hello'));
+    });
+
+    test('should track hit ratio', () => {
+        const cache = new AIVerdictCache({ namespace: 'v1' });
+        const key = cache.keyFor('Claim your prize');
+
+        expect(cache.get(key)).toBeUndefined();
+        cache.set(key, verdict);
+        expect(cache.get(key)).toBe(verdict);
+        expect(cache.stats()).toMatchObject({ hits: 1, misses: 1, hit_ratio: 0.5, size: 1 });
+    });
+
+    test('should restore live entries from a snapshot', async () => {
+        let now = 1000;
+        const revive = (data) => ({ ...data, revived: true });
+        const cache = new AIVerdictCache({ namespace: 'v1', ttlMs: 500, snapshotPath, now: () => now });
+        cache.set(cache.keyFor('Claim your prize'), verdict);
+
+        expect(await cache.saveSnapshot()).toBe(true);
+        expect(await cache.saveSnapshot()).toBe(false); // nothing changed
+
+        now = 1200;
+        const restarted = new AIVerdictCache({ namespace: 'v1', ttlMs: 500, snapshotPath, revive, now: () => now });
+        expect(restarted.loadSnapshot()).toBe(1);
+        expect(restarted.get(restarted.keyFor('Claim your prize'))).toMatchObject({ confidence: 0.9, revived: true });
+
+        // Remaining lifetime carries over from the original entry
+        now = 1600;
+        expect(restarted.get(restarted.keyFor('Claim your prize'))).toBeUndefined();
+    });
+
+    test('should ignore snapshots from another namespace', async () => {
+        const cache = new AIVerdictCache({ namespace: 'v1', snapshotPath });
+        cache.set(cache.keyFor('hello'), verdict);
+        await cache.saveSnapshot();
+
+        const changed = new AIVerdictCache({ namespace: 'v2', snapshotPath });
+        expect(changed.loadSnapshot()).toBe(0);
+    });
+
+    test('should clear entries and the snapshot on invalidation', async () => {
+        const cache = new AIVerdictCache({ namespace: 'v1', snapshotPath });
+        const key = cache.keyFor('hello');
+        cache.set(key, verdict);
+        await cache.saveSnapshot();
+
+        cache.invalidate();
+
+        expect(cache.get(key)).toBeUndefined();
+        expect(fs.existsSync(snapshotPath)).toBe(false);
+        expect(cache.stats().invalidations).toBe(1);
+    });
+});
@@ -0,0 +1,165 @@
+/**
+ * Tests for AI providers: the deterministic mock and the OpenAI-compatible transport
+ */
+
+import http from 'http';
+import config from '../config.js';
+import { AIService } from '../services/aiService.js';
+import { MockProvider, OpenAICompatibleProvider, createAIProvider } from '../services/aiProviders/index.js';
+import { toJsonSchema } from '../services/aiProviders/openAIProvider.js';
+import { MicroBatcher } from '../utils/microBatcher.js';
+
+const mock = (options = {}) => new MockProvider({
+    distribution: 'fixed', latencyMs: 5, spread: 0, errorRate: 0, malformedRate: 0, seed: 7, ...options,
+});
+
+describe('Mock AI provider', () => {
+    test('should replay the same latencies and verdicts for the same seed', async () => {
+        const first = mock({ distribution: 'lognormal', latencyMs: 100, spread: 0.5 });
+        const second = mock({ distribution: 'lognormal', latencyMs: 100, spread: 0.5 });
+        const latencies = Array.from({ length: 50 }, () => first.sampleLatency());
+
+        expect(Array.from({ length: 50 }, () => second.sampleLatency())).toEqual(latencies);
+        expect(new Set(latencies).size).toBeGreaterThan(1);
+        expect(latencies.every((ms) => ms > 0)).toBe(true);
+
+        const request = { userText: 'hello', timeout: 1000 };
+        expect(await mock().generate(request)).toBe(await mock().generate(request));
+    });
+
+    test('should run the full AI service path with synthetic verdicts', async () => {
+        const ai = new AIService({ provider: mock() });
+        const result = await ai.analyze('Your parcel is waiting, confirm delivery');
+
+        expect(typeof result.isPhishing).toBe('boolean');
+        expect(result.modelName).toContain('mock');
+        expect(ai.cache.stats().size).toBe(1);
+        expect(ai.socketStats()).toBeNull();
+    });
+
+    test('should answer a batch with one verdict per message', async () => {
+        const ai = new AIService({ provider: mock() });
+        ai.batcher = new MicroBatcher({ windowMs: 5, maxSize: 4, handler: (items) => ai._flushBatch(items) });
+
+        const results = await Promise.all(['one', 'two', 'three'].map((text) => ai.analyze(text)));
+
+        expect(results).toHaveLength(3);
+        expect(ai.batchFallbacks).toBe(0);
+        expect(results[0].phishingProbability).toBe((await new AIService({ provider: mock() }).analyze('one')).phishingProbability);
+    });
+
+    test('should inject failures that count against the breaker', async () => {
+        const ai = new AIService({ provider: mock({ errorRate: 1 }) });
+
+        await expect(ai.analyze('hello')).rejects.toThrow('AI analysis failed');
+        expect(ai.breakerStats()).toMatchObject({ window_calls: 1, error_rate: 1 });
+
+        const slow = mock({ latencyMs: 50 });
+        await expect(slow.generate({ userText: 'hi', timeout: 10 })).rejects.toMatchObject({ code: 'ECONNABORTED' });
+    });
+
+    test('should stream the reply in fragments', async () => {
+        const ai = new AIService({ provider: mock() });
+        config.ai.streaming.enabled = true;
+        try {
+            const result = await ai.analyze('Stream me');
+            expect(typeof result.phishingProbability).toBe('number');
+        } finally {
+            config.ai.streaming.enabled = false;
+        }
+    });
+
+    test('should reject unknown providers', () => {
+        expect(() => createAIProvider('carrier-pigeon')).toThrow('Unknown AI provider');
+    });
+});
+
+describe('OpenAI-compatible provider', () => {
+    const verdict = {
+        isPhishing: true,
+        confidence: 0.8,
+        phishingProbability: 0.9,
+        legitimateProbability: 0.1,
+        riskFactors: ['Credential request'],
+    };
+
+    let server;
+    let requests;
+    let provider;
+
+    beforeAll(async () => {
+        server = http.createServer((req, res) => {
+            let raw = '';
+            req.on('data', (chunk) => {
+                raw += chunk;
+            });
+            req.on('end', () => {
+                const body = JSON.parse(raw);
+                requests.push({ url: req.url, authorization: req.headers.authorization, body });
+
+                const content = JSON.stringify(verdict);
+                if (body.stream) {
+                    res.writeHead(200, { 'Content-Type': 'text/event-stream' });
+                    for (const piece of [content.slice(0, 40), content.slice(40)]) {
+                        res.write(`data: ${JSON.stringify({ choices: [{ delta: { content: piece } }] })}\n\n`);
+                    }
+                    res.end('data: [DONE]\n\n');
+                    return;
+                }
+
+                const payload = JSON.stringify({ choices: [{ message: { role: 'assistant', content } }] });
+                res.writeHead(200, { 'Content-Type': 'application/json', 'Content-Length': Buffer.byteLength(payload) });
+                res.end(payload);
+            });
+        });
+        await new Promise((resolve) => server.listen(0, '127.0.0.1', resolve));
+    });
+
+    afterAll(async () => {
+        await new Promise((resolve) => server.close(resolve));
+    });
+
+    beforeEach(() => {
+        requests = [];
+        provider = new OpenAICompatibleProvider({
+            baseURL: `http://127.0.0.1:${server.address().port}/v1`,
+            apiKey: 'local-key',
+            model: 'phish-7b',
+        });
+    });
+
+    afterEach(() => {
+        provider.http.agent.destroy();
+    });
+
+    test('should send a chat completion with a JSON schema response format', async () => {
+        const ai = new AIService({ provider });
+        const result = await ai.analyze('Verify your password');
+
+        expect(result.isPhishing).toBe(true);
+        expect(result.modelName).toContain('phish-7b');
+        expect(requests[0].url).toBe('/v1/chat/completions');
+        expect(requests[0].authorization).toBe('Bearer local-key');
+        expect(requests[0].body.messages.map(({ role }) => role)).toEqual(['system', 'user']);
+        expect(requests[0].body.response_format.json_schema.schema.properties.isPhishing).toEqual({ type: 'boolean' });
+        expect(provider.socketStats().connections_opened).toBe(1);
+    });
+
+    test('should stream content deltas until [DONE]', async () => {
+        const fragments = await provider.generateStream({ systemInstruction: 'x', userText: 'y', responseSchema: {}, timeout: 1000 });
+        let text = '';
+        for await (const fragment of fragments) {
+            text += fragment;
+        }
+
+        expect(JSON.parse(text)).toEqual(verdict);
+        expect(requests[0].body.stream).toBe(true);
+    });
+
+    test('should convert Gemini schema notation to JSON Schema', () => {
+        expect(toJsonSchema({
+            type: 'ARRAY',
+            items: { type: 'OBJECT', properties: { id: { type: 'INTEGER' } }, propertyOrdering: ['id'] },
+        })).toEqual({ type: 'array', items: { type: 'object', properties: { id: { type: 'integer' } } } });
+    });
+});
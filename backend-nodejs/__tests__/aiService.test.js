@@ -0,0 +1,218 @@
+/**
+ * Tests for Gemini structured output and streaming against a local mock server
+ */
+
+import fs from 'fs';
+import https from 'https';
+import { fileURLToPath } from 'url';
+import config from '../config.js';
+import { AIService } from '../services/aiService.js';
+import { GeminiProvider } from '../services/aiProviders/index.js';
+import { MicroBatcher } from '../utils/microBatcher.js';
+
+const fixture = (name) => fs.readFileSync(fileURLToPath(new URL(`./fixtures/${name}`, import.meta.url)));
+const cert = fixture('localhost-cert.pem');
+const key = fixture('localhost-key.pem');
+
+const verdictFor = (text) => {
+    const isPhishing = /verify|password/i.test(text);
+    return {
+        isPhishing,
+        confidence: 0.9,
+        phishingProbability: isPhishing ? 0.9 : 0.1,
+        legitimateProbability: isPhishing ? 0.1 : 0.9,
+        riskFactors: isPhishing ? ['Credential request'] : [],
+    };
+};
+
+/**
+ * Mimic generateContent: reject requests that are not structured-output
+ * shaped, then answer with JSON matching the requested schema
+ */
+const answer = (request) => {
+    const { systemInstruction, contents, generationConfig } = request;
+    if (!systemInstruction?.parts?.[0]?.text ||
+        generationConfig?.responseMimeType !== 'application/json' ||
+        !generationConfig.responseSchema ||
+        contents?.length !== 1) {
+        return { status: 400, body: { error: { message: 'not a structured-output request' } } };
+    }
+
+    const userText = contents[0].parts[0].text;
+    const verdict = generationConfig.responseSchema.type === 'ARRAY'
+        ? [...userText.matchAll(/\*\*Message (\d+):\*\*\n"""\n([\s\S]*?)\n"""/g)]
+            .map(([, id, text]) => ({ id: Number(id), ...verdictFor(text) }))
+        : verdictFor(userText);
+
+    return {
+        status: 200,
+        body: { candidates: [{ content: { parts: [{ text: JSON.stringify(verdict) }] } }] },
+    };
+};
+
+const sseEvent = (text) => `data: ${JSON.stringify({ candidates: [{ content: { parts: [{ text }] } }] })}\n\n`;
+
+describe('Gemini structured output', () => {
+    let server;
+    let baseURL;
+    let requests;
+    let override;
+    let streamTail;
+    let streamClosed;
+    let ai;
+
+    beforeAll(async () => {
+        server = https.createServer({ key, cert }, (req, res) => {
+            let raw = '';
+            req.on('data', (chunk) => {
+                raw += chunk;
+            });
+            req.on('end', () => {
+                const request = JSON.parse(raw);
+                requests.push(request);
+
+                if (req.url.includes(':streamGenerateContent')) {
+                    // Verdict fields first, riskFactors only when the test releases them
+                    res.writeHead(200, { 'Content-Type': 'text/event-stream' });
+                    res.write(sseEvent('{"isPhishing": true, "confidence": 0.9, '));
+                    res.write(sseEvent('"phishingProbability": 0.85, "legitimateProbability": 0.15, '));
+                    streamTail = () => res.end(sseEvent('"riskFactors": ["Credential request"]}'));
+                    res.on('close', () => {
+                        streamClosed = true;
+                    });
+                    return;
+                }
+
+                const { status, body } = override ? override(request) : answer(request);
+                const payload = JSON.stringify(body);
+                res.writeHead(status, {
+                    'Content-Type': 'application/json',
+                    'Content-Length': Buffer.byteLength(payload),
+                });
+                res.end(payload);
+            });
+        });
+        await new Promise((resolve) => server.listen(0, '127.0.0.1', resolve));
+        baseURL = `https://localhost:${server.address().port}`;
+    });
+
+    afterAll(async () => {
+        await new Promise((resolve) => server.close(resolve));
+    });
+
+    beforeEach(() => {
+        requests = [];
+        override = null;
+        streamTail = null;
+        streamClosed = false;
+        ai = new AIService({ provider: new GeminiProvider({ apiKey: 'test-key', baseURL, tls: { ca: cert } }) });
+    });
+
+    afterEach(() => {
+        ai.provider.http.agent.destroy();
+    });
+
+    test('should send only the message as user content', async () => {
+        const text = 'Your password expires today, verify here';
+        const result = await ai.analyze(text);
+
+        expect(result.isPhishing).toBe(true);
+        expect(result.riskFactors).toEqual(['Credential request']);
+        expect(requests).toHaveLength(1);
+        expect(requests[0].contents[0].parts[0].text).toBe(text);
+        expect(requests[0].systemInstruction.parts[0].text).toContain('phishing and scam detection');
+        expect(requests[0].generationConfig.responseSchema.required).toContain('isPhishing');
+    });
+
+    test('should parse a batched structured response', async () => {
+        ai.batcher = new MicroBatcher({ windowMs: 5, maxSize: 4, handler: (items) => ai._flushBatch(items) });
+
+        const [first, second] = await Promise.all([
+            ai.analyze('Please verify your account'),
+            ai.analyze('See you at the game on Sunday'),
+        ]);
+
+        expect(requests).toHaveLength(1);
+        expect(requests[0].generationConfig.responseSchema.type).toBe('ARRAY');
+        expect(first.isPhishing).toBe(true);
+        expect(second.isPhishing).toBe(false);
+    });
+
+    test('should reject a reply that is not strict JSON', async () => {
+        override = () => ({
+            status: 200,
+            body: { candidates: [{ content: { parts: [{ text: '```json\n{"isPhishing": true}\n```' }] } }] },
+        });
+
+        await expect(ai.analyze('hello')).rejects.toThrow('AI analysis failed');
+    });
+
+    describe('streaming', () => {
+        const waitFor = async (condition) => {
+            for (let i = 0; i < 100 && !condition(); i++) {
+                await new Promise((resolve) => setTimeout(resolve, 10));
+            }
+        };
+
+        beforeAll(() => {
+            config.ai.streaming.enabled = true;
+        });
+
+        afterAll(() => {
+            config.ai.streaming.enabled = false;
+            config.ai.streaming.detailTimeoutMs = 2000;
+        });
+
+        test('should resolve on the early fields and cache the full verdict later', async () => {
+            const text = 'Verify your password now';
+            const result = await ai.analyze(text);
+
+            expect(result.isPhishing).toBe(true);
+            expect(result.phishingProbability).toBe(0.85);
+            expect(result.riskFactors).toEqual([]);
+            expect(streamTail).not.toBeNull();
+
+            streamTail();
+            await waitFor(() => ai.cache.get(ai.cache.keyFor(text))?.riskFactors.length > 0);
+            expect(ai.cache.get(ai.cache.keyFor(text)).riskFactors).toEqual(['Credential request']);
+        });
+
+        test('should hold the queue slot until the stream ends', async () => {
+            await ai.analyze('Verify your password now');
+            expect(ai.queue.active).toBe(1);
+
+            streamTail();
+            await waitFor(() => ai.queue.active === 0);
+            expect(ai.queue.active).toBe(0);
+        });
+
+        test('should cache the early verdict only briefly', async () => {
+            let now = 0;
+            ai.cache._cache._now = () => now;
+            const text = 'Verify your password now';
+            const key = ai.cache.keyFor(text);
+
+            await ai.analyze(text);
+            expect(ai.cache.get(key)).toBeDefined();
+            now = config.ai.streaming.partialCacheTtlMs;
+            expect(ai.cache.get(key)).toBeUndefined();
+
+            streamTail();
+            await waitFor(() => ai.queue.active === 0);
+            now += config.ai.streaming.partialCacheTtlMs;
+            expect(ai.cache.get(key).riskFactors).toEqual(['Credential request']);
+        });
+
+        test('should drop risk factors that miss the detail deadline', async () => {
+            config.ai.streaming.detailTimeoutMs = 20;
+            const text = 'Confirm your login details';
+
+            const result = await ai.analyze(text);
+            await waitFor(() => streamClosed);
+
+            expect(result.isPhishing).toBe(true);
+            expect(streamClosed).toBe(true);
+            expect(ai.cache.get(ai.cache.keyFor(text)).riskFactors).toEqual([]);
+        });
+    });
+});
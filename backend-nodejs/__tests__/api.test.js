@@ -2,6 +2,7 @@
  * Integration Tests for Analyze Endpoint
  */
 
+import http from 'http';
 import request from 'supertest';
 import { jest } from '@jest/globals';
 
@@ -114,6 +115,142 @@ describe('POST /analyze', () => {
     });
 });
 
+describe('POST /analyze/batch', () => {
+    test('should return one result per item, in order, with client IDs', async () => {
+        const phishing = 'URGENT!!! Verify your password at http://192.168.1.1/verify now!';
+        const response = await request(app)
+            .post('/analyze/batch')
+            .send({
+                items: [
+                    { id: 'msg-1', text: phishing },
+                    { id: 42, text: 'See you at the meeting tomorrow.' },
+                    { id: 'msg-3', text: phishing },
+                ],
+            })
+            .expect('Content-Type', /json/)
+            .expect(200);
+
+        expect(response.body.results.map(({ id }) => id)).toEqual(['msg-1', 42, 'msg-3']);
+        expect(response.body.results[0]).toHaveProperty('risk_score');
+        expect(response.body.results[2].risk_score).toBe(response.body.results[0].risk_score);
+        expect(response.body.metadata).toMatchObject({ items: 3, unique: 2 });
+    });
+
+    test('should report every invalid item at once', async () => {
+        const response = await request(app)
+            .post('/analyze/batch')
+            .send({ items: [{ id: 'a', text: '' }, { text: 'no id' }] })
+            .expect(400);
+
+        expect(response.body).toHaveProperty('error');
+    });
+
+    test('should reject duplicate IDs', async () => {
+        await request(app)
+            .post('/analyze/batch')
+            .send({ items: [{ id: 'a', text: 'one' }, { id: 'a', text: 'two' }] })
+            .expect(400);
+    });
+
+    test('should reject empty and oversized batches', async () => {
+        await request(app)
+            .post('/analyze/batch')
+            .send({ items: [] })
+            .expect(400);
+
+        const items = Array.from({ length: 51 }, (_, i) => ({ id: i, text: `message ${i}` }));
+        await request(app)
+            .post('/analyze/batch')
+            .send({ items })
+            .expect(400);
+    });
+});
+
+describe('POST /analyze/stream', () => {
+    const ndjsonLines = (text) => text.trim().split('\n').map((line) => JSON.parse(line));
+
+    test('should stream one verdict per line and a summary', async () => {
+        const body = [
+            JSON.stringify({ id: 'msg-1', text: 'URGENT!!! Verify your password at http://192.168.1.1/verify' }),
+            JSON.stringify({ id: 'msg-2', text: 'See you at the meeting tomorrow.' }),
+            '',
+        ].join('\n');
+
+        const response = await request(app)
+            .post('/analyze/stream')
+            .set('Content-Type', 'application/x-ndjson')
+            .send(body)
+            .buffer(true)
+            .parse((res, callback) => {
+                let text = '';
+                res.on('data', (chunk) => { text += chunk; });
+                res.on('end', () => callback(null, text));
+            })
+            .expect('Content-Type', /application\/x-ndjson/)
+            .expect(200);
+
+        const lines = ndjsonLines(response.body);
+        expect(lines.filter((line) => line.risk_score !== undefined).map(({ id }) => id).sort()).toEqual(['msg-1', 'msg-2']);
+        expect(lines[lines.length - 1].summary).toMatchObject({ lines: 2, analyzed: 2, invalid: 0 });
+    });
+
+    test('should report bad lines without stopping the stream', async () => {
+        const body = ['not json', JSON.stringify({ id: 7, text: '' }), JSON.stringify({ id: 8, text: 'Hello' })].join('\n');
+
+        const response = await request(app)
+            .post('/analyze/stream')
+            .set('Content-Type', 'application/x-ndjson')
+            .send(body)
+            .buffer(true)
+            .parse((res, callback) => {
+                let text = '';
+                res.on('data', (chunk) => { text += chunk; });
+                res.on('end', () => callback(null, text));
+            })
+            .expect(200);
+
+        const lines = ndjsonLines(response.body);
+        expect(lines).toContainEqual({ line: 1, error: 'Invalid JSON' });
+        expect(lines.find(({ id }) => id === 7)).toMatchObject({ line: 2 });
+        expect(lines[lines.length - 1].summary).toMatchObject({ lines: 3, analyzed: 1, invalid: 2 });
+    });
+
+    test('should reject other content types', async () => {
+        await request(app)
+            .post('/analyze/stream')
+            .send({ id: 1, text: 'Hello' })
+            .expect(415);
+    });
+
+    test('should limit how many scans one client keeps open', async () => {
+        const server = app.listen(0);
+        try {
+            const open = http.request({
+                port: server.address().port,
+                method: 'POST',
+                path: '/analyze/stream',
+                headers: { 'Content-Type': 'application/x-ndjson' },
+            });
+            const opened = new Promise((resolve) => open.on('response', resolve));
+            open.write(`${JSON.stringify({ id: 1, text: 'Hello' })}\n`);
+            const response = await opened;
+            response.resume();
+
+            await request(server)
+                .post('/analyze/stream')
+                .set('Content-Type', 'application/x-ndjson')
+                .send('')
+                .expect(429);
+
+            const closed = new Promise((resolve) => response.on('end', resolve));
+            open.end();
+            await closed;
+        } finally {
+            await new Promise((resolve) => server.close(resolve));
+        }
+    });
+});
+
 describe('GET /health', () => {
     test('should return health status', async () => {
         const response = await request(app)
@@ -0,0 +1,120 @@
+/**
+ * Tests for the token bucket, the API key pool and Gemini key scheduling
+ */
+
+import { jest } from '@jest/globals';
+import { ApiKeyPool } from '../utils/apiKeyPool.js';
+import { QueueRejectedError } from '../utils/concurrencyLimiter.js';
+import { TokenBucket } from '../utils/tokenBucket.js';
+import { GeminiProvider, retryAfterMs } from '../services/aiProviders/geminiProvider.js';
+
+const geminiReply = (text) => ({ data: { candidates: [{ content: { parts: [{ text }] } }] } });
+
+const httpError = (status, headers = {}) => Object.assign(
+    new Error(`Request failed with status code ${status}`),
+    { response: { status, headers, data: {} } }
+);
+
+describe('Token Bucket', () => {
+    test('should refill at the configured rate up to the burst', () => {
+        let now = 0;
+        const bucket = new TokenBucket({ ratePerSec: 2, burst: 4, now: () => now });
+
+        expect([1, 2, 3, 4, 5].map(() => bucket.tryTake())).toEqual([true, true, true, true, false]);
+        expect(bucket.msUntil(1)).toBe(500);
+
+        now = 10000;
+        expect(bucket.available).toBe(4);
+        expect(bucket.msUntil(5)).toBe(Infinity);
+    });
+});
+
+describe('API Key Pool', () => {
+    test('should rotate across keys without a budget', async () => {
+        const pool = new ApiKeyPool([{ key: 'key-aaaa' }, { key: 'key-bbbb' }, { key: 'key-cccc' }]);
+        const used = [];
+        for (let i = 0; i < 6; i++) {
+            used.push((await pool.acquire()).key);
+        }
+
+        expect(used).toEqual(['key-aaaa', 'key-bbbb', 'key-cccc', 'key-aaaa', 'key-bbbb', 'key-cccc']);
+        expect(pool.stats().per_key[0]).toMatchObject({ key: '1:...aaaa', requests: 2 });
+    });
+
+    test('should favour the key with the most budget left and shed when all are spent', async () => {
+        let now = 0;
+        const pool = new ApiKeyPool([{ key: 'small', rpm: 10 }, { key: 'large', rpm: 600 }], { now: () => now });
+
+        const counts = { small: 0, large: 0 };
+        for (let i = 0; i < 61; i++) {
+            counts[(await pool.acquire(now)).key]++;
+        }
+
+        expect(counts.small).toBe(1);
+        expect(counts.large).toBe(60);
+        await expect(pool.acquire(now)).rejects.toBeInstanceOf(QueueRejectedError);
+        expect(pool.stats().exhausted).toBe(1);
+    });
+
+    test('should cool a throttled key for Retry-After or a jittered backoff', async () => {
+        let now = 0;
+        const pool = new ApiKeyPool([{ key: 'one' }, { key: 'two' }], {
+            backoffBaseMs: 1000,
+            random: () => 0.5,
+            now: () => now,
+        });
+
+        const first = await pool.acquire();
+        expect(pool.recordThrottle(first, 30000)).toBe(30000);
+        expect((await pool.acquire()).key).toBe('two');
+        expect((await pool.acquire()).key).toBe('two');
+
+        const second = await pool.acquire();
+        expect(pool.recordThrottle(second)).toBe(500);
+        expect(pool.recordThrottle(second)).toBe(1000); // backoff doubles per strike
+        expect(pool.stats().usable).toBe(0);
+
+        now = 30000;
+        expect(pool.stats().usable).toBe(2);
+    });
+});
+
+describe('Gemini key scheduling', () => {
+    test('should read Retry-After headers and RetryInfo details', () => {
+        expect(retryAfterMs({ headers: { 'retry-after': '7' } })).toBe(7000);
+        expect(retryAfterMs({ headers: { 'retry-after': new Date(61000).toUTCString() } }, 1000)).toBe(60000);
+        expect(retryAfterMs({ headers: {}, data: { error: { details: [{ retryDelay: '37s' }] } } })).toBe(37000);
+        expect(retryAfterMs({ headers: {} })).toBeNull();
+    });
+
+    test('should retry a throttled call on another key', async () => {
+        const provider = new GeminiProvider({ apiKeys: [{ key: 'first-key' }, { key: 'second-key' }] });
+        const post = jest.fn(async (path) => {
+            if (path.includes('first-key')) {
+                throw httpError(429, { 'retry-after': '60' });
+            }
+            return geminiReply('{"ok": true}');
+        });
+        provider.http.post = post;
+
+        expect(await provider.generate({ userText: 'hi', timeout: 1000 })).toBe('{"ok": true}');
+        expect(post).toHaveBeenCalledTimes(2);
+        expect(provider.keyStats().per_key.map(({ throttled }) => throttled)).toEqual([1, 0]);
+        provider.http.agent.destroy();
+    });
+
+    test('should back off after a 503 and give up when retries run out', async () => {
+        const provider = new GeminiProvider({
+            apiKey: 'only-key',
+            keyPool: { maxRetries: 2, backoffBaseMs: 5, backoffMaxMs: 20 },
+        });
+        provider.http.post = jest.fn(async () => {
+            throw httpError(503);
+        });
+
+        await expect(provider.generate({ userText: 'hi', timeout: 1000 })).rejects.toMatchObject({ response: { status: 503 } });
+        expect(provider.http.post).toHaveBeenCalledTimes(3);
+        expect(provider.keyStats().per_key[0].unavailable).toBe(3);
+        provider.http.agent.destroy();
+    });
+});
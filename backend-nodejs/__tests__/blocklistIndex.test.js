@@ -0,0 +1,58 @@
+/**
+ * Tests for Compact Blocklist Index
+ */
+
+import {
+    BlocklistIndex,
+    buildBlocklistBuffer,
+    normalizeBlocklistKey,
+    parseFeedLine,
+    splitCsvLine,
+} from '../utils/blocklistIndex.js';
+
+describe('Blocklist Index', () => {
+    const index = new BlocklistIndex(buildBlocklistBuffer([
+        'evil.com',
+        'Evil.com',
+        'http://Phish.example.org/login/',
+        'bad.tk.',
+    ]));
+
+    test('should deduplicate normalized entries', () => {
+        expect(index.size).toBe(3);
+    });
+
+    test('should match listed hosts and their subdomains', () => {
+        expect(index.hasHost('evil.com')).toBe(true);
+        expect(index.hasHost('secure.login.evil.com')).toBe(true);
+        expect(index.hasHost('x.bad.tk')).toBe(true);
+        expect(index.hasHost('notevil.com')).toBe(false);
+        expect(index.hasHost('com')).toBe(false);
+    });
+
+    test('should match listed URLs regardless of scheme and trailing slash', () => {
+        expect(index.has('https://phish.example.org/login')).toBe(true);
+        expect(index.has('phish.example.org/login/')).toBe(true);
+        expect(index.has('https://phish.example.org/other')).toBe(false);
+        expect(index.hasHost('phish.example.org')).toBe(false);
+    });
+
+    test('should reject buffers that are not blocklist indexes', () => {
+        expect(() => new BlocklistIndex(Buffer.from('not an index at all'))).toThrow(/magic/);
+    });
+
+    test('should parse plain, hosts-file and CSV feed lines', () => {
+        expect(parseFeedLine('# comment')).toBe('');
+        expect(parseFeedLine('evil.com')).toBe('evil.com');
+        expect(parseFeedLine('0.0.0.0 ads.bad.net')).toBe('ads.bad.net');
+        expect(parseFeedLine('1,"http://x.y.z/a",online', { column: 1 })).toBe('http://x.y.z/a');
+        expect(parseFeedLine('id,url,status', { column: 1 })).toBe('');
+        expect(parseFeedLine('7,"Phish, Inc",http://bad.example/a', { column: 2 })).toBe('http://bad.example/a');
+        expect(splitCsvLine('"a ""quoted"" b",c')).toEqual(['a "quoted" b', 'c']);
+    });
+
+    test('should normalize URL keys', () => {
+        expect(normalizeBlocklistKey('HTTPS://Evil.COM/Path/#frag')).toBe('evil.com/Path');
+        expect(normalizeBlocklistKey('*.evil.com')).toBe('evil.com');
+    });
+});
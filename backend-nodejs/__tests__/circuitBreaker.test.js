@@ -0,0 +1,135 @@
+/**
+ * Tests for Circuit Breaker and adaptive AI timeout
+ */
+
+import { jest } from '@jest/globals';
+import { CircuitBreaker, CircuitState } from '../utils/circuitBreaker.js';
+import { LatencyWindow } from '../utils/latencyWindow.js';
+import { AIService } from '../services/aiService.js';
+import { GeminiProvider } from '../services/aiProviders/index.js';
+
+describe('Circuit Breaker', () => {
+    let now;
+    const clock = () => now;
+
+    beforeEach(() => {
+        now = 0;
+    });
+
+    test('should open once the error rate crosses the threshold', () => {
+        const breaker = new CircuitBreaker({ minRequests: 4, errorThreshold: 0.5, now: clock });
+
+        breaker.recordSuccess(100);
+        breaker.recordSuccess(100);
+        breaker.recordFailure();
+        expect(breaker.state).toBe(CircuitState.CLOSED); // below minRequests
+
+        breaker.recordFailure();
+        expect(breaker.state).toBe(CircuitState.OPEN);
+        expect(breaker.allowRequest()).toBe(false);
+        expect(breaker.stats()).toMatchObject({ opened: 1, rejected: 1, error_rate: 0.5 });
+    });
+
+    test('should open when most calls are slow', () => {
+        const breaker = new CircuitBreaker({ minRequests: 3, slowCallMs: 1000, slowThreshold: 0.6, now: clock });
+
+        breaker.recordSuccess(5000);
+        breaker.recordSuccess(200);
+        breaker.recordSuccess(4000);
+
+        expect(breaker.state).toBe(CircuitState.OPEN);
+    });
+
+    test('should probe after the cool-down and close on success', () => {
+        const breaker = new CircuitBreaker({ minRequests: 1, openMs: 1000, now: clock });
+        breaker.recordFailure();
+
+        now = 999;
+        expect(breaker.allowRequest()).toBe(false);
+
+        now = 1000;
+        expect(breaker.allowRequest()).toBe(true);
+        expect(breaker.state).toBe(CircuitState.HALF_OPEN);
+        expect(breaker.allowRequest()).toBe(false); // one probe at a time
+
+        breaker.recordSuccess(50);
+        expect(breaker.state).toBe(CircuitState.CLOSED);
+        expect(breaker.stats().window_calls).toBe(0);
+    });
+
+    test('should reopen when the probe fails', () => {
+        const breaker = new CircuitBreaker({ minRequests: 1, openMs: 1000, now: clock });
+        breaker.recordFailure();
+
+        now = 1500;
+        expect(breaker.allowRequest()).toBe(true);
+        breaker.recordFailure();
+
+        expect(breaker.state).toBe(CircuitState.OPEN);
+        now = 2000;
+        expect(breaker.allowRequest()).toBe(false);
+        expect(breaker.stats().opened).toBe(2);
+    });
+
+    test('should forget outcomes that leave the rolling window', () => {
+        const breaker = new CircuitBreaker({ windowSize: 4, minRequests: 4, errorThreshold: 0.75, now: clock });
+
+        breaker.recordFailure();
+        breaker.recordFailure();
+        for (let i = 0; i < 4; i++) {
+            breaker.recordSuccess(10);
+        }
+        breaker.recordFailure();
+
+        expect(breaker.errorRate).toBe(0.25);
+        expect(breaker.state).toBe(CircuitState.CLOSED);
+    });
+});
+
+describe('Latency Window', () => {
+    test('should report nearest-rank percentiles over recent samples', () => {
+        const window = new LatencyWindow(100);
+        for (let ms = 1; ms <= 100; ms++) {
+            window.record(ms);
+        }
+
+        expect(window.percentile(0.5)).toBe(50);
+        expect(window.percentile(0.99)).toBe(99);
+
+        window.record(1000); // evicts the oldest sample
+        expect(window.percentile(1)).toBe(1000);
+        expect(window.count).toBe(100);
+    });
+});
+
+describe('Gemini breaker integration', () => {
+    const networkError = () => Object.assign(new Error('socket hang up'), { request: {}, code: 'ECONNRESET' });
+
+    test('should fail fast with the circuit open instead of waiting on Gemini', async () => {
+        const ai = new AIService({ provider: new GeminiProvider({ apiKey: 'test-key' }) });
+        ai.breaker = new CircuitBreaker({ minRequests: 2, errorThreshold: 0.5 });
+        const post = jest.fn(async () => {
+            throw networkError();
+        });
+        ai.provider.http.post = post;
+
+        await expect(ai.analyze('message one')).rejects.toThrow('AI analysis failed');
+        await expect(ai.analyze('message two')).rejects.toThrow('AI analysis failed');
+        await expect(ai.analyze('message three')).rejects.toThrow('AI circuit open');
+
+        expect(post).toHaveBeenCalledTimes(2);
+        expect(ai.breakerStats().state).toBe('open');
+    });
+
+    test('should derive the timeout from observed latency', () => {
+        const ai = new AIService({ provider: new GeminiProvider({ apiKey: 'test-key' }) });
+        expect(ai.currentTimeout()).toBe(30000); // not enough samples yet
+
+        for (let i = 0; i < 50; i++) {
+            ai.latency.record(1500 + i * 10);
+        }
+
+        expect(ai.currentTimeout()).toBe(Math.ceil(ai.latency.percentile(0.99) * 2));
+        expect(ai.currentTimeout()).toBeLessThan(30000);
+    });
+});
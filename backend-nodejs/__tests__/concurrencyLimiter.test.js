@@ -0,0 +1,78 @@
+/**
+ * Tests for Concurrency Limiter
+ */
+
+import { ConcurrencyLimiter, QueueRejectedError } from '../utils/concurrencyLimiter.js';
+
+const deferred = () => {
+    let resolve;
+    const promise = new Promise((res) => {
+        resolve = res;
+    });
+    return { promise, resolve };
+};
+
+describe('Concurrency Limiter', () => {
+    test('should never run more than maxConcurrent calls at once', async () => {
+        const limiter = new ConcurrencyLimiter({ maxConcurrent: 2, maxQueue: 10 });
+        let running = 0;
+        let peak = 0;
+
+        const task = async () => {
+            running++;
+            peak = Math.max(peak, running);
+            await new Promise((resolve) => setTimeout(resolve, 5));
+            running--;
+            return 'done';
+        };
+
+        const results = await Promise.all(Array.from({ length: 6 }, () => limiter.run(task)));
+
+        expect(results).toEqual(Array(6).fill('done'));
+        expect(peak).toBe(2);
+        expect(limiter.stats()).toMatchObject({ active: 0, queued: 0, completed: 6, shed: 0 });
+    });
+
+    test('should shed calls once the queue is full', async () => {
+        const limiter = new ConcurrencyLimiter({ maxConcurrent: 1, maxQueue: 1 });
+        const gate = deferred();
+
+        const running = limiter.run(() => gate.promise);
+        const waiting = limiter.run(async () => 'queued');
+        const rejected = limiter.run(async () => 'never');
+
+        await expect(rejected).rejects.toThrow('queue full');
+        await rejected.catch((error) => {
+            expect(error).toBeInstanceOf(QueueRejectedError);
+            expect(error.reason).toBe('queue_full');
+        });
+        expect(limiter.stats()).toMatchObject({ active: 1, queued: 1, shed: 1 });
+
+        gate.resolve('first');
+        expect(await running).toBe('first');
+        expect(await waiting).toBe('queued');
+    });
+
+    test('should reject calls that wait past the queue deadline', async () => {
+        const limiter = new ConcurrencyLimiter({ maxConcurrent: 1, maxQueue: 5, queueTimeoutMs: 10 });
+        const gate = deferred();
+
+        limiter.run(() => gate.promise);
+        const late = limiter.run(async () => 'too late');
+
+        await expect(late).rejects.toThrow('queue timeout');
+        expect(limiter.stats()).toMatchObject({ queued: 0, timed_out: 1 });
+        gate.resolve();
+    });
+
+    test('should release the slot when a call fails', async () => {
+        const limiter = new ConcurrencyLimiter({ maxConcurrent: 1, maxQueue: 1 });
+
+        await expect(limiter.run(async () => {
+            throw new Error('upstream 503');
+        })).rejects.toThrow('upstream 503');
+
+        expect(await limiter.run(async () => 'next')).toBe('next');
+        expect(limiter.active).toBe(0);
+    });
+});
@@ -0,0 +1,72 @@
+/**
+ * Tests for Cryptocurrency Address Detection
+ */
+
+import { classifyAddress, findCryptoAddresses } from '../utils/cryptoAddress.js';
+import { keccak256 } from '../utils/keccak.js';
+import { analyzeUrls } from '../services/urlService.js';
+
+describe('Cryptocurrency Address Detection', () => {
+    test('should compute Keccak-256 rather than SHA3-256', () => {
+        expect(keccak256('').toString('hex'))
+            .toBe('c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470');
+        expect(keccak256('abc').toString('hex'))
+            .toBe('4e03657aea45a94fc7d47ba826c8d667c0d1e6e33a64a036ec44f58fa12d6c45');
+    });
+
+    test('should accept checksum-valid addresses and report their type', () => {
+        expect(classifyAddress('1BoatSLRHtKNngkdXEeobR76b53LETtpyT')).toBe('BTC');
+        expect(classifyAddress('3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy')).toBe('BTC');
+        expect(classifyAddress('bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4')).toBe('BTC');
+        expect(classifyAddress('bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqzk5jj0')).toBe('BTC');
+        expect(classifyAddress('LVg2kJoFNg45Nbpy53h7Fe1wKyeXVRhMH9')).toBe('LTC');
+        expect(classifyAddress('ltc1qqurswpc8qurswpc8qurswpc8qurswpc8p4r4uu')).toBe('LTC');
+        expect(classifyAddress('TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t')).toBe('TRON');
+        expect(classifyAddress('0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed')).toBe('ETH');
+        expect(classifyAddress('0xde709f2102306220921060314715629080e2fb77')).toBe('ETH');
+        expect(classifyAddress('TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA')).toBe('SOL');
+    });
+
+    test('should reject strings whose checksum does not verify', () => {
+        expect(classifyAddress('1BoatSLRHtKNngkdXEeobR76b53LETtpyU')).toBeNull();
+        expect(classifyAddress('bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t5')).toBeNull();
+        expect(classifyAddress('0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAeD')).toBeNull();
+        expect(classifyAddress('abcdefghijklmnopqrstuvwxyz123')).toBeNull();
+    });
+
+    test('should find addresses between punctuation and skip duplicates', () => {
+        const text = 'Send BTC to 1BoatSLRHtKNngkdXEeobR76b53LETtpyT, or ETH: ' +
+            '0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed! Again: 1BoatSLRHtKNngkdXEeobR76b53LETtpyT';
+
+        expect(findCryptoAddresses(text)).toEqual([
+            { type: 'BTC', address: '1BoatSLRHtKNngkdXEeobR76b53LETtpyT' },
+            { type: 'ETH', address: '0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed' },
+        ]);
+    });
+
+    test('should only report SOL keys next to wallet wording and outside URLs', () => {
+        const key = 'TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA';
+
+        expect(findCryptoAddresses(`Send 2 SOL to ${key} to claim the airdrop`))
+            .toEqual([{ type: 'SOL', address: key }]);
+        expect(findCryptoAddresses(`Your reference code is ${key}.`)).toEqual([]);
+        expect(findCryptoAddresses(`Connect your wallet: https://track.example.com/c/${key}?utm=mail`)).toEqual([]);
+        expect(findCryptoAddresses(`Wallet login: https://example.com/?session=${key}`)).toEqual([]);
+    });
+
+    test('should give the same result on repeated calls', () => {
+        const text = 'Deposit to 0xde709f2102306220921060314715629080e2fb77 at https://claim-now.example.com';
+
+        const first = analyzeUrls(text);
+        const second = analyzeUrls(text);
+
+        expect(first).toEqual(second);
+        expect(first.reasons).toContain('Cryptocurrency wallet address detected (ETH) - potential scam');
+    });
+
+    test('should not flag random alphanumeric strings as wallets', () => {
+        const result = analyzeUrls('Your address: abcdefghijklmnopqrstuvwxyz123 https://example.com');
+
+        expect(result.reasons.some(r => r.includes('Cryptocurrency'))).toBe(false);
+    });
+});
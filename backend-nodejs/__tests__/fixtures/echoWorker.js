@@ -0,0 +1,16 @@
+/**
+ * WorkerPool test worker: echoes its input, fails on "fail" and exits on "crash"
+ */
+
+import { parentPort } from 'worker_threads';
+
+parentPort.on('message', ({ id, data }) => {
+    if (data === 'crash') {
+        process.exit(3);
+    }
+    if (data === 'fail') {
+        parentPort.postMessage({ id, error: 'task failed' });
+        return;
+    }
+    setTimeout(() => parentPort.postMessage({ id, result: { echo: data } }), 5);
+});
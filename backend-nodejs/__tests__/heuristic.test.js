@@ -4,7 +4,8 @@
 
 import { analyzeHeuristic } from '../services/heuristicService.js';
 import { analyzeHeuristics } from '../services/keywordService.js';
-import { analyzeUrls } from '../services/urlService.js';
+import { analyzeUrls, parseUrl } from '../services/urlService.js';
+import { buildTextFeatures } from '../services/textFeatures.js';
 
 describe('Heuristic Detection Service', () => {
     describe('analyzeHeuristic', () => {
@@ -99,6 +100,34 @@ describe('Heuristic Detection Service', () => {
             expect(result.reasons.some(r => r.toLowerCase().includes('credentials'))).toBe(true);
         });
 
+        test('should parse URL components once', () => {
+            const record = parseUrl('HTTP://PayPal.com-secure@Evil.Example.tk:8080/login?next=/home');
+
+            expect(record.scheme).toBe('http');
+            expect(record.userinfoLower).toBe('paypal.com-secure');
+            expect(record.host).toBe('Evil.Example.tk');
+            expect(record.hostLabels).toEqual(['evil', 'example', 'tk']);
+            expect(record.port).toBe('8080');
+            expect(record.path).toBe('/login?next=/home');
+        });
+
+        test('should not treat @ in the query string as credentials', () => {
+            const result = analyzeUrls('Contact https://example.com/contact?email=bob@example.com');
+
+            expect(result.reasons.some(r => r.toLowerCase().includes('credentials'))).toBe(false);
+        });
+
+        test('should match suspicious domains by host suffix only', () => {
+            const flagged = (text) => analyzeUrls(text).reasons.includes('Known suspicious domain in URL');
+
+            expect(flagged('Go to https://bit.ly/abc123')).toBe(true);
+            expect(flagged('Go to https://www.bit.ly/abc123')).toBe(true);
+            expect(flagged('Go to https://free-prizes.tk/win')).toBe(true);
+            expect(flagged('Go to https://promo.vip/claim')).toBe(true);
+            expect(flagged('Go to https://example.com/files/report.cc')).toBe(false);
+            expect(flagged('Go to https://habit.lyrics.com/song')).toBe(false);
+        });
+
         test('should detect multiple URLs', () => {
             const text = `
         Link 1: http://site1.com
@@ -114,4 +143,28 @@ describe('Heuristic Detection Service', () => {
             expect(result.reasons.some(r => r.includes('Excessive URLs'))).toBe(true);
         });
     });
+
+    describe('buildTextFeatures', () => {
+        test('should precompute shared counters and URLs', () => {
+            const text = 'URGENT NOTICE!!! Visit http://a.com and http://a.com now???';
+            const features = buildTextFeatures(text);
+
+            expect(features.lower).toBe(text.toLowerCase());
+            expect(features.exclamationCount).toBe(3);
+            expect(features.questionCount).toBe(3);
+            expect(features.capsWordCount).toBe(1);
+            expect(features.tokenCount).toBe(7);
+            expect(features.hasExcessivePunctuation).toBe(true);
+            expect(features.urls).toEqual(['http://a.com']);
+            expect(Object.isFrozen(features)).toBe(true);
+        });
+
+        test('should give detectors identical results for text and features', () => {
+            const text = 'Dear customer, verify your account at http://192.168.1.1/login!!!';
+            const features = buildTextFeatures(text);
+
+            expect(analyzeHeuristics(features)).toEqual(analyzeHeuristics(text));
+            expect(analyzeUrls(features)).toEqual(analyzeUrls(text));
+        });
+    });
 });
@@ -0,0 +1,43 @@
+/**
+ * Tests for Homograph / IDN Host Analysis
+ */
+
+import { analyzeLabel, Script } from '../utils/homograph.js';
+import { analyzeUrls } from '../services/urlService.js';
+
+describe('Homograph Analysis', () => {
+    test('should decode punycode labels and compute a Latin skeleton', () => {
+        const analysis = analyzeLabel('xn--l-7sba6dbr');
+
+        expect(analysis.isIdn).toBe(true);
+        expect(analysis.unicode).toBe('раураl'); // Cyrillic with a Latin "l"
+        expect(analysis.skeleton).toBe('paypal');
+        expect(analysis.scripts).toBe(Script.CYRILLIC | Script.LATIN);
+        expect(analysis.hasConfusables).toBe(true);
+    });
+
+    test('should detect mixed-script labels', () => {
+        expect(analyzeLabel('pаypal').mixedScript).toBe(true); // Cyrillic "а"
+        expect(analyzeLabel('пример').mixedScript).toBe(false);
+    });
+
+    test('should leave plain ASCII labels untouched', () => {
+        const analysis = analyzeLabel('example');
+
+        expect(analysis.isIdn).toBe(false);
+        expect(analysis.hasConfusables).toBe(false);
+    });
+
+    test('should flag look-alike hosts imitating protected brands', () => {
+        const unicode = analyzeUrls('Login at https://раураl.com/signin');
+        const punycode = analyzeUrls('Login at https://xn--l-7sba6dbr.com/signin');
+
+        expect(unicode.reasons).toContain('Potential homograph attack in URL imitating paypal.com');
+        expect(punycode.reasons).toContain('Potential homograph attack in URL imitating paypal.com');
+    });
+
+    test('should not flag legitimate single-script IDN hosts or Cyrillic paths', () => {
+        expect(analyzeUrls('Visit https://пример.рф').reasons).toEqual([]);
+        expect(analyzeUrls('Visit https://example.com/путь').reasons).toEqual([]);
+    });
+});
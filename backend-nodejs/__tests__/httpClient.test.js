@@ -0,0 +1,91 @@
+/**
+ * Tests for Keep-Alive HTTP Client against a local HTTPS stand-in server
+ */
+
+import fs from 'fs';
+import https from 'https';
+import { fileURLToPath } from 'url';
+import { createKeepAliveClient, getSocketStats } from '../utils/httpClient.js';
+import { AIService } from '../services/aiService.js';
+import { GeminiProvider } from '../services/aiProviders/index.js';
+
+const fixture = (name) => fs.readFileSync(fileURLToPath(new URL(`./fixtures/${name}`, import.meta.url)));
+const cert = fixture('localhost-cert.pem');
+const key = fixture('localhost-key.pem');
+
+const geminiReply = {
+    candidates: [{
+        content: {
+            parts: [{
+                text: '{"isPhishing": true, "confidence": 0.9, "phishingProbability": 0.93, ' +
+                    '"legitimateProbability": 0.07, "riskFactors": ["urgency"]}',
+            }],
+        },
+    }],
+};
+
+describe('Keep-Alive HTTP Client', () => {
+    let server;
+    let baseURL;
+    let handshakes;
+    let requests;
+
+    beforeAll(async () => {
+        server = https.createServer({ key, cert }, (req, res) => {
+            requests.push(`${req.method} ${req.url.split('?')[0]}`);
+            req.resume();
+            req.on('end', () => {
+                const body = JSON.stringify(req.method === 'POST' ? geminiReply : {});
+                res.setHeader('Content-Type', 'application/json');
+                res.setHeader('Content-Length', Buffer.byteLength(body));
+                res.end(body);
+            });
+        });
+        server.on('secureConnection', () => handshakes++);
+        await new Promise((resolve) => server.listen(0, '127.0.0.1', resolve));
+        baseURL = `https://localhost:${server.address().port}`;
+    });
+
+    afterAll(async () => {
+        await new Promise((resolve) => server.close(resolve));
+    });
+
+    beforeEach(() => {
+        handshakes = 0;
+        requests = [];
+    });
+
+    test('should reuse one TLS connection for sequential requests', async () => {
+        const client = createKeepAliveClient({ baseURL, tls: { ca: cert } });
+
+        for (let i = 0; i < 5; i++) {
+            await client.get('/ping');
+        }
+
+        expect(requests).toHaveLength(5);
+        expect(handshakes).toBe(1);
+        expect(getSocketStats(client.agent)).toMatchObject({ active: 0, idle: 1, connections_opened: 1 });
+        client.agent.destroy();
+    });
+
+    test('should bound concurrent sockets to maxSockets', async () => {
+        const client = createKeepAliveClient({ baseURL, maxSockets: 2, tls: { ca: cert } });
+
+        await Promise.all(Array.from({ length: 6 }, () => client.get('/ping')));
+
+        expect(client.agent.connectionsOpened).toBeLessThanOrEqual(2);
+        client.agent.destroy();
+    });
+
+    test('should warm the Gemini connection and reuse it for analysis', async () => {
+        const ai = new AIService({ provider: new GeminiProvider({ apiKey: 'test-key', baseURL, tls: { ca: cert } }) });
+
+        expect(await ai.warmUp()).toBe(true);
+        const result = await ai.analyze('Your account is locked, verify now');
+
+        expect(result.isPhishing).toBe(true);
+        expect(requests).toEqual(['HEAD /', 'POST /v1beta/models/gemini-2.5-flash:generateContent']);
+        expect(ai.socketStats().connections_opened).toBe(1);
+        ai.provider.http.agent.destroy();
+    });
+});
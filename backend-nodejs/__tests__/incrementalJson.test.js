@@ -0,0 +1,69 @@
+/**
+ * Tests for Incremental JSON parsing and the SSE reader
+ */
+
+import { Readable } from 'stream';
+import { IncrementalJsonObject } from '../utils/incrementalJson.js';
+import { readSseEvents } from '../utils/sseStream.js';
+
+describe('Incremental JSON Object', () => {
+    const verdict = {
+        isPhishing: true,
+        confidence: 0.91,
+        phishingProbability: 0.875,
+        riskFactors: ['Asks to "verify" {account}', 'Link, [shortened]'],
+        details: { nested: [1, { brace: '}' }] },
+        note: null,
+    };
+
+    test('should rebuild the object for any chunking', () => {
+        for (const source of [JSON.stringify(verdict), JSON.stringify(verdict, null, 2)]) {
+            for (let size = 1; size <= 8; size++) {
+                const parser = new IncrementalJsonObject();
+                for (let i = 0; i < source.length; i += size) {
+                    parser.push(source.slice(i, i + size));
+                }
+
+                expect(parser.fields).toEqual(verdict);
+                expect(parser.done).toBe(true);
+            }
+        }
+    });
+
+    test('should report fields as soon as their value is complete', () => {
+        const parser = new IncrementalJsonObject();
+
+        expect(parser.push('{"isPhishing": tr')).toEqual([]);
+        expect(parser.push('ue, "confidence": 0.9')).toEqual(['isPhishing']);
+        expect(parser.push('5, "riskFactors": ["urgency"')).toEqual(['confidence']);
+        expect(parser.fields).toEqual({ isPhishing: true, confidence: 0.95 });
+    });
+
+    test('should throw on a malformed value', () => {
+        const parser = new IncrementalJsonObject();
+        expect(() => parser.push('{"isPhishing": yes,')).toThrow();
+    });
+});
+
+describe('SSE Reader', () => {
+    test('should yield one parsed payload per event across chunk boundaries', async () => {
+        const chunks = ['data: {"n": 1}\r\n\r', '\ndata: {"n": 2}\n\n', ': keep-alive\n\ndata: {"n": 3}'];
+        const events = [];
+
+        for await (const event of readSseEvents(Readable.from(chunks.map((chunk) => Buffer.from(chunk))))) {
+            events.push(event.n);
+        }
+
+        expect(events).toEqual([1, 2, 3]);
+    });
+
+    test('should skip the [DONE] sentinel', async () => {
+        const events = [];
+
+        for await (const event of readSseEvents(Readable.from(['data: {"n": 1}\n\ndata: [DONE]\n\n']))) {
+            events.push(event.n);
+        }
+
+        expect(events).toEqual([1]);
+    });
+});
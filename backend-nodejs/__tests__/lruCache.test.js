@@ -0,0 +1,50 @@
+/**
+ * Tests for LRU Cache with TTL
+ */
+
+import { LRUCache } from '../utils/lruCache.js';
+
+describe('LRUCache', () => {
+    test('should evict the least recently used entry', () => {
+        const cache = new LRUCache({ maxEntries: 2 });
+        cache.set('a', 1);
+        cache.set('b', 2);
+        cache.get('a');
+        cache.set('c', 3);
+
+        expect(cache.get('a')).toBe(1);
+        expect(cache.get('b')).toBeUndefined();
+        expect(cache.get('c')).toBe(3);
+        expect(cache.stats().evictions).toBe(1);
+    });
+
+    test('should expire entries after their TTL', () => {
+        let now = 1000;
+        const cache = new LRUCache({ maxEntries: 10, ttlMs: 50, now: () => now });
+        cache.set('url', 'verdict');
+
+        now += 49;
+        expect(cache.get('url')).toBe('verdict');
+
+        now += 1;
+        expect(cache.get('url')).toBeUndefined();
+        expect(cache.stats().expirations).toBe(1);
+    });
+
+    test('should count hits and misses', () => {
+        const cache = new LRUCache({ maxEntries: 10 });
+        cache.set('a', 1);
+        cache.get('a');
+        cache.get('a');
+        cache.get('missing');
+
+        const stats = cache.stats();
+        expect(stats.hits).toBe(2);
+        expect(stats.misses).toBe(1);
+        expect(stats.hit_ratio).toBeCloseTo(0.667, 3);
+    });
+
+    test('should reject invalid sizes', () => {
+        expect(() => new LRUCache({ maxEntries: 0 })).toThrow();
+    });
+});
@@ -0,0 +1,54 @@
+/**
+ * Tests for Message Condenser Service
+ */
+
+import { condenseMessage, estimateTokens } from '../services/messageCondenser.js';
+
+const filler = (length) => 'Our quarterly newsletter covers gardening tips and local events. '
+    .repeat(Math.ceil(length / 65))
+    .slice(0, length);
+
+describe('Message Condenser', () => {
+    test('should leave messages within the budget untouched', () => {
+        const text = 'Your package is on its way.';
+        const result = condenseMessage(text, { tokenBudget: 100 });
+
+        expect(result.text).toBe(text);
+        expect(result).toMatchObject({ condensed: false, bytesSaved: 0, sentBytes: result.originalBytes });
+    });
+
+    test('should not condense when the budget is 0', () => {
+        const text = filler(20000);
+        expect(condenseMessage(text, { tokenBudget: 0 }).text).toBe(text);
+    });
+
+    test('should keep head, tail and windows around high-signal spans', () => {
+        const text = `Hello team,\n${filler(20000)} Please send your seed phrase to https://evil.example/verify today. ${filler(20000)} Unsubscribe here.`;
+        const result = condenseMessage(text, { tokenBudget: 1000, windowChars: 100 });
+
+        expect(result.condensed).toBe(true);
+        expect(result.text.startsWith('Hello team')).toBe(true);
+        expect(result.text.endsWith('Unsubscribe here.')).toBe(true);
+        expect(result.text).toContain('send your seed phrase to https://evil.example/verify today');
+        expect(result.text).toContain('characters omitted');
+        expect(estimateTokens(result.text)).toBeLessThanOrEqual(1000);
+    });
+
+    test('should report the bytes saved', () => {
+        const text = filler(50000);
+        const result = condenseMessage(text, { tokenBudget: 500 });
+
+        expect(result.originalBytes).toBe(50000);
+        expect(result.sentBytes).toBe(Buffer.byteLength(result.text));
+        expect(result.bytesSaved).toBe(result.originalBytes - result.sentBytes);
+        expect(result.bytesSaved).toBeGreaterThan(45000);
+    });
+
+    test('should prefer sensitive requests over weaker keywords when the budget is tight', () => {
+        const text = `${filler(3000)} act fast ${filler(3000)} what is your ssn ${filler(3000)}`;
+        const result = condenseMessage(text, { tokenBudget: 100, windowChars: 20, headChars: 100, tailChars: 100 });
+
+        expect(result.text).toContain('your ssn');
+        expect(result.text).not.toContain('act fast');
+    });
+});
@@ -0,0 +1,127 @@
+/**
+ * Tests for Micro-Batcher and batched Gemini requests
+ */
+
+import { jest } from '@jest/globals';
+import { MicroBatcher } from '../utils/microBatcher.js';
+import { AIService } from '../services/aiService.js';
+import { GeminiProvider } from '../services/aiProviders/index.js';
+
+const verdict = (id, isPhishing) => ({
+    id,
+    isPhishing,
+    confidence: 0.9,
+    phishingProbability: isPhishing ? 0.9 : 0.1,
+    legitimateProbability: isPhishing ? 0.1 : 0.9,
+    riskFactors: isPhishing ? ['Urgency'] : [],
+});
+
+const geminiReply = (value) => ({
+    data: { candidates: [{ content: { parts: [{ text: JSON.stringify(value) }] } }] },
+});
+
+describe('Micro-Batcher', () => {
+    test('should group items submitted within the window', async () => {
+        const handler = jest.fn(async (items) => items.map((n) => n * 2));
+        const batcher = new MicroBatcher({ windowMs: 5, maxSize: 10, handler });
+
+        const results = await Promise.all([1, 2, 3].map((n) => batcher.add(n)));
+
+        expect(results).toEqual([2, 4, 6]);
+        expect(handler).toHaveBeenCalledTimes(1);
+        expect(batcher.stats()).toMatchObject({ pending: 0, batches: 1, items: 3, avg_batch_size: 3 });
+    });
+
+    test('should flush as soon as the batch is full', async () => {
+        const handler = jest.fn(async (items) => items);
+        const batcher = new MicroBatcher({ windowMs: 60000, maxSize: 2, handler });
+
+        const results = await Promise.all(['a', 'b', 'c', 'd'].map((item) => batcher.add(item)));
+
+        expect(results).toEqual(['a', 'b', 'c', 'd']);
+        expect(handler).toHaveBeenCalledTimes(2);
+    });
+
+    test('should reject only the items whose result is an Error', async () => {
+        const batcher = new MicroBatcher({
+            windowMs: 1,
+            handler: async (items) => items.map((n) => (n === 2 ? new Error('bad item') : n)),
+        });
+
+        const [one, two] = [batcher.add(1), batcher.add(2)];
+
+        expect(await one).toBe(1);
+        await expect(two).rejects.toThrow('bad item');
+    });
+
+    test('should reject the whole batch when the handler fails', async () => {
+        const batcher = new MicroBatcher({
+            windowMs: 1,
+            handler: async () => {
+                throw new Error('upstream down');
+            },
+        });
+
+        const pending = [batcher.add(1), batcher.add(2)];
+
+        await expect(pending[0]).rejects.toThrow('upstream down');
+        await expect(pending[1]).rejects.toThrow('upstream down');
+    });
+});
+
+describe('Gemini micro-batching', () => {
+    const batchedAI = () => {
+        const ai = new AIService({ provider: new GeminiProvider({ apiKey: 'test-key' }) });
+        ai.batcher = new MicroBatcher({ windowMs: 5, maxSize: 8, handler: (items) => ai._flushBatch(items) });
+        return ai;
+    };
+
+    test('should answer several messages with one upstream call', async () => {
+        const ai = batchedAI();
+        const post = jest.fn(async () => geminiReply([verdict(2, false), verdict(1, true)]));
+        ai.provider.http.post = post;
+
+        const [first, second] = await Promise.all([
+            ai.analyze('URGENT: verify your account now'),
+            ai.analyze('Lunch at noon?'),
+        ]);
+
+        expect(post).toHaveBeenCalledTimes(1);
+        expect(post.mock.calls[0][1].contents[0].parts[0].text).toContain('**Message 2:**');
+        expect(first.isPhishing).toBe(true);
+        expect(second.isPhishing).toBe(false);
+        expect(ai.cache.stats().size).toBe(2);
+    });
+
+    test('should fall back to per-message calls for verdicts the batch lacked', async () => {
+        const ai = batchedAI();
+        const post = jest.fn(async (path, body) => {
+            const prompt = body.contents[0].parts[0].text;
+            if (prompt.includes('**Message 1:**')) {
+                return geminiReply([verdict(1, true), { id: 2, isPhishing: 'maybe' }]);
+            }
+            return geminiReply(verdict(undefined, false));
+        });
+        ai.provider.http.post = post;
+
+        const [first, second] = await Promise.all([ai.analyze('message one'), ai.analyze('message two')]);
+
+        expect(post).toHaveBeenCalledTimes(2);
+        expect(first.isPhishing).toBe(true);
+        expect(second.isPhishing).toBe(false);
+        expect(ai.batchFallbacks).toBe(1);
+    });
+
+    test('should retry every message when the batched reply is not a JSON array', async () => {
+        const ai = batchedAI();
+        let calls = 0;
+        ai.provider.http.post = jest.fn(async () => (calls++ === 0
+            ? { data: { candidates: [{ content: { parts: [{ text: 'I cannot help with that.' }] } }] } }
+            : geminiReply(verdict(undefined, true))));
+
+        const results = await Promise.all([ai.analyze('one'), ai.analyze('two'), ai.analyze('three')]);
+
+        expect(ai.provider.http.post).toHaveBeenCalledTimes(4);
+        expect(results.every((result) => result.isPhishing)).toBe(true);
+    });
+});
@@ -0,0 +1,102 @@
+/**
+ * NDJSON reader and streaming analysis tests
+ */
+
+import { Readable } from 'stream';
+import { readNdjsonLines } from '../utils/ndjsonStream.js';
+import { analyzeStream } from '../controllers/detectionController.js';
+import config from '../config.js';
+
+const collect = async (iterable) => {
+    const out = [];
+    for await (const item of iterable) out.push(item);
+    return out;
+};
+
+const records = (texts) => texts.map((text, i) => ({ number: i + 1, value: { id: i + 1, text } }));
+
+describe('readNdjsonLines', () => {
+    test('splits lines across chunk boundaries and numbers them', async () => {
+        const stream = Readable.from(['{"id":1}\n{"i', 'd":2}\r\n\n', '{"id":3}']);
+
+        expect(await collect(readNdjsonLines(stream))).toEqual([
+            { number: 1, line: '{"id":1}' },
+            { number: 2, line: '{"id":2}' },
+            { number: 4, line: '{"id":3}' },
+        ]);
+    });
+
+    test('decodes multi-byte characters split between chunks', async () => {
+        const bytes = Buffer.from('{"text":"héllo"}\n');
+        const stream = Readable.from([bytes.subarray(0, 11), bytes.subarray(11)]);
+
+        expect(await collect(readNdjsonLines(stream))).toEqual([{ number: 1, line: '{"text":"héllo"}' }]);
+    });
+
+    test('skips over-long lines without buffering them', async () => {
+        const stream = Readable.from(['short\n', 'x'.repeat(30), 'x'.repeat(30), '\nnext\n', 'y'.repeat(50), '\n']);
+
+        expect(await collect(readNdjsonLines(stream, { maxLineLength: 40 }))).toEqual([
+            { number: 1, line: 'short' },
+            { number: 2, line: null },
+            { number: 3, line: 'next' },
+            { number: 4, line: null },
+        ]);
+    });
+});
+
+describe('analyzeStream', () => {
+    test('writes one verdict per message and reports bad lines in place', async () => {
+        const written = [];
+        const summary = await analyzeStream([
+            { number: 1, value: { id: 'a', text: 'Meeting moved to 3pm, see you there.' } },
+            { number: 2, error: 'Invalid JSON' },
+            { number: 3, id: 'b', error: 'Field "text" cannot be empty' },
+        ], async (record) => written.push(record));
+
+        expect(summary).toMatchObject({ lines: 3, analyzed: 1, invalid: 2, failed: 0 });
+        expect(written.find(({ id }) => id === 'a')).toHaveProperty('risk_score');
+        expect(written).toContainEqual({ line: 2, error: 'Invalid JSON' });
+        expect(written).toContainEqual({ id: 'b', line: 3, error: 'Field "text" cannot be empty' });
+    });
+
+    test('stops pulling lines while the output is backed up', async () => {
+        const { maxInFlight } = config.streamApi;
+        let pulled = 0;
+        async function* source() {
+            for (let i = 1; i <= maxInFlight * 3; i++) {
+                pulled++;
+                yield { number: i, value: { id: i, text: `message number ${i}` } };
+            }
+        }
+
+        let release;
+        const blocked = new Promise((resolve) => { release = resolve; });
+        let writes = 0;
+        const done = analyzeStream(source(), async () => {
+            writes++;
+            await blocked;
+        });
+
+        await new Promise((resolve) => setTimeout(resolve, 50));
+        expect(pulled).toBe(maxInFlight);
+        expect(writes).toBe(maxInFlight);
+
+        release();
+        await expect(done).resolves.toMatchObject({ lines: maxInFlight * 3, analyzed: maxInFlight * 3 });
+    });
+
+    test('stops reading when aborted', async () => {
+        const aborted = new AbortController();
+        const written = [];
+        const total = config.streamApi.maxInFlight * 3;
+        const lines = records(Array.from({ length: total }, (_, i) => `hello ${i}`));
+
+        const summary = await analyzeStream(lines, async (record) => {
+            written.push(record);
+            aborted.abort();
+        }, { signal: aborted.signal });
+
+        expect(summary.lines).toBeLessThan(total);
+    });
+});
@@ -5,6 +5,7 @@
 import {
     calculateRiskLevel,
     combineScores,
+    createAnalysisResult,
     mergeRiskFactors,
     validateScore,
     RiskLevel,
@@ -36,6 +37,18 @@ describe('Risk Scoring Utility', () => {
             expect(score).toBe(50);
         });
 
+        test('should blend the local model into the heuristic score', () => {
+            const weight = config.localModel.weight;
+
+            expect(combineScores(null, 10, { phishingProbability: 0.9 })).toBeCloseTo(10 * (1 - weight) + 90 * weight);
+            expect(combineScores(null, 20, { phishingProbability: 0 })).toBeCloseTo(20 * (1 - weight));
+        });
+
+        test('should not let the local model lower a suspicious heuristic score', () => {
+            const heuristic = config.risk.suspiciousThreshold + 5;
+            expect(combineScores(null, heuristic, { phishingProbability: 0.01 })).toBe(heuristic);
+        });
+
         test('should combine AI and heuristic scores', () => {
             const aiResult = {
                 phishingProbability: 0.8,
@@ -132,6 +145,36 @@ describe('Risk Scoring Utility', () => {
         });
     });
 
+    describe('createAnalysisResult', () => {
+        test('should list the layers that contributed', () => {
+            const aiResult = { confidence: 0.9, modelName: 'test-model' };
+
+            expect(createAnalysisResult(80, [], aiResult).metadata.detection_layers).toEqual(['ai', 'heuristic']);
+            expect(createAnalysisResult(80, []).metadata.detection_layers).toEqual(['heuristic']);
+        });
+
+        test('should mark AI shed under load', () => {
+            const result = createAnalysisResult(40, [], null, { aiSkipReason: 'queue_full' });
+
+            expect(result.metadata.detection_layers).toEqual(['heuristic', 'ai_skipped:queue_full']);
+            expect(result.ai_analysis.enabled).toBe(false);
+        });
+
+        test('should list the local model layer when one scored the message', () => {
+            const result = createAnalysisResult(30, [], null, { localResult: { phishingProbability: 0.4567 } });
+
+            expect(result.metadata.detection_layers).toEqual(['heuristic', 'local_model']);
+            expect(result.metadata.local_model).toEqual({ phishing_probability: 0.457 });
+        });
+
+        test('should report AI input size when AI was called', () => {
+            const aiInput = { condensed: true, original_bytes: 50000, sent_bytes: 8000, bytes_saved: 42000 };
+
+            expect(createAnalysisResult(20, [], null, { aiInput }).metadata.ai_input).toEqual(aiInput);
+            expect(createAnalysisResult(20, []).metadata).not.toHaveProperty('ai_input');
+        });
+    });
+
     describe('validateScore', () => {
         test('should clamp scores to 0-100 range', () => {
             expect(validateScore(-10)).toBe(0);
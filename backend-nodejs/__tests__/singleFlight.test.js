@@ -0,0 +1,65 @@
+/**
+ * Tests for Single-Flight Request Coalescing
+ */
+
+import { jest } from '@jest/globals';
+import { SingleFlight } from '../utils/singleFlight.js';
+
+const deferred = () => {
+    let resolve;
+    let reject;
+    const promise = new Promise((res, rej) => {
+        resolve = res;
+        reject = rej;
+    });
+    return { promise, resolve, reject };
+};
+
+describe('SingleFlight', () => {
+    test('should share one call between concurrent callers', async () => {
+        const flight = new SingleFlight();
+        const upstream = deferred();
+        const fn = jest.fn(() => upstream.promise);
+
+        const callers = [flight.do('msg', fn), flight.do('msg', fn), flight.do('msg', fn)];
+        expect(flight.size).toBe(1);
+
+        upstream.resolve('verdict');
+        expect(await Promise.all(callers)).toEqual(['verdict', 'verdict', 'verdict']);
+        expect(fn).toHaveBeenCalledTimes(1);
+        expect(flight.stats()).toEqual({ in_flight: 0, calls: 1, coalesced: 2 });
+    });
+
+    test('should keep different keys independent', async () => {
+        const flight = new SingleFlight();
+        const fn = jest.fn(async () => 'ok');
+
+        await Promise.all([flight.do('a', fn), flight.do('b', fn)]);
+
+        expect(fn).toHaveBeenCalledTimes(2);
+    });
+
+    test('should deliver failures to every waiter and then forget them', async () => {
+        const flight = new SingleFlight();
+        const upstream = deferred();
+
+        const first = flight.do('msg', () => upstream.promise);
+        const second = flight.do('msg', () => upstream.promise);
+        upstream.reject(new Error('quota exceeded'));
+
+        await expect(first).rejects.toThrow('quota exceeded');
+        await expect(second).rejects.toThrow('quota exceeded');
+        expect(flight.size).toBe(0);
+
+        await expect(flight.do('msg', async () => 'retried')).resolves.toBe('retried');
+    });
+
+    test('should clean up when fn throws synchronously', async () => {
+        const flight = new SingleFlight();
+
+        await expect(flight.do('msg', () => {
+            throw new Error('boom');
+        })).rejects.toThrow('boom');
+        expect(flight.size).toBe(0);
+    });
+});
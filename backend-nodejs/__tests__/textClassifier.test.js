@@ -0,0 +1,61 @@
+/**
+ * Tests for the Hashed N-gram Text Classifier
+ */
+
+import { hashFeatures, TextClassifier, trainClassifier } from '../utils/textClassifier.js';
+
+const PHISHING = [
+    'Your account has been suspended, verify your identity at http://secure-login.tk/verify',
+    'URGENT: confirm your password within 24 hours or lose access',
+    'You won a prize! Claim it now by sending your card details',
+    'Send your seed phrase to support to restore wallet access',
+];
+
+const LEGITIMATE = [
+    'Hi team, the standup is moved to 3pm tomorrow',
+    'Thanks for your order, it ships on Monday',
+    'Are we still on for lunch on Friday?',
+    'Attached is the quarterly report for your review',
+];
+
+const corpus = () => {
+    const samples = [];
+    for (let i = 0; i < 50; i++) {
+        samples.push({ text: `${PHISHING[i % PHISHING.length]} #${i}`, label: true });
+        samples.push({ text: `${LEGITIMATE[i % LEGITIMATE.length]} #${i}`, label: false });
+    }
+    return samples;
+};
+
+describe('Text Classifier', () => {
+    test('should hash words, bigrams and character n-grams into the feature space', () => {
+        const features = hashFeatures('Verify your account', 1024);
+
+        // 3 words + 2 bigrams + 17 char 3-grams + 16 char 4-grams
+        expect(features.length).toBe(38);
+        expect(Array.from(features).every((index) => index < 1024)).toBe(true);
+        expect(Array.from(hashFeatures('VERIFY your account', 1024))).toEqual(Array.from(features));
+    });
+
+    test('should separate phishing from legitimate messages after training', () => {
+        const model = trainClassifier(corpus(), { dims: 1 << 14 });
+
+        expect(model.predict('Please verify your identity at http://secure-login.tk now')).toBeGreaterThan(0.7);
+        expect(model.predict('Is the quarterly report ready for Friday?')).toBeLessThan(0.3);
+    });
+
+    test('should round-trip through the model file layout', () => {
+        const model = trainClassifier(corpus(), { dims: 1 << 12, epochs: 2 });
+        const loaded = TextClassifier.fromBuffer(model.toBuffer());
+        const text = 'Claim your prize now';
+
+        expect(loaded.dims).toBe(model.dims);
+        expect(loaded.bias).toBe(model.bias);
+        expect(loaded.predict(text)).toBe(model.predict(text));
+    });
+
+    test('should reject files that are not classifier models', () => {
+        expect(() => TextClassifier.fromBuffer(Buffer.from('PGBL0000000000000000'))).toThrow('bad magic header');
+        expect(() => new TextClassifier({ dims: 100, weights: new Float32Array(100) })).toThrow('power of two');
+    });
+});
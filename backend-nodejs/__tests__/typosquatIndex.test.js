@@ -0,0 +1,62 @@
+/**
+ * Tests for Typosquat Index
+ */
+
+import { TyposquatIndex, editDistance, foldConfusables } from '../utils/typosquatIndex.js';
+
+describe('Typosquat Index', () => {
+    const index = new TyposquatIndex([
+        'paypal.com', 'google.com', 'microsoft.com', 'amazon.com', 'apple.com', 'blockchain.com',
+        'binance.com', 'chase.com', 'dropbox.com|dropbox.net',
+    ], { suspiciousSuffixes: ['.tk', '.ru'] });
+
+    test('should flag hosts within edit distance of a protected brand', () => {
+        expect(index.match('microsft.com')).toMatchObject({ brand: 'microsoft.com', distance: 1 });
+        expect(index.match('blockchian.com')).toMatchObject({ brand: 'blockchain.com' });
+    });
+
+    test('should need look-alike characters before allowing a typo in short names', () => {
+        expect(index.match('gooogle.com')).toBeNull();
+        expect(index.match('g00ogle.com')).toMatchObject({ brand: 'google.com', distance: 1 });
+    });
+
+    test('should fold look-alike characters before matching', () => {
+        expect(foldConfusables('arnaz0n')).toBe('amazon');
+        expect(index.match('paypa1.com')).toMatchObject({ brand: 'paypal.com' });
+        expect(index.match('app1e.net')).toMatchObject({ brand: 'apple.com' });
+    });
+
+    test('should flag the exact brand name as another registrable domain', () => {
+        expect(index.match('paypal.net')).toMatchObject({ brand: 'paypal.com', distance: 0 });
+        expect(index.match('paypal.tk')).toMatchObject({ brand: 'paypal.com', distance: 0 });
+    });
+
+    test('should flag brand names in subdomains only under suspicious domains', () => {
+        expect(index.match('login.paypa1.com.evil.ru')).toMatchObject({ label: 'paypa1' });
+        expect(index.match('secure.google.com-login.ru')).toMatchObject({ brand: 'google.com' });
+        expect(index.match('paypal.evil.com')).toBeNull();
+        expect(index.match('apple.stackexchange.com')).toBeNull();
+    });
+
+    test('should not flag country sites, owned alternates or ordinary look-alike words', () => {
+        for (const host of [
+            'google.co.uk', 'maps.google.de', 'amazon.de', 'paypal.me', 'chase.co.uk',
+            'dropbox.net', 'finance.yahoo.com', 'blockchair.com',
+        ]) {
+            expect(index.match(host)).toBeNull();
+        }
+    });
+
+    test('should not flag official domains or unrelated hosts', () => {
+        expect(index.match('paypal.com')).toBeNull();
+        expect(index.match('www.paypal.com')).toBeNull();
+        expect(index.match('example.com')).toBeNull();
+        expect(index.match('apply.com')).toBeNull();
+    });
+
+    test('should compute optimal string alignment distance', () => {
+        expect(editDistance('kitten', 'sitting')).toBe(3);
+        expect(editDistance('ab', 'ba')).toBe(1);
+        expect(editDistance('abc', 'xyz', 1)).toBe(2);
+    });
+});
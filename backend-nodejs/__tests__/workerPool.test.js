@@ -0,0 +1,52 @@
+/**
+ * Worker pool tests
+ */
+
+import { WorkerPool } from '../utils/workerPool.js';
+import { scoreLocally } from '../services/localScoring.js';
+
+const ECHO_WORKER = new URL('./fixtures/echoWorker.js', import.meta.url);
+
+describe('WorkerPool', () => {
+    let pool;
+
+    afterEach(async () => {
+        await pool?.close();
+        pool = null;
+    });
+
+    test('runs tasks across a bounded number of workers', async () => {
+        pool = new WorkerPool(ECHO_WORKER, { size: 2 });
+
+        const results = await Promise.all(['a', 'b', 'c', 'd', 'e'].map((data) => pool.run(data)));
+
+        expect(results.map(({ echo }) => echo)).toEqual(['a', 'b', 'c', 'd', 'e']);
+        expect(pool.stats()).toMatchObject({ size: 2, started: 2, busy: 0, queued: 0, completed: 5 });
+    });
+
+    test('rejects a failed task and keeps the worker', async () => {
+        pool = new WorkerPool(ECHO_WORKER, { size: 1 });
+
+        await expect(pool.run('fail')).rejects.toThrow('task failed');
+        await expect(pool.run('ok')).resolves.toEqual({ echo: 'ok' });
+        expect(pool.stats()).toMatchObject({ failed: 1, crashed: 0, completed: 1 });
+    });
+
+    test('replaces a crashed worker', async () => {
+        pool = new WorkerPool(ECHO_WORKER, { size: 1 });
+
+        const crashed = pool.run('crash');
+        const next = pool.run('after');
+
+        await expect(crashed).rejects.toThrow('code 3');
+        await expect(next).resolves.toEqual({ echo: 'after' });
+        expect(pool.stats()).toMatchObject({ crashed: 1, started: 1 });
+    });
+
+    test('scoring worker matches in-process scoring', async () => {
+        pool = new WorkerPool(new URL('../services/localScoringWorker.js', import.meta.url), { size: 1 });
+        const text = 'URGENT: verify your account at http://192.168.1.1/login or it will be suspended';
+
+        await expect(pool.run(text)).resolves.toEqual(scoreLocally(text));
+    });
+});
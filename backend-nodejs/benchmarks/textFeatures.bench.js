@@ -0,0 +1,69 @@
+/**
+ * Microbenchmark: single-pass character scanner vs regex/split counters
+ *
+ * Usage: node benchmarks/textFeatures.bench.js [sizeKb] [iterations]
+ */
+
+import { scanText } from '../services/textFeatures.js';
+
+const sizeKb = parseInt(process.argv[2] || '100', 10);
+const iterations = parseInt(process.argv[3] || '200', 10);
+
+/**
+ * Previous analyzeBehavior counters, kept here as the baseline
+ */
+const regexCounters = (text) => {
+    const words = text.split(/\s+/);
+    return {
+        exclamationCount: (text.match(/!/g) || []).length,
+        questionCount: (text.match(/\?/g) || []).length,
+        capsWordCount: words.filter(word =>
+            word.length > 3 &&
+            word === word.toUpperCase() &&
+            /^[A-Z]+$/.test(word)
+        ).length,
+        hasIrregularSpacing: /\s{3,}/.test(text),
+        hasExcessivePunctuation: /[.!?]{3,}/.test(text),
+    };
+};
+
+const buildSample = (targetLength) => {
+    const fragments = [
+        'Dear customer,', 'URGENT', 'your account', 'will be suspended!', 'VERIFY NOW',
+        'http://192.168.1.1/login', 'Why?', 'Thanks...', 'regards', '\n\n',
+    ];
+    const parts = [];
+    let length = 0;
+    for (let i = 0; length < targetLength; i++) {
+        const fragment = fragments[(i * 7) % fragments.length];
+        parts.push(fragment);
+        length += fragment.length + 1;
+    }
+    return parts.join(' ').slice(0, targetLength);
+};
+
+const time = (label, fn, text) => {
+    for (let i = 0; i < 10; i++) fn(text);
+
+    const start = process.hrtime.bigint();
+    for (let i = 0; i < iterations; i++) fn(text);
+    const elapsedMs = Number(process.hrtime.bigint() - start) / 1e6;
+
+    const perCall = elapsedMs / iterations;
+    console.log(`${label.padEnd(18)} ${perCall.toFixed(3)} ms/op`);
+    return perCall;
+};
+
+const text = buildSample(sizeKb * 1024);
+const expected = regexCounters(text);
+const actual = scanText(text);
+for (const key of Object.keys(expected)) {
+    if (expected[key] !== actual[key]) {
+        throw new Error(`Counter mismatch for ${key}: ${expected[key]} !== ${actual[key]}`);
+    }
+}
+
+console.log(`Input: ${text.length} chars, ${iterations} iterations`);
+const baseline = time('regex + split', regexCounters, text);
+const scanner = time('single-pass scan', scanText, text);
+console.log(`Speedup: ${(baseline / scanner).toFixed(2)}x`);
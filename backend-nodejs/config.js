@@ -6,8 +6,9 @@
  */
 
 import dotenv from 'dotenv';
+import os from 'os';
 import { fileURLToPath } from 'url';
-import { dirname, join } from 'path';
+import { dirname, join, resolve } from 'path';
 
 // Load environment variables
 const __filename = fileURLToPath(import.meta.url);
@@ -25,6 +26,36 @@ const parseArray = (value, defaultValue = []) => {
     return value.split(',').map(item => item.trim()).filter(Boolean);
 };
 
+/**
+ * Parse "key[:rpm]" entries into API keys with a requests-per-minute budget
+ * @param {string} value - Comma-separated keys
+ * @param {number} defaultRpm - Budget for keys without one (0 = unlimited)
+ * @returns {Array<{key: string, rpm: number}>} Unique keys in order
+ */
+const parseApiKeys = (value, defaultRpm = 0) => {
+    const keys = new Map();
+    for (const entry of parseArray(value)) {
+        const [key, rpm] = entry.split(':').map((part) => part.trim());
+        if (key && !keys.has(key)) {
+            keys.set(key, { key, rpm: rpm === undefined ? defaultRpm : parseInt(rpm, 10) });
+        }
+    }
+    return [...keys.values()];
+};
+
+/**
+ * AI provider: gemini (default), openai (OpenAI-compatible server) or mock
+ */
+const aiProvider = (process.env.AI_PROVIDER || 'gemini').trim().toLowerCase();
+
+/**
+ * Gemini keys: GEMINI_API_KEY plus any in GEMINI_API_KEYS, each with its own quota
+ */
+const geminiKeys = parseApiKeys(
+    [process.env.GEMINI_API_KEY, process.env.GEMINI_API_KEYS].filter(Boolean).join(','),
+    parseInt(process.env.GEMINI_KEY_RPM || '0', 10)
+);
+
 /**
  * Application configuration object
  */
@@ -39,6 +70,7 @@ const config = {
     server: {
         port: parseInt(process.env.PORT || '5000', 10),
         host: process.env.HOST || (process.env.NODE_ENV === 'production' ? '0.0.0.0' : '127.0.0.1'),
+        requestTimeoutMs: parseInt(process.env.SERVER_REQUEST_TIMEOUT_MS || '300000', 10), // time to receive a request body (not bulk scans)
     },
 
     // Security
@@ -53,11 +85,132 @@ const config = {
         ),
     },
 
+    // POST /analyze/batch
+    batchApi: {
+        maxItems: parseInt(process.env.BATCH_MAX_ITEMS || '50', 10),
+        maxRequestSize: process.env.BATCH_MAX_REQUEST_SIZE || '5mb',
+        itemWeight: parseFloat(process.env.BATCH_ITEM_WEIGHT || '0.5'), // rate-limit cost per message
+        workers: parseInt(process.env.BATCH_WORKERS || String(Math.max(1, Math.min(4, os.cpus().length - 1))), 10), // 0 scores in-process
+        aiConcurrency: parseInt(process.env.BATCH_AI_CONCURRENCY || '4', 10), // AI calls in flight per batch
+    },
+
+    // POST /analyze/stream
+    streamApi: {
+        maxStreams: parseInt(process.env.STREAM_MAX_CONCURRENT || '4', 10),
+        maxPerClient: parseInt(process.env.STREAM_MAX_PER_CLIENT || '1', 10), // open scans per client IP
+        maxInFlight: parseInt(process.env.STREAM_MAX_IN_FLIGHT || '32', 10), // messages being analyzed per stream
+        aiConcurrency: parseInt(process.env.STREAM_AI_CONCURRENCY || '4', 10), // AI calls in flight per stream
+        maxLineLength: parseInt(process.env.STREAM_MAX_LINE_LENGTH || '1048576', 10), // characters per NDJSON line
+        idleTimeoutMs: parseInt(process.env.STREAM_IDLE_TIMEOUT_MS || '60000', 10), // scan dropped after this long without socket activity
+    },
+
     // AI Integration
     ai: {
-        geminiApiKey: process.env.GEMINI_API_KEY || '',
-        enabled: !!process.env.GEMINI_API_KEY,
+        provider: aiProvider,
+        enabled: aiProvider === 'mock' ||
+            (aiProvider === 'gemini' && geminiKeys.length > 0) ||
+            (aiProvider === 'openai' && !!process.env.AI_OPENAI_BASE_URL && !!process.env.AI_OPENAI_MODEL),
+        geminiApiKey: geminiKeys[0]?.key || '',
+        geminiKeys,
+        keyPool: {
+            maxRetries: parseInt(process.env.AI_KEY_MAX_RETRIES || '2', 10), // retries on 429/503, within the timeout
+            backoffBaseMs: parseInt(process.env.AI_KEY_BACKOFF_BASE_MS || '500', 10),
+            backoffMaxMs: parseInt(process.env.AI_KEY_BACKOFF_MAX_MS || '30000', 10),
+        },
+        baseUrl: process.env.GEMINI_API_BASE_URL || 'https://generativelanguage.googleapis.com',
+        openai: {
+            baseUrl: process.env.AI_OPENAI_BASE_URL || '', // e.g. http://127.0.0.1:8000/v1
+            apiKey: process.env.AI_OPENAI_API_KEY || '',
+            model: process.env.AI_OPENAI_MODEL || '',
+        },
+        // Synthetic provider for offline capacity tests
+        mock: {
+            latencyDistribution: process.env.AI_MOCK_LATENCY_DISTRIBUTION || 'lognormal',
+            latencyMs: parseInt(process.env.AI_MOCK_LATENCY_MS || '400', 10),
+            latencySpread: parseFloat(process.env.AI_MOCK_LATENCY_SPREAD || '0.5'),
+            errorRate: parseFloat(process.env.AI_MOCK_ERROR_RATE || '0'),
+            malformedRate: parseFloat(process.env.AI_MOCK_MALFORMED_RATE || '0'),
+            seed: parseInt(process.env.AI_MOCK_SEED || '1', 10),
+        },
         timeout: 30000, // 30 seconds
+        maxSockets: parseInt(process.env.AI_MAX_SOCKETS || '50', 10),
+        maxFreeSockets: parseInt(process.env.AI_MAX_FREE_SOCKETS || '10', 10),
+        cascade: {
+            enabled: process.env.AI_CASCADE_ENABLED === 'true',
+            highScore: parseInt(process.env.AI_CASCADE_HIGH_SCORE || '85', 10),
+            lowScore: parseInt(process.env.AI_CASCADE_LOW_SCORE || '0', 10),
+        },
+        queue: {
+            maxConcurrent: parseInt(process.env.AI_MAX_CONCURRENCY || '8', 10),
+            maxQueue: parseInt(process.env.AI_QUEUE_SIZE || '100', 10),
+            queueTimeoutMs: parseInt(process.env.AI_QUEUE_TIMEOUT_MS || '5000', 10),
+        },
+        streaming: {
+            enabled: process.env.AI_STREAMING === 'true',
+            detailTimeoutMs: parseInt(process.env.AI_STREAM_DETAIL_TIMEOUT_MS || '2000', 10),
+            partialCacheTtlMs: parseInt(process.env.AI_STREAM_PARTIAL_CACHE_TTL_MS || '60000', 10),
+        },
+        condense: {
+            tokenBudget: parseInt(process.env.AI_INPUT_TOKEN_BUDGET || '4000', 10), // 0 sends full messages
+            windowChars: parseInt(process.env.AI_INPUT_WINDOW_CHARS || '200', 10),
+            headChars: parseInt(process.env.AI_INPUT_HEAD_CHARS || '1000', 10),
+            tailChars: parseInt(process.env.AI_INPUT_TAIL_CHARS || '500', 10),
+        },
+        batch: {
+            windowMs: parseInt(process.env.AI_BATCH_WINDOW_MS || '0', 10), // 0 disables batching
+            maxSize: parseInt(process.env.AI_BATCH_MAX_SIZE || '8', 10),
+        },
+        breaker: {
+            windowSize: 50,
+            minRequests: parseInt(process.env.AI_BREAKER_MIN_REQUESTS || '10', 10),
+            errorThreshold: parseFloat(process.env.AI_BREAKER_ERROR_RATE || '0.5'),
+            slowCallMs: parseInt(process.env.AI_BREAKER_SLOW_CALL_MS || '10000', 10),
+            slowThreshold: parseFloat(process.env.AI_BREAKER_SLOW_RATE || '0.8'),
+            openMs: parseInt(process.env.AI_BREAKER_OPEN_MS || '30000', 10),
+        },
+        adaptiveTimeout: {
+            windowSize: 200,
+            minSamples: 20,
+            percentile: parseFloat(process.env.AI_TIMEOUT_PERCENTILE || '0.99'),
+            multiplier: 2,
+            minMs: parseInt(process.env.AI_TIMEOUT_MIN_MS || '3000', 10),
+        },
+        cache: {
+            maxEntries: parseInt(process.env.AI_CACHE_SIZE || '5000', 10),
+            ttlMs: parseInt(process.env.AI_CACHE_TTL_MS || '3600000', 10), // 1 hour
+            snapshotPath: process.env.AI_CACHE_SNAPSHOT_PATH ? resolve(__dirname, process.env.AI_CACHE_SNAPSHOT_PATH) : '',
+            snapshotIntervalMs: parseInt(process.env.AI_CACHE_SNAPSHOT_INTERVAL_MS || '300000', 10), // 5 minutes
+        },
+    },
+
+    // Threat-intel domain/URL blocklist (compiled with scripts/build-blocklist.js)
+    blocklist: {
+        path: process.env.BLOCKLIST_PATH ? resolve(__dirname, process.env.BLOCKLIST_PATH) : '',
+    },
+
+    // Local hashed n-gram classifier (trained with scripts/train-classifier.js)
+    localModel: {
+        path: process.env.LOCAL_MODEL_PATH ? resolve(__dirname, process.env.LOCAL_MODEL_PATH) : '',
+        weight: parseFloat(process.env.LOCAL_MODEL_WEIGHT || '0.4'),
+    },
+
+    // Typosquat protection for brand domains
+    typosquat: {
+        brands: parseArray(process.env.PROTECTED_BRANDS, [
+            'paypal.com', 'google.com', 'microsoft.com', 'netflix.com', 'amazon.com',
+            'apple.com', 'facebook.com|facebook.net', 'instagram.com', 'twitter.com', 'linkedin.com',
+            'dropbox.com|dropbox.net', 'adobe.com', 'coinbase.com', 'binance.com', 'kraken.com',
+            'metamask.io', 'trustwallet.com', 'blockchain.com', 'chase.com',
+            'wellsfargo.com', 'bankofamerica.com',
+        ]),
+        brandsFile: process.env.PROTECTED_BRANDS_FILE ? resolve(__dirname, process.env.PROTECTED_BRANDS_FILE) : '',
+        maxDistance: parseInt(process.env.TYPOSQUAT_MAX_DISTANCE || '2', 10),
+    },
+
+    // Per-URL verdict cache
+    urlCache: {
+        maxEntries: parseInt(process.env.URL_CACHE_SIZE || '10000', 10),
+        ttlMs: parseInt(process.env.URL_CACHE_TTL_MS || '600000', 10), // 10 minutes
     },
 
     // Logging
@@ -92,8 +245,140 @@ const validateConfig = () => {
         errors.push('Invalid RATE_LIMIT_REQUESTS: must be at least 1');
     }
 
-    if (!config.ai.geminiApiKey && config.isProduction) {
-        console.warn('WARNING: GEMINI_API_KEY not set - AI features disabled');
+    const { batchApi } = config;
+    if (batchApi.maxItems < 1 || batchApi.workers < 0 || batchApi.aiConcurrency < 1) {
+        errors.push('Invalid BATCH_MAX_ITEMS/BATCH_WORKERS/BATCH_AI_CONCURRENCY: need at least 1 item and 1 AI call (workers may be 0)');
+    }
+
+    if (!(batchApi.itemWeight > 0)) {
+        errors.push('Invalid BATCH_ITEM_WEIGHT: must be positive');
+    }
+
+    const { streamApi } = config;
+    if (streamApi.maxStreams < 1 || streamApi.maxInFlight < 1 || streamApi.aiConcurrency < 1) {
+        errors.push('Invalid STREAM_MAX_CONCURRENT/STREAM_MAX_IN_FLIGHT/STREAM_AI_CONCURRENCY: must be at least 1');
+    }
+
+    if (!Number.isInteger(streamApi.maxPerClient) || streamApi.maxPerClient < 1) {
+        errors.push('Invalid STREAM_MAX_PER_CLIENT: must be a whole number of at least 1');
+    }
+
+    if (streamApi.idleTimeoutMs < 0) {
+        errors.push('Invalid STREAM_IDLE_TIMEOUT_MS: cannot be negative (0 = no limit)');
+    }
+
+    if (streamApi.maxLineLength < config.security.maxTextLength) {
+        errors.push('Invalid STREAM_MAX_LINE_LENGTH: must be at least MAX_TEXT_LENGTH');
+    }
+
+    if (config.server.requestTimeoutMs < 0) {
+        errors.push('Invalid SERVER_REQUEST_TIMEOUT_MS: cannot be negative (0 = no limit)');
+    }
+
+    if (config.typosquat.maxDistance < 0 || config.typosquat.maxDistance > 2) {
+        errors.push('Invalid TYPOSQUAT_MAX_DISTANCE: must be between 0 and 2');
+    }
+
+    if (!Number.isInteger(config.urlCache.maxEntries) || config.urlCache.maxEntries < 1) {
+        errors.push('Invalid URL_CACHE_SIZE: must be a whole number of at least 1');
+    }
+
+    if (!Number.isInteger(config.urlCache.ttlMs) || config.urlCache.ttlMs < 0) {
+        errors.push('Invalid URL_CACHE_TTL_MS: must be a whole number of milliseconds (0 = no expiry)');
+    }
+
+    if (!(config.localModel.weight >= 0 && config.localModel.weight <= 1)) {
+        errors.push('Invalid LOCAL_MODEL_WEIGHT: must be between 0 and 1');
+    }
+
+    if (!['gemini', 'openai', 'mock'].includes(config.ai.provider)) {
+        errors.push('Invalid AI_PROVIDER: must be gemini, openai or mock');
+    }
+
+    if (config.ai.geminiKeys.some(({ rpm }) => !(rpm >= 0))) {
+        errors.push('Invalid GEMINI_API_KEYS/GEMINI_KEY_RPM: per-key budgets must be whole requests per minute (0 = unlimited)');
+    }
+
+    const { keyPool } = config.ai;
+    if (!(keyPool.maxRetries >= 0) || !(keyPool.backoffBaseMs > 0) || !(keyPool.backoffMaxMs >= keyPool.backoffBaseMs)) {
+        errors.push('Invalid AI_KEY_MAX_RETRIES/AI_KEY_BACKOFF_*: retries cannot be negative and the backoff ceiling must be at least the base');
+    }
+
+    const { mock } = config.ai;
+    if (!['fixed', 'uniform', 'normal', 'lognormal'].includes(mock.latencyDistribution)) {
+        errors.push('Invalid AI_MOCK_LATENCY_DISTRIBUTION: must be fixed, uniform, normal or lognormal');
+    }
+
+    if (!(mock.latencyMs >= 0 && mock.latencySpread >= 0)) {
+        errors.push('Invalid AI_MOCK_LATENCY_MS/AI_MOCK_LATENCY_SPREAD: cannot be negative');
+    }
+
+    if (!(mock.errorRate >= 0 && mock.malformedRate >= 0 && mock.errorRate + mock.malformedRate <= 1)) {
+        errors.push('Invalid AI_MOCK_ERROR_RATE/AI_MOCK_MALFORMED_RATE: must be between 0 and 1 combined');
+    }
+
+    if (config.ai.maxSockets < 1 || config.ai.maxFreeSockets < 0) {
+        errors.push('Invalid AI_MAX_SOCKETS/AI_MAX_FREE_SOCKETS: need at least 1 socket');
+    }
+
+    if (config.ai.cascade.lowScore >= config.ai.cascade.highScore) {
+        errors.push('Invalid AI_CASCADE_LOW_SCORE/AI_CASCADE_HIGH_SCORE: low bound must be below high bound');
+    }
+
+    if (config.ai.queue.maxConcurrent < 1 || config.ai.queue.maxQueue < 0) {
+        errors.push('Invalid AI_MAX_CONCURRENCY/AI_QUEUE_SIZE: need at least 1 concurrent request');
+    }
+
+    if (config.ai.streaming.detailTimeoutMs < 0) {
+        errors.push('Invalid AI_STREAM_DETAIL_TIMEOUT_MS: cannot be negative');
+    }
+
+    if (!(config.ai.streaming.partialCacheTtlMs >= 1)) {
+        errors.push('Invalid AI_STREAM_PARTIAL_CACHE_TTL_MS: must be at least 1');
+    }
+
+    const { condense } = config.ai;
+    if (condense.tokenBudget < 0 || condense.windowChars < 0 || condense.headChars < 0 || condense.tailChars < 0) {
+        errors.push('Invalid AI_INPUT_* settings: token budget and window sizes cannot be negative');
+    }
+
+    if (config.ai.batch.windowMs < 0 || config.ai.batch.maxSize < 1) {
+        errors.push('Invalid AI_BATCH_WINDOW_MS/AI_BATCH_MAX_SIZE: window must be >= 0 and size at least 1');
+    }
+
+    const { breaker, adaptiveTimeout } = config.ai;
+    if (!(breaker.errorThreshold > 0 && breaker.errorThreshold <= 1) ||
+        !(breaker.slowThreshold > 0 && breaker.slowThreshold <= 1)) {
+        errors.push('Invalid AI_BREAKER_ERROR_RATE/AI_BREAKER_SLOW_RATE: must be between 0 and 1');
+    }
+
+    if (!(adaptiveTimeout.percentile > 0 && adaptiveTimeout.percentile <= 1)) {
+        errors.push('Invalid AI_TIMEOUT_PERCENTILE: must be between 0 and 1');
+    }
+
+    const { cache } = config.ai;
+    if (!Number.isInteger(cache.maxEntries) || cache.maxEntries < 1) {
+        errors.push('Invalid AI_CACHE_SIZE: must be a whole number of at least 1');
+    }
+
+    if (!Number.isInteger(cache.ttlMs) || cache.ttlMs < 0) {
+        errors.push('Invalid AI_CACHE_TTL_MS: must be a whole number of milliseconds (0 = no expiry)');
+    }
+
+    if (!Number.isInteger(cache.snapshotIntervalMs) || cache.snapshotIntervalMs < 0) {
+        errors.push('Invalid AI_CACHE_SNAPSHOT_INTERVAL_MS: must be a whole number of milliseconds (0 = only on shutdown)');
+    }
+
+    if (!config.ai.enabled && config.isProduction) {
+        console.warn(`WARNING: AI provider "${config.ai.provider}" not configured - AI features disabled`);
+    }
+
+    if (Math.ceil(config.batchApi.maxItems * config.batchApi.itemWeight) > config.security.rateLimitRequests) {
+        console.warn('WARNING: a full batch (BATCH_MAX_ITEMS x BATCH_ITEM_WEIGHT) exceeds RATE_LIMIT_REQUESTS and will always be rate limited');
+    }
+
+    if (config.ai.provider === 'mock' && config.isProduction) {
+        console.warn('WARNING: AI_PROVIDER=mock returns synthetic verdicts - use for load testing only');
     }
 
     if (errors.length > 0) {
@@ -1,75 +1,280 @@
 
 
-import geminiAI from '../services/aiService.js';
-import { analyzeHeuristic } from '../services/heuristicService.js';
+import aiService, { condenseForAI } from '../services/aiService.js';
+import { scoreLocally } from '../services/localScoring.js';
 import {
     combineScores,
     mergeRiskFactors,
     createAnalysisResult,
     validateScore,
 } from '../utils/riskScorer.js';
+import { CascadeBranch, CascadePolicy } from '../utils/cascadePolicy.js';
+import { ConcurrencyLimiter, QueueRejectedError } from '../utils/concurrencyLimiter.js';
+import { WorkerPool } from '../utils/workerPool.js';
 import logger from '../utils/logger.js';
 import config from '../config.js';
 
 /**
- * Main analysis function
- * Performs multi-layer phishing detection on any message type
- * Supports emails, SMS, chat messages, and social media content
+ * Decides which messages are ambiguous enough to need the AI tier
  */
-export const analyzeEmail = async (text) => {
-    const startTime = Date.now();
+const cascadePolicy = new CascadePolicy(config.ai.cascade);
+
+/**
+ * Worker threads for batch and stream heuristics (null scores them in-process)
+ */
+const scoringPool = config.batchApi.workers > 0
+    ? new WorkerPool(new URL('../services/localScoringWorker.js', import.meta.url), { size: config.batchApi.workers })
+    : null;
+
+const batchCounters = { batches: 0, items: 0, duplicates: 0, worker_fallbacks: 0 };
+const streamCounters = { active: 0, streams: 0, lines: 0, analyzed: 0, invalid: 0, failed: 0 };
+
+/**
+ * Cascade routing counters (for health/metrics)
+ */
+export const getCascadeStats = () => cascadePolicy.stats();
+
+/**
+ * Batch endpoint counters and worker pool (for health/metrics)
+ */
+export const getBatchStats = () => ({
+    ...batchCounters,
+    workers: scoringPool ? scoringPool.stats() : null,
+});
+
+/**
+ * Streaming scan counters (for health/metrics)
+ */
+export const getStreamStats = () => ({ ...streamCounters });
+
+/**
+ * AI tier (when the cascade asks for it) and final scoring on top of the
+ * local scores
+ * @param {ConcurrencyLimiter} aiSlots - Optional cap on the caller's AI calls in flight
+ */
+const completeAnalysis = async (text, { heuristicResult, localResult, preAiScore }, startTime, aiSlots = null) => {
     let aiResult = null;
-    let heuristicResult = null;
+    let aiSkipReason = null;
+    let aiInput = null;
 
-    try {
-        logger.info('Starting message analysis');
-
-        // Run heuristic analysis (always)
-        heuristicResult = analyzeHeuristic(text);
-        logger.debug(`Heuristic analysis complete: score=${heuristicResult.score}`);
-
-        // Run AI analysis if available
-        if (config.ai.enabled) {
-            try {
-                aiResult = await geminiAI.analyze(text);
-                logger.debug(`AI analysis complete: confidence=${aiResult.confidence}`);
-            } catch (aiError) {
-                // AI failure shouldn't break the entire analysis
+    logger.debug(`Heuristic analysis complete: score=${heuristicResult.score}`);
+
+    // Run AI analysis if available and the local verdict is not already decisive
+    const branch = config.ai.enabled ? cascadePolicy.route(preAiScore) : null;
+    if (branch && branch !== CascadeBranch.AMBIGUOUS) {
+        aiSkipReason = branch;
+        logger.debug(`AI skipped by cascade: ${branch} (pre-AI score=${Math.round(preAiScore)})`);
+    } else if (config.ai.enabled) {
+        // Long messages are cut down to their highest-signal windows first
+        const condensed = condenseForAI(text);
+        aiInput = {
+            condensed: condensed.condensed,
+            original_bytes: condensed.originalBytes,
+            sent_bytes: condensed.sentBytes,
+            bytes_saved: condensed.bytesSaved,
+        };
+
+        try {
+            const analyze = () => aiService.analyze(condensed.text);
+            aiResult = await (aiSlots ? aiSlots.run(analyze) : analyze());
+            logger.debug(`AI analysis complete: confidence=${aiResult.confidence}`);
+        } catch (aiError) {
+            // AI failure shouldn't break the entire analysis
+            if (aiError instanceof QueueRejectedError) {
+                aiSkipReason = aiError.reason;
+                logger.warn(`AI queue saturated (${aiError.reason}), falling back to heuristics only`);
+            } else {
                 logger.warn(`AI analysis failed, falling back to heuristics only: ${aiError.message}`);
-                aiResult = null;
             }
+            aiResult = null;
         }
+    }
+
+    // Combine results
+    const finalScore = validateScore(
+        combineScores(aiResult, heuristicResult.score, localResult)
+    );
 
-        // Combine results
-        const finalScore = validateScore(
-            combineScores(aiResult, heuristicResult.score)
-        );
+    const riskFactors = mergeRiskFactors(
+        aiResult,
+        heuristicResult.reasons
+    );
 
-        const riskFactors = mergeRiskFactors(
-            aiResult,
-            heuristicResult.reasons
-        );
+    // Create final result
+    const result = createAnalysisResult(finalScore, riskFactors, aiResult, { aiSkipReason, aiInput, localResult });
 
-        // Create final result
-        const result = createAnalysisResult(finalScore, riskFactors, aiResult);
+    const duration = Date.now() - startTime;
+    logger.info({
+        message: 'Analysis complete',
+        score: finalScore,
+        risk_level: result.risk_level,
+        duration: `${duration}ms`,
+        ai_enabled: !!aiResult,
+    });
 
-        const duration = Date.now() - startTime;
-        logger.info({
-            message: 'Analysis complete',
-            score: finalScore,
-            risk_level: result.risk_level,
-            duration: `${duration}ms`,
-            ai_enabled: !!aiResult,
-        });
+    return result;
+};
 
-        return result;
+/**
+ * Local scores from a worker thread, or in-process when no pool is
+ * configured or the worker failed
+ */
+const scoreInPool = async (text) => {
+    if (!scoringPool) {
+        return scoreLocally(text);
+    }
 
+    try {
+        return await scoringPool.run(text);
+    } catch (error) {
+        batchCounters.worker_fallbacks++;
+        logger.warn(`Scoring worker failed, scoring in-process: ${error.message}`);
+        return scoreLocally(text);
+    }
+};
+
+/**
+ * Main analysis function
+ * Performs multi-layer phishing detection on any message type
+ * Supports emails, SMS, chat messages, and social media content
+ */
+export const analyzeEmail = async (text) => {
+    logger.info('Starting message analysis');
+
+    try {
+        return await completeAnalysis(text, scoreLocally(text), Date.now());
     } catch (error) {
         logger.error(`Message analysis failed: ${error.message}`);
         throw error;
     }
 };
 
+/**
+ * Analyze many messages in one call. Identical texts are analyzed once;
+ * heuristics run on the worker pool and AI calls go through the shared AI
+ * queue, at most BATCH_AI_CONCURRENCY at a time per batch. One message
+ * failing does not fail the others.
+ * @param {Array<{id: string|number, text: string}>} items
+ * @returns {Promise<Object>} { results (request order), metadata }
+ */
+export const analyzeBatch = async (items) => {
+    const startTime = Date.now();
+    const uniqueTexts = [...new Set(items.map(({ text }) => text))];
+    const aiSlots = new ConcurrencyLimiter({
+        maxConcurrent: config.batchApi.aiConcurrency,
+        maxQueue: uniqueTexts.length,
+    });
+
+    batchCounters.batches++;
+    batchCounters.items += items.length;
+    batchCounters.duplicates += items.length - uniqueTexts.length;
+
+    const analyses = await Promise.all(uniqueTexts.map(async (text) => {
+        try {
+            const local = await scoreInPool(text);
+            return await completeAnalysis(text, local, Date.now(), aiSlots);
+        } catch (error) {
+            logger.error(`Batch message analysis failed: ${error.message}`);
+            return { error: 'Analysis failed' };
+        }
+    }));
+
+    const byText = new Map(uniqueTexts.map((text, i) => [text, analyses[i]]));
+    const results = items.map(({ id, text }) => ({ id, ...byText.get(text) }));
+
+    logger.info({
+        message: 'Batch analysis complete',
+        items: items.length,
+        unique: uniqueTexts.length,
+        failed: analyses.filter((analysis) => analysis.error).length,
+        duration: `${Date.now() - startTime}ms`,
+    });
+
+    return {
+        results,
+        metadata: {
+            items: items.length,
+            unique: uniqueTexts.length,
+            duration_ms: Date.now() - startTime,
+            timestamp: new Date().toISOString(),
+        },
+    };
+};
+
+/**
+ * Analyze an unbounded sequence of messages, handing each verdict to write
+ * as soon as it is ready (completion order, not input order). At most
+ * STREAM_MAX_IN_FLIGHT messages are between read and written; the next
+ * record is only pulled once one finishes, and write resolving late (a
+ * slow reader) holds its slot, so memory stays flat for any job size.
+ * Records that failed parsing are reported in place and do not stop it.
+ * @param {AsyncIterable<Object>} records - { number, value: { id, text } } or { number, id?, error }
+ * @param {Function} write - async (record) => void, resolves when the output can take more
+ * @param {Object} options
+ * @param {AbortSignal} options.signal - Stops reading (client went away)
+ * @returns {Promise<Object>} Summary counts
+ */
+export const analyzeStream = async (records, write, { signal } = {}) => {
+    const startTime = Date.now();
+    const { maxInFlight, aiConcurrency } = config.streamApi;
+    const aiSlots = new ConcurrencyLimiter({ maxConcurrent: aiConcurrency, maxQueue: maxInFlight });
+    const summary = { lines: 0, analyzed: 0, invalid: 0, failed: 0 };
+    const inFlight = new Set();
+
+    const count = (field) => {
+        summary[field]++;
+        streamCounters[field]++;
+    };
+
+    const handle = async ({ number, value, id, error }) => {
+        if (error) {
+            count('invalid');
+            return write({ ...(id !== undefined && { id }), line: number, error });
+        }
+
+        let result;
+        try {
+            const local = await scoreInPool(value.text);
+            result = { id: value.id, ...await completeAnalysis(value.text, local, Date.now(), aiSlots) };
+            count('analyzed');
+        } catch (analysisError) {
+            logger.error(`Stream message analysis failed: ${analysisError.message}`);
+            count('failed');
+            result = { id: value.id, line: number, error: 'Analysis failed' };
+        }
+        return write(result);
+    };
+
+    streamCounters.active++;
+    streamCounters.streams++;
+    try {
+        for await (const record of records) {
+            summary.lines++;
+            streamCounters.lines++;
+
+            const task = handle(record).finally(() => inFlight.delete(task));
+            inFlight.add(task);
+
+            while (inFlight.size >= maxInFlight) {
+                await Promise.race(inFlight);
+            }
+            if (signal?.aborted) break;
+        }
+        await Promise.all(inFlight);
+    } finally {
+        streamCounters.active--;
+    }
+
+    logger.info({
+        message: 'Stream analysis complete',
+        ...summary,
+        aborted: !!signal?.aborted,
+        duration: `${Date.now() - startTime}ms`,
+    });
+
+    return { ...summary, duration_ms: Date.now() - startTime };
+};
+
 /**
  * Validate message content before analysis
  */
@@ -105,7 +105,9 @@ const getErrorName = (statusCode) => {
         401: 'Unauthorized',
         403: 'Forbidden',
         404: 'Not Found',
+        408: 'Request Timeout',
         413: 'Payload Too Large',
+        415: 'Unsupported Media Type',
         429: 'Too Many Requests',
         500: 'Internal Server Error',
         503: 'Service Unavailable',
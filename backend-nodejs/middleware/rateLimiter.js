@@ -5,11 +5,30 @@
  * Uses express-rate-limit with memory store (use Redis in production for distributed systems).
  */
 
-import rateLimit from 'express-rate-limit';
+import rateLimit, { MemoryStore } from 'express-rate-limit';
 import config from '../config.js';
 import logger from '../utils/logger.js';
 import { getClientIp } from './security.js';
 
+/**
+ * Hit counts per IP, shared by the single and batch analyze endpoints
+ */
+const analyzeStore = new MemoryStore();
+
+/**
+ * Response for a client over its analyze budget
+ */
+const rejectOverLimit = (req, res) => {
+    const clientIp = getClientIp(req);
+    logger.warn(`Rate limit exceeded for IP: ${clientIp}`);
+
+    res.status(429).json({
+        error: 'Too Many Requests',
+        message: 'Rate limit exceeded. Please try again later.',
+        retryAfter: Math.ceil(config.security.rateLimitWindowMs / 1000),
+    });
+};
+
 /**
  * Rate limiter for analyze endpoint
  */
@@ -18,26 +37,107 @@ export const analyzeLimiter = rateLimit({
     max: config.security.rateLimitRequests,
     standardHeaders: true, // Return rate limit info in `RateLimit-*` headers
     legacyHeaders: false, // Disable `X-RateLimit-*` headers
+    store: analyzeStore,
 
     // Custom key generator with proxy support
     keyGenerator: (req) => getClientIp(req),
 
     // Custom handler for rate limit exceeded
-    handler: (req, res) => {
-        const clientIp = getClientIp(req);
-        logger.warn(`Rate limit exceeded for IP: ${clientIp}`);
-
-        res.status(429).json({
-            error: 'Too Many Requests',
-            message: 'Rate limit exceeded. Please try again later.',
-            retryAfter: Math.ceil(config.security.rateLimitWindowMs / 1000),
-        });
-    },
+    handler: rejectOverLimit,
 
     // Skip rate limiting in test environment
     skip: (req) => config.isTesting,
 });
 
+/**
+ * Rate-limit cost of a batch: BATCH_ITEM_WEIGHT per message, at least one
+ * request's worth. Counted before validation, so oversized batches are
+ * charged as a full one.
+ */
+export const batchWeight = (items) => {
+    const count = Array.isArray(items) ? Math.min(items.length, config.batchApi.maxItems) : 1;
+    return Math.max(1, Math.ceil(count * config.batchApi.itemWeight));
+};
+
+/**
+ * Rate limiter for the batch endpoint: draws its weight from the same
+ * per-IP budget as POST /analyze. A batch that does not fit is rejected
+ * whole and refunded.
+ */
+export const batchLimiter = async (req, res, next) => {
+    if (config.isTesting) {
+        return next();
+    }
+
+    try {
+        const key = getClientIp(req);
+        const weight = batchWeight(req.body?.items);
+        const limit = config.security.rateLimitRequests;
+
+        let info;
+        for (let i = 0; i < weight; i++) {
+            info = await analyzeStore.increment(key);
+        }
+
+        if (info.totalHits > limit) {
+            for (let i = 0; i < weight; i++) {
+                await analyzeStore.decrement(key);
+            }
+            return rejectOverLimit(req, res);
+        }
+
+        res.set({
+            'RateLimit-Limit': String(limit),
+            'RateLimit-Remaining': String(Math.max(0, limit - info.totalHits)),
+            'RateLimit-Reset': String(info.resetTime
+                ? Math.max(0, Math.ceil((info.resetTime - Date.now()) / 1000))
+                : Math.ceil(config.security.rateLimitWindowMs / 1000)),
+        });
+        next();
+    } catch (error) {
+        next(error);
+    }
+};
+
+/**
+ * Open bulk scans per IP
+ */
+const activeStreams = new Map();
+
+/**
+ * Per-IP cap on open bulk scans (STREAM_MAX_PER_CLIENT). A scan counts once
+ * against the request rate limit but may hold its slot for hours, so without
+ * this one client could take every STREAM_MAX_CONCURRENT slot.
+ * The slot is released when the response finishes or the connection drops.
+ */
+export const streamSlotLimiter = (req, res, next) => {
+    const key = getClientIp(req);
+    const active = activeStreams.get(key) ?? 0;
+    if (active >= config.streamApi.maxPerClient) {
+        logger.warn(`Bulk scan limit exceeded for IP: ${key}`);
+        return res.status(429).json({
+            error: 'Too Many Requests',
+            message: 'Too many bulk scans in progress from this client. Wait for one to finish.',
+        });
+    }
+
+    activeStreams.set(key, active + 1);
+    let released = false;
+    const release = () => {
+        if (released) return;
+        released = true;
+        const remaining = activeStreams.get(key) - 1;
+        if (remaining > 0) {
+            activeStreams.set(key, remaining);
+        } else {
+            activeStreams.delete(key);
+        }
+    };
+    res.once('finish', release);
+    res.once('close', release);
+    next();
+};
+
 /**
  * Lenient rate limiter for health checks and general endpoints
  */
@@ -28,6 +28,40 @@ export const securityHeaders = (req, res, next) => {
     next();
 };
 
+/**
+ * Per-route replacement for Node's server-wide requestTimeout: a request
+ * whose body has not fully arrived within timeoutMs gets 408 and its
+ * connection closed, guarding against slow-body clients. Paths in
+ * exemptPaths (long-running uploads) are not limited.
+ * @param {number} timeoutMs - Time allowed to receive the body (0 = no limit)
+ * @param {Array<string>} exemptPaths - Exact paths to skip
+ */
+export const requestBodyTimeout = (timeoutMs, exemptPaths = []) => (req, res, next) => {
+    if (!(timeoutMs > 0) || exemptPaths.includes(req.path) || req.complete) {
+        return next();
+    }
+
+    const timer = setTimeout(() => {
+        if (req.complete) {
+            return;
+        }
+
+        logger.warn(`Request body timeout after ${timeoutMs}ms: ${req.method} ${req.path}`);
+        if (!res.headersSent) {
+            res.status(408).set('Connection', 'close').json({
+                error: 'Request Timeout',
+                message: 'Request body was not received in time',
+            });
+        }
+        req.socket.destroySoon();
+    }, timeoutMs);
+
+    const clear = () => clearTimeout(timer);
+    req.once('end', clear);
+    req.once('close', clear);
+    next();
+};
+
 /**
  * Sanitize input to prevent injection attacks
  */
@@ -10,31 +10,77 @@ import { ApiError } from './errorHandler.js';
 import { sanitizeInput } from './security.js';
 import config from '../config.js';
 
+/**
+ * Joi schema for one message's text
+ */
+const textSchema = Joi.string()
+    .required()
+    .min(1)
+    .max(config.security.maxTextLength)
+    .trim()
+    .custom((value, helpers) => {
+        // Check for null bytes
+        if (value.includes('\0')) {
+            return helpers.error('any.invalid');
+        }
+        return value;
+    })
+    .messages({
+        'string.base': 'Field "text" must be a string',
+        'string.empty': 'Field "text" cannot be empty',
+        'string.min': 'Field "text" must contain at least 1 character',
+        'string.max': `Field "text" cannot exceed ${config.security.maxTextLength} characters`,
+        'any.required': 'Field "text" is required',
+        'any.invalid': 'Invalid characters detected in input',
+    });
+
 /**
  * Joi schema for email analysis request
  */
 const analyzeSchema = Joi.object({
-    text: Joi.string()
+    text: textSchema,
+}).unknown(false); // Reject unknown fields
+
+/**
+ * Joi schema for one message of a batch or stream: client-chosen ID and text
+ */
+const itemSchema = Joi.object({
+    id: Joi.alternatives()
+        .try(Joi.string().trim().min(1).max(128), Joi.number().integer())
+        .required()
+        .messages({
+            'alternatives.match': 'Field "id" must be a string of at most 128 characters or an integer',
+            'any.required': 'Field "id" is required',
+        }),
+    text: textSchema,
+}).unknown(false);
+
+/**
+ * Joi schema for batch analysis request: IDs unique per batch
+ */
+const batchSchema = Joi.object({
+    items: Joi.array()
         .required()
         .min(1)
-        .max(config.security.maxTextLength)
-        .trim()
-        .custom((value, helpers) => {
-            // Check for null bytes
-            if (value.includes('\0')) {
-                return helpers.error('any.invalid');
-            }
-            return value;
-        })
+        .max(config.batchApi.maxItems)
+        .unique('id')
+        .items(itemSchema)
         .messages({
-            'string.base': 'Field "text" must be a string',
-            'string.empty': 'Field "text" cannot be empty',
-            'string.min': 'Field "text" must contain at least 1 character',
-            'string.max': `Field "text" cannot exceed ${config.security.maxTextLength} characters`,
-            'any.required': 'Field "text" is required',
-            'any.invalid': 'Invalid characters detected in input',
+            'array.base': 'Field "items" must be an array',
+            'array.min': 'Field "items" must contain at least 1 message',
+            'array.max': `Field "items" cannot contain more than ${config.batchApi.maxItems} messages`,
+            'array.unique': 'Duplicate id in "items"',
+            'any.required': 'Field "items" is required',
         }),
-}).unknown(false); // Reject unknown fields
+}).unknown(false);
+
+/**
+ * Collect Joi error details into an ApiError
+ */
+const validationError = (error) => new ApiError(400, 'Validation failed', error.details.map(detail => ({
+    field: detail.path.join('.'),
+    message: detail.message,
+})));
 
 /**
  * Validate email analysis request
@@ -46,12 +92,7 @@ export const validateAnalyzeRequest = (req, res, next) => {
     });
 
     if (error) {
-        const details = error.details.map(detail => ({
-            field: detail.path.join('.'),
-            message: detail.message,
-        }));
-
-        throw new ApiError(400, 'Validation failed', details);
+        throw validationError(error);
     }
 
     // Sanitize validated input
@@ -61,3 +102,61 @@ export const validateAnalyzeRequest = (req, res, next) => {
 
     next();
 };
+
+/**
+ * Validate batch analysis request: every message is checked in one pass
+ * and all problems are reported together
+ */
+export const validateBatchRequest = (req, res, next) => {
+    const { error, value } = batchSchema.validate(req.body, {
+        abortEarly: false,
+        stripUnknown: true,
+    });
+
+    if (error) {
+        throw validationError(error);
+    }
+
+    req.validatedBody = {
+        items: value.items.map(({ id, text }) => ({ id, text: sanitizeInput(text) })),
+    };
+
+    next();
+};
+
+/**
+ * Parse and validate NDJSON lines of a bulk scan. A bad line cannot fail
+ * the whole stream, so it is passed on with its error for the caller to
+ * report in place.
+ * @param {AsyncIterable<{number: number, line: string|null}>} lines - From readNdjsonLines
+ * @param {number} maxLineLength - Limit the reader applied (for the error message)
+ * @yields {Object} { number, value: { id, text } } or { number, id?, error }
+ */
+export async function* validateStreamLines(lines, maxLineLength) {
+    for await (const { number, line } of lines) {
+        if (line === null) {
+            yield { number, error: `Line exceeds ${maxLineLength} characters` };
+            continue;
+        }
+
+        let item;
+        try {
+            item = JSON.parse(line);
+        } catch {
+            yield { number, error: 'Invalid JSON' };
+            continue;
+        }
+
+        const { error, value } = itemSchema.validate(item, {
+            abortEarly: false,
+            stripUnknown: true,
+        });
+
+        if (error) {
+            const id = ['string', 'number'].includes(typeof item?.id) ? item.id : undefined;
+            yield { number, id, error: error.details.map(detail => detail.message).join('; ') };
+        } else {
+            yield { number, value: { id: value.id, text: sanitizeInput(value.text) } };
+        }
+    }
+}
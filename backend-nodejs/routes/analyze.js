@@ -2,13 +2,26 @@
  * Analyze Route
  * 
  * POST /analyze - Email phishing detection endpoint
+ * POST /analyze/batch - Many messages in one request
+ * POST /analyze/stream - NDJSON bulk scan, verdicts streamed back
  */
 
 import express from 'express';
-import { asyncHandler } from '../middleware/errorHandler.js';
-import { validateAnalyzeRequest } from '../middleware/validation.js';
-import { analyzeLimiter } from '../middleware/rateLimiter.js';
-import { analyzeEmail } from '../controllers/detectionController.js';
+import config from '../config.js';
+import { ApiError, asyncHandler } from '../middleware/errorHandler.js';
+import {
+    validateAnalyzeRequest,
+    validateBatchRequest,
+    validateStreamLines,
+} from '../middleware/validation.js';
+import { analyzeLimiter, batchLimiter, streamSlotLimiter } from '../middleware/rateLimiter.js';
+import {
+    analyzeBatch,
+    analyzeEmail,
+    analyzeStream,
+    getStreamStats,
+} from '../controllers/detectionController.js';
+import { readNdjsonLines } from '../utils/ndjsonStream.js';
 import logger from '../utils/logger.js';
 
 const router = express.Router();
@@ -52,4 +65,124 @@ router.post(
     })
 );
 
+/**
+ * POST /analyze/batch
+ * Analyze up to BATCH_MAX_ITEMS messages. Counts BATCH_ITEM_WEIGHT per
+ * message against the same rate limit as POST /analyze.
+ *
+ * Request body:
+ * {
+ *   "items": [{ "id": "msg-1", "text": "email content here..." }, ...]
+ * }
+ *
+ * Response:
+ * {
+ *   "results": [{ "id": "msg-1", "risk_score": 85, ... }, ...],
+ *   "metadata": { "items": 2, "unique": 2, ... }
+ * }
+ */
+router.post(
+    '/batch',
+    batchLimiter,
+    validateBatchRequest,
+    asyncHandler(async (req, res) => {
+        const { items } = req.validatedBody;
+
+        logger.info({
+            message: 'Batch analysis request received',
+            items: items.length,
+            ip: req.ip,
+        });
+
+        res.json(await analyzeBatch(items));
+    })
+);
+
+/**
+ * Write one NDJSON record, resolving once the socket can take more
+ * (immediately if the client is gone)
+ */
+const writeRecord = (res, record) => new Promise((resolve) => {
+    if (res.destroyed || res.writableEnded) {
+        resolve();
+        return;
+    }
+    if (res.write(`${JSON.stringify(record)}\n`)) {
+        resolve();
+        return;
+    }
+
+    const done = () => {
+        res.off('drain', done);
+        res.off('close', done);
+        resolve();
+    };
+    res.on('drain', done);
+    res.on('close', done);
+});
+
+/**
+ * POST /analyze/stream
+ * Bulk scan for backfills. The chunked application/x-ndjson body holds one
+ * { "id", "text" } object per line; the response streams one NDJSON verdict
+ * per line as each finishes (completion order), then a summary line. Both
+ * directions are flow-controlled, so memory stays flat for any job size.
+ *
+ * Response lines:
+ *   { "id": "msg-1", "risk_score": 85, ... }
+ *   { "id": "msg-2", "line": 2, "error": "..." }
+ *   { "summary": { "lines": 2, "analyzed": 1, "invalid": 1, "failed": 0, ... } }
+ */
+router.post(
+    '/stream',
+    analyzeLimiter,
+    streamSlotLimiter,
+    asyncHandler(async (req, res) => {
+        if (!req.is('application/x-ndjson')) {
+            throw new ApiError(415, 'Content-Type must be application/x-ndjson');
+        }
+        if (getStreamStats().active >= config.streamApi.maxStreams) {
+            throw new ApiError(503, 'Too many bulk scans in progress. Please try again later.');
+        }
+
+        logger.info({
+            message: 'Stream analysis request received',
+            ip: req.ip,
+        });
+
+        const aborted = new AbortController();
+        res.on('close', () => aborted.abort());
+
+        // No total upload limit for scans; a stalled client is dropped instead
+        if (config.streamApi.idleTimeoutMs > 0) {
+            req.setTimeout(config.streamApi.idleTimeoutMs, () => {
+                logger.warn(`Stream analysis idle for ${config.streamApi.idleTimeoutMs}ms, closing`);
+                req.destroy();
+            });
+        }
+
+        res.status(200);
+        res.set({
+            'Content-Type': 'application/x-ndjson; charset=utf-8',
+            'Cache-Control': 'no-store',
+            'X-Accel-Buffering': 'no', // stop reverse proxies holding back verdicts
+        });
+        res.flushHeaders();
+
+        try {
+            const { maxLineLength } = config.streamApi;
+            const summary = await analyzeStream(
+                validateStreamLines(readNdjsonLines(req, { maxLineLength }), maxLineLength),
+                (record) => writeRecord(res, record),
+                { signal: aborted.signal }
+            );
+            res.end(`${JSON.stringify({ summary })}\n`);
+        } catch (error) {
+            // Headers are gone: report on the stream instead of the error handler
+            logger.error(`Stream analysis failed: ${error.message}`);
+            res.end(`${JSON.stringify({ error: 'Stream analysis failed' })}\n`);
+        }
+    })
+);
+
 export default router;
@@ -7,6 +7,16 @@
 import express from 'express';
 import config from '../config.js';
 import logger from '../utils/logger.js';
+import { getBatchStats, getCascadeStats, getStreamStats } from '../controllers/detectionController.js';
+import {
+    getAIBreakerStats,
+    getAICacheStats,
+    getAIKeyStats,
+    getAIQueueStats,
+    getAISocketStats,
+} from '../services/aiService.js';
+import { getLocalModelStats } from '../services/classifierService.js';
+import { getUrlCacheStats } from '../services/urlService.js';
 
 const router = express.Router();
 
@@ -33,6 +43,7 @@ router.get('/', (req, res) => {
         },
         features: {
             ai_analysis: config.ai.enabled,
+            ai_provider: config.ai.provider,
             heuristic_analysis: true,
             rate_limiting: true,
             input_validation: true,
@@ -41,9 +52,32 @@ router.get('/', (req, res) => {
             environment: config.env,
             max_text_length: config.security.maxTextLength,
             rate_limit: `${config.security.rateLimitRequests} requests per ${config.security.rateLimitWindowMs / 1000}s`,
+            batch_max_items: config.batchApi.maxItems,
         },
+        caches: {
+            url_verdicts: getUrlCacheStats(),
+            ai_verdicts: getAICacheStats(),
+        },
+        connections: {
+            [config.ai.provider]: getAISocketStats(),
+        },
+        api_keys: {
+            [config.ai.provider]: getAIKeyStats(),
+        },
+        circuit_breakers: {
+            [config.ai.provider]: getAIBreakerStats(),
+        },
+        queues: {
+            [config.ai.provider]: getAIQueueStats(),
+        },
+        cascade: getCascadeStats(),
+        batch: getBatchStats(),
+        stream: getStreamStats(),
+        local_model: getLocalModelStats(),
         endpoints: {
             analyze: 'POST /analyze',
+            analyze_batch: 'POST /analyze/batch',
+            analyze_stream: 'POST /analyze/stream',
             health: 'GET /health',
         },
         timestamp: new Date().toISOString(),
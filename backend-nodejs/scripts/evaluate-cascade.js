@@ -0,0 +1,119 @@
+#!/usr/bin/env node
+/**
+ * Cascade Policy Evaluation
+ *
+ * Runs a corpus of messages through the local tiers (heuristics and the
+ * local classifier, as live routing does) and the AI provider, then reports how
+ * many AI calls a cascade policy would avoid and how many final verdicts
+ * it would change. Use it to pick AI_CASCADE_HIGH_SCORE/AI_CASCADE_LOW_SCORE
+ * before enabling the cascade in production.
+ *
+ * Input files hold one message per line, either plain text or JSON lines
+ * with a "text" field.
+ *
+ * Usage:
+ *   node scripts/evaluate-cascade.js [--high N] [--low N] messages.jsonl [more.txt ...]
+ */
+
+import fs from 'fs';
+import readline from 'readline';
+import config from '../config.js';
+import { analyzeWithAI } from '../services/aiService.js';
+import { scoreLocally } from '../services/localScoring.js';
+import { CascadePolicy, evaluateCascade } from '../utils/cascadePolicy.js';
+
+const usage = () => {
+    console.error('Usage: node scripts/evaluate-cascade.js [--high N] [--low N] <messages> [messages ...]');
+    process.exit(1);
+};
+
+const parseArgs = (argv) => {
+    const options = {
+        highScore: config.ai.cascade.highScore,
+        lowScore: config.ai.cascade.lowScore,
+        inputs: [],
+    };
+
+    for (let i = 0; i < argv.length; i++) {
+        const arg = argv[i];
+        if (arg === '--high') {
+            options.highScore = parseInt(argv[++i], 10);
+        } else if (arg === '--low') {
+            options.lowScore = parseInt(argv[++i], 10);
+        } else if (arg === '-h' || arg === '--help') {
+            usage();
+        } else {
+            options.inputs.push(arg);
+        }
+    }
+
+    if (options.inputs.length === 0 || Number.isNaN(options.highScore) || Number.isNaN(options.lowScore)) {
+        usage();
+    }
+    return options;
+};
+
+/**
+ * Stream messages from plain-text or JSON-lines files
+ */
+async function* readMessages(inputs) {
+    for (const input of inputs) {
+        const lines = readline.createInterface({
+            input: fs.createReadStream(input, { encoding: 'utf8' }),
+            crlfDelay: Infinity,
+        });
+
+        for await (const line of lines) {
+            const trimmed = line.trim();
+            if (!trimmed) continue;
+
+            if (trimmed.startsWith('{')) {
+                const record = JSON.parse(trimmed);
+                if (typeof record.text === 'string' && record.text.trim()) {
+                    yield record.text;
+                }
+            } else {
+                yield trimmed;
+            }
+        }
+    }
+}
+
+const main = async () => {
+    const options = parseArgs(process.argv.slice(2));
+    if (!config.ai.enabled) {
+        throw new Error(`AI provider "${config.ai.provider}" must be configured to compare against AI verdicts`);
+    }
+
+    const samples = [];
+    let aiFailures = 0;
+
+    for await (const text of readMessages(options.inputs)) {
+        const { heuristicResult, localResult } = scoreLocally(text);
+        let aiResult = null;
+        try {
+            aiResult = await analyzeWithAI(text);
+        } catch (error) {
+            aiFailures++;
+        }
+        samples.push({ heuristicScore: heuristicResult.score, localResult, aiResult });
+    }
+
+    const policy = new CascadePolicy({
+        enabled: true,
+        highScore: options.highScore,
+        lowScore: options.lowScore,
+    });
+
+    const report = evaluateCascade(samples, policy);
+    console.log(JSON.stringify({
+        policy: { high_score: options.highScore, low_score: options.lowScore },
+        ai_failures: aiFailures,
+        ...report,
+    }, null, 2));
+};
+
+main().catch((error) => {
+    console.error(`Cascade evaluation failed: ${error.message}`);
+    process.exit(1);
+});
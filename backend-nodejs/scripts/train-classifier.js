@@ -0,0 +1,195 @@
+#!/usr/bin/env node
+/**
+ * Local Classifier Trainer
+ *
+ * Trains the hashed n-gram logistic regression model loaded by
+ * classifierService (LOCAL_MODEL_PATH) from a labeled local corpus, and
+ * reports accuracy on a held-out slice.
+ *
+ * Input files hold one sample per line, either JSON lines
+ * ({"text": "...", "label": 1}) or "label<TAB>text". Labels may be 1/0,
+ * true/false, phishing/scam/spam or legitimate/safe/ham.
+ *
+ * Usage:
+ *   node scripts/train-classifier.js -o data/classifier.bin [--dims N] [--epochs N]
+ *     [--lr N] [--l2 N] [--holdout 0.1] [--seed N] corpus.jsonl [more.tsv ...]
+ */
+
+import fs from 'fs';
+import path from 'path';
+import readline from 'readline';
+import { trainClassifier } from '../utils/textClassifier.js';
+
+const POSITIVE_LABELS = new Set(['1', 'true', 'phishing', 'scam', 'spam', 'malicious']);
+const NEGATIVE_LABELS = new Set(['0', 'false', 'legitimate', 'legit', 'safe', 'ham', 'benign']);
+
+const usage = () => {
+    console.error(
+        'Usage: node scripts/train-classifier.js -o <model.bin> [--dims N] [--epochs N] [--lr N] ' +
+        '[--l2 N] [--holdout F] [--seed N] <corpus> [corpus ...]'
+    );
+    process.exit(1);
+};
+
+const parseArgs = (argv) => {
+    const options = {
+        output: '',
+        dims: 1 << 18,
+        epochs: 5,
+        learningRate: 0.5,
+        l2: 1e-6,
+        holdout: 0.1,
+        seed: 1,
+        inputs: [],
+    };
+
+    for (let i = 0; i < argv.length; i++) {
+        const arg = argv[i];
+        if (arg === '-o' || arg === '--output') {
+            options.output = argv[++i];
+        } else if (arg === '--dims') {
+            options.dims = parseInt(argv[++i], 10);
+        } else if (arg === '--epochs') {
+            options.epochs = parseInt(argv[++i], 10);
+        } else if (arg === '--lr') {
+            options.learningRate = parseFloat(argv[++i]);
+        } else if (arg === '--l2') {
+            options.l2 = parseFloat(argv[++i]);
+        } else if (arg === '--holdout') {
+            options.holdout = parseFloat(argv[++i]);
+        } else if (arg === '--seed') {
+            options.seed = parseInt(argv[++i], 10);
+        } else if (arg === '-h' || arg === '--help') {
+            usage();
+        } else {
+            options.inputs.push(arg);
+        }
+    }
+
+    const numbers = [options.dims, options.epochs, options.learningRate, options.l2, options.holdout, options.seed];
+    if (!options.output || options.inputs.length === 0 || numbers.some(Number.isNaN) ||
+        !(options.holdout >= 0 && options.holdout < 1)) {
+        usage();
+    }
+    return options;
+};
+
+/**
+ * Map a corpus label to true (phishing) / false (legitimate), or null if unknown
+ */
+const parseLabel = (label) => {
+    const value = String(label).trim().toLowerCase();
+    if (POSITIVE_LABELS.has(value)) return true;
+    if (NEGATIVE_LABELS.has(value)) return false;
+    return null;
+};
+
+/**
+ * Stream labeled samples from JSON-lines or tab-separated files
+ */
+async function* readSamples(inputs) {
+    for (const input of inputs) {
+        const lines = readline.createInterface({
+            input: fs.createReadStream(input, { encoding: 'utf8' }),
+            crlfDelay: Infinity,
+        });
+
+        let lineNumber = 0;
+        for await (const line of lines) {
+            lineNumber++;
+            const trimmed = line.trim();
+            if (!trimmed) continue;
+
+            let text;
+            let label;
+            if (trimmed.startsWith('{')) {
+                ({ text, label } = JSON.parse(trimmed));
+            } else {
+                const tab = trimmed.indexOf('\t');
+                label = tab === -1 ? '' : trimmed.slice(0, tab);
+                text = trimmed.slice(tab + 1);
+            }
+
+            const parsed = parseLabel(label);
+            if (typeof text !== 'string' || !text.trim() || parsed === null) {
+                throw new Error(`${input}:${lineNumber}: expected a text and a phishing/legitimate label`);
+            }
+            yield { text, label: parsed };
+        }
+    }
+}
+
+/**
+ * Accuracy, precision, recall and log loss at a 0.5 threshold
+ */
+const evaluate = (model, samples) => {
+    let truePositive = 0;
+    let falsePositive = 0;
+    let falseNegative = 0;
+    let correct = 0;
+    let logLoss = 0;
+
+    for (const { text, label } of samples) {
+        const probability = Math.min(Math.max(model.predict(text), 1e-7), 1 - 1e-7);
+        const predicted = probability >= 0.5;
+
+        if (predicted === label) correct++;
+        if (predicted && label) truePositive++;
+        if (predicted && !label) falsePositive++;
+        if (!predicted && label) falseNegative++;
+        logLoss -= label ? Math.log(probability) : Math.log(1 - probability);
+    }
+
+    const round = (value) => Math.round(value * 1000) / 1000;
+    const ratio = (value, total) => (total > 0 ? round(value / total) : null);
+    return {
+        samples: samples.length,
+        accuracy: ratio(correct, samples.length),
+        precision: ratio(truePositive, truePositive + falsePositive),
+        recall: ratio(truePositive, truePositive + falseNegative),
+        log_loss: ratio(logLoss, samples.length),
+    };
+};
+
+const main = async () => {
+    const options = parseArgs(process.argv.slice(2));
+    const startTime = Date.now();
+
+    const samples = [];
+    for await (const sample of readSamples(options.inputs)) {
+        samples.push(sample);
+    }
+
+    // Deterministic holdout: every k-th sample
+    const stride = options.holdout > 0 ? Math.max(2, Math.round(1 / options.holdout)) : 0;
+    const train = samples.filter((_, i) => !stride || i % stride !== 0);
+    const test = stride ? samples.filter((_, i) => i % stride === 0) : [];
+    if (train.length === 0) {
+        throw new Error('No training samples');
+    }
+
+    const model = trainClassifier(train, options);
+    const buffer = model.toBuffer();
+    fs.mkdirSync(path.dirname(path.resolve(options.output)), { recursive: true });
+    fs.writeFileSync(options.output, buffer);
+
+    const probe = test.length > 0 ? test : train;
+    const predictStart = process.hrtime.bigint();
+    probe.forEach(({ text }) => model.predict(text));
+    const predictMs = Number(process.hrtime.bigint() - predictStart) / 1e6 / probe.length;
+
+    console.log(JSON.stringify({
+        output: options.output,
+        bytes: buffer.length,
+        train_samples: train.length,
+        phishing_ratio: Math.round((train.filter(({ label }) => label).length / train.length) * 1000) / 1000,
+        holdout: test.length > 0 ? evaluate(model, test) : null,
+        mean_predict_ms: Math.round(predictMs * 1000) / 1000,
+        duration_ms: Date.now() - startTime,
+    }, null, 2));
+};
+
+main().catch((error) => {
+    console.error(`Classifier training failed: ${error.message}`);
+    process.exit(1);
+});
@@ -12,9 +12,10 @@ import helmet from 'helmet';
 import config from './config.js';
 import logger from './utils/logger.js';
 import { errorHandler, notFoundHandler } from './middleware/errorHandler.js';
-import { securityHeaders } from './middleware/security.js';
+import { requestBodyTimeout, securityHeaders } from './middleware/security.js';
 import analyzeRouter from './routes/analyze.js';
 import healthRouter from './routes/health.js';
+import { saveAICacheSnapshot, warmUpAI } from './services/aiService.js';
 
 const app = express();
 
@@ -52,7 +53,14 @@ app.use(cors({
     allowedHeaders: ['Content-Type', 'Authorization'],
 }));
 
-// Body parser with size limit
+// Slow-body protection; bulk scans upload for as long as the job runs
+app.use(requestBodyTimeout(config.server.requestTimeoutMs, ['/analyze/stream']));
+
+// Body parser with size limit (batches get their own, larger limit)
+app.use('/analyze/batch', express.json({
+    limit: config.batchApi.maxRequestSize,
+    strict: true,
+}));
 app.use(express.json({
     limit: config.security.maxRequestSize,
     strict: true,
@@ -105,7 +113,7 @@ const gracefulShutdown = (signal) => {
 
     server.close(() => {
         logger.info('HTTP server closed');
-        process.exit(0);
+        saveAICacheSnapshot().finally(() => process.exit(0));
     });
 
     // Force shutdown after 10 seconds
@@ -123,13 +131,20 @@ const server = app.listen(config.server.port, config.server.host, () => {
         host: config.server.host,
         port: config.server.port,
         aiEnabled: config.ai.enabled,
+        aiProvider: config.ai.provider,
     });
 
     if (!config.ai.enabled) {
         logger.warn('AI features disabled - running in heuristics-only mode');
+    } else {
+        warmUpAI();
     }
 });
 
+// Node's requestTimeout is server-wide; the same limit is applied per
+// route by requestBodyTimeout instead, so bulk scans can opt out
+server.requestTimeout = 0;
+
 // Handle graceful shutdown
 process.on('SIGTERM', () => gracefulShutdown('SIGTERM'));
 process.on('SIGINT', () => gracefulShutdown('SIGINT'));
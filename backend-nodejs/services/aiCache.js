@@ -0,0 +1,179 @@
+/**
+ * AI Verdict Cache
+ *
+ * Content-addressed cache for AI analysis results. Keys are SHA-256 digests
+ * of the normalized message text within a namespace (model + prompt
+ * fingerprint), so identical campaign messages share a verdict and any
+ * prompt or model change starts from a clean slate. Entries can be
+ * snapshotted to a local JSON file so restarts begin warm.
+ */
+
+import fs from 'fs';
+import { createHash } from 'crypto';
+import logger from '../utils/logger.js';
+import { LRUCache } from '../utils/lruCache.js';
+
+const SNAPSHOT_VERSION = 1;
+
+/**
+ * Hex SHA-256 of the given parts joined with NUL separators
+ */
+export const fingerprint = (...parts) => createHash('sha256').update(parts.join('\0')).digest('hex');
+
+/**
+ * Canonical message form used for cache keys: Unicode NFC, collapsed
+ * whitespace, trimmed. Case is preserved since shouting is itself a signal.
+ */
+export const normalizeMessage = (text) => text.normalize('NFC').replace(/\s+/g, ' ').trim();
+
+/**
+ * Bounded LRU/TTL cache of AI verdicts with optional file snapshot
+ */
+export class AIVerdictCache {
+    /**
+     * @param {Object} options
+     * @param {string} options.namespace - Model/prompt fingerprint mixed into every key
+     * @param {number} options.maxEntries - Maximum cached verdicts
+     * @param {number} options.ttlMs - Verdict lifetime in milliseconds (0 = no expiry)
+     * @param {string} options.snapshotPath - JSON snapshot file ('' disables snapshots)
+     * @param {Function} options.revive - Rebuilds a cached value from its snapshot form
+     * @param {Function} options.now - Clock, injectable for tests
+     */
+    constructor({
+        namespace = '',
+        maxEntries = 5000,
+        ttlMs = 0,
+        snapshotPath = '',
+        revive = (value) => value,
+        now = Date.now,
+    } = {}) {
+        this.namespace = namespace;
+        this.snapshotPath = snapshotPath;
+        this._revive = revive;
+        this._now = now;
+        this._cache = new LRUCache({ maxEntries, ttlMs, now });
+        this._dirty = false;
+        this.invalidations = 0;
+    }
+
+    /**
+     * Cache key for a message
+     */
+    keyFor(text) {
+        return fingerprint(this.namespace, normalizeMessage(text));
+    }
+
+    /**
+     * Cached verdict for a key, or undefined
+     */
+    get(key) {
+        return this._cache.get(key);
+    }
+
+    /**
+     * Store a verdict
+     * @param {number} ttlMs - Optional lifetime override (defaults to the cache TTL)
+     */
+    set(key, value, ttlMs) {
+        this._cache.set(key, value, ttlMs);
+        this._dirty = true;
+        return this;
+    }
+
+    /**
+     * Drop every cached verdict, e.g. after a prompt or model change.
+     * Passing a new namespace also re-keys future lookups and the snapshot.
+     */
+    invalidate({ namespace = this.namespace } = {}) {
+        this._cache.clear();
+        this.namespace = namespace;
+        this.invalidations++;
+        this._dirty = false;
+
+        if (this.snapshotPath) {
+            fs.rmSync(this.snapshotPath, { force: true });
+        }
+    }
+
+    /**
+     * Load live entries from the snapshot file. Snapshots written under a
+     * different namespace (old prompt or model) are ignored.
+     * @returns {number} Number of entries restored
+     */
+    loadSnapshot() {
+        if (!this.snapshotPath || !fs.existsSync(this.snapshotPath)) {
+            return 0;
+        }
+
+        try {
+            const snapshot = JSON.parse(fs.readFileSync(this.snapshotPath, 'utf8'));
+            if (snapshot.version !== SNAPSHOT_VERSION || snapshot.namespace !== this.namespace) {
+                logger.info('AI cache snapshot is stale (prompt or model changed) - starting cold');
+                return 0;
+            }
+
+            const now = this._now();
+            let restored = 0;
+            for (const [key, value, expiresAt] of snapshot.entries) {
+                if (expiresAt !== 0 && expiresAt <= now) continue;
+                this._cache.set(key, this._revive(value), expiresAt === 0 ? 0 : expiresAt - now);
+                restored++;
+            }
+
+            logger.info(`AI cache restored ${restored} verdicts from snapshot`);
+            return restored;
+
+        } catch (error) {
+            logger.warn(`Failed to load AI cache snapshot: ${error.message}`);
+            return 0;
+        }
+    }
+
+    /**
+     * Write live entries to the snapshot file (atomic rename).
+     * Skipped when nothing changed since the last save.
+     * @returns {Promise<boolean>} Whether a snapshot was written
+     */
+    async saveSnapshot() {
+        if (!this.snapshotPath || !this._dirty) {
+            return false;
+        }
+
+        const entries = [];
+        for (const [key, value, expiresAt] of this._cache.entries()) {
+            entries.push([key, { ...value }, expiresAt]);
+        }
+
+        const temporaryPath = `${this.snapshotPath}.tmp`;
+        this._dirty = false;
+
+        try {
+            await fs.promises.writeFile(temporaryPath, JSON.stringify({
+                version: SNAPSHOT_VERSION,
+                namespace: this.namespace,
+                entries,
+            }));
+            await fs.promises.rename(temporaryPath, this.snapshotPath);
+            logger.debug(`AI cache snapshot saved (${entries.length} verdicts)`);
+            return true;
+
+        } catch (error) {
+            this._dirty = true;
+            logger.warn(`Failed to save AI cache snapshot: ${error.message}`);
+            return false;
+        }
+    }
+
+    /**
+     * Counter snapshot
+     */
+    stats() {
+        return {
+            ...this._cache.stats(),
+            invalidations: this.invalidations,
+            snapshot: this.snapshotPath !== '',
+        };
+    }
+}
+
+export default AIVerdictCache;
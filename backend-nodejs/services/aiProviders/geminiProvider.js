@@ -0,0 +1,233 @@
+/**
+ * Google Gemini Provider
+ *
+ * generateContent / streamGenerateContent transport for the AI service:
+ * system instruction, one user turn and a structured-output response
+ * schema, over a pooled keep-alive connection. Calls are spread across
+ * every configured API key; a 429 or 503 is retried on another key or
+ * after a backoff while the request's time budget allows.
+ */
+
+import config from '../../config.js';
+import { ApiKeyPool } from '../../utils/apiKeyPool.js';
+import { createKeepAliveClient, getSocketStats } from '../../utils/httpClient.js';
+import { readSseEvents } from '../../utils/sseStream.js';
+
+const GEMINI_MODEL = 'gemini-2.5-flash';
+const GEMINI_API_PATH = `/v1beta/models/${GEMINI_MODEL}:generateContent`;
+const GEMINI_STREAM_PATH = `/v1beta/models/${GEMINI_MODEL}:streamGenerateContent`;
+
+/**
+ * Reply text of the first candidate, if any
+ */
+const candidateText = (data) => data?.candidates?.[0]?.content?.parts?.[0]?.text;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Server-requested wait from a throttled response: the Retry-After header
+ * (seconds or HTTP date), else the retryDelay of a google.rpc.RetryInfo
+ * error detail (e.g., "37s")
+ * @returns {number|null} Milliseconds, or null without a hint
+ */
+export const retryAfterMs = (response, now = Date.now()) => {
+    const header = response?.headers?.['retry-after'];
+    if (header !== undefined && header !== null && header !== '') {
+        const seconds = Number(header);
+        if (Number.isFinite(seconds)) {
+            return Math.max(0, seconds * 1000);
+        }
+        const date = Date.parse(header);
+        if (!Number.isNaN(date)) {
+            return Math.max(0, date - now);
+        }
+    }
+
+    const details = response?.data?.error?.details;
+    const retryInfo = Array.isArray(details) ? details.find((detail) => typeof detail?.retryDelay === 'string') : null;
+    const seconds = retryInfo ? parseFloat(retryInfo.retryDelay) : NaN;
+    return Number.isFinite(seconds) ? Math.max(0, seconds * 1000) : null;
+};
+
+/**
+ * Gemini API transport
+ */
+export class GeminiProvider {
+    /**
+     * @param {Object} options - Overrides for tests or alternate endpoints
+     * @param {string} options.apiKey - Single Gemini API key (shorthand for apiKeys)
+     * @param {Array<{key: string, rpm: number}>} options.apiKeys - Keys and their requests-per-minute budgets
+     * @param {string} options.baseURL - API origin
+     * @param {Object} options.tls - Extra TLS options for the connection pool
+     * @param {Object} options.keyPool - Retry and backoff settings
+     */
+    constructor({
+        apiKey = '',
+        apiKeys = apiKey ? [{ key: apiKey, rpm: 0 }] : config.ai.geminiKeys,
+        baseURL = config.ai.baseUrl,
+        tls = {},
+        keyPool = config.ai.keyPool,
+    } = {}) {
+        this.name = 'Gemini';
+        this.id = GEMINI_MODEL;
+        this.modelName = 'PhishGuard AI v2.0 (Google Gemini 2.5 Flash)';
+
+        // Per-key quotas: calls go to the key with the most budget left
+        this.keys = new ApiKeyPool(apiKeys, keyPool);
+        this.maxRetries = keyPool.maxRetries;
+        this.enabled = this.keys.size > 0;
+
+        // Pooled keep-alive connections avoid a TCP/TLS handshake per call
+        this.http = createKeepAliveClient({
+            baseURL,
+            timeout: config.ai.timeout,
+            maxSockets: config.ai.maxSockets,
+            maxFreeSockets: config.ai.maxFreeSockets,
+            tls,
+        });
+    }
+
+    /**
+     * Open one pooled connection. Any HTTP response means the TCP/TLS
+     * handshake is done.
+     */
+    async warmUp() {
+        await this.http.head('/', { validateStatus: () => true });
+    }
+
+    /**
+     * Connection pool snapshot
+     */
+    socketStats() {
+        return getSocketStats(this.http.agent);
+    }
+
+    /**
+     * Per-key usage and throttle counters
+     */
+    keyStats() {
+        return this.keys.stats();
+    }
+
+    /**
+     * One generateContent call
+     * @returns {Promise<string|undefined>} JSON reply text
+     */
+    async generate(request) {
+        const response = await this._post(GEMINI_API_PATH, request);
+        return candidateText(response.data);
+    }
+
+    /**
+     * One streamGenerateContent call (server-sent events). Resolves once
+     * the response starts, with the reply text fragments as they arrive.
+     * @returns {Promise<AsyncIterable<string>>}
+     */
+    async generateStream(request) {
+        const response = await this._post(`${GEMINI_STREAM_PATH}?alt=sse`, request, {
+            responseType: 'stream',
+            signal: request.signal,
+        });
+
+        return (async function* fragments() {
+            try {
+                for await (const event of readSseEvents(response.data)) {
+                    const text = candidateText(event);
+                    if (text) yield text;
+                }
+            } finally {
+                response.data.destroy?.();
+            }
+        })();
+    }
+
+    /**
+     * POST with a key from the pool. A 429 cools that key down (Retry-After
+     * or jittered backoff) and retries on the next usable key; a 503 waits
+     * out Retry-After or a jittered backoff first. Retries stop at
+     * maxRetries or when the request's timeout is used up.
+     */
+    async _post(path, request, options = {}) {
+        const deadline = Date.now() + request.timeout;
+        const body = this._requestBody(request);
+        const separator = path.includes('?') ? '&' : '?';
+
+        for (let attempt = 0; ; attempt++) {
+            const entry = await this.keys.acquire(deadline);
+
+            try {
+                const response = await this.http.post(`${path}${separator}key=${entry.key}`, body, {
+                    ...options,
+                    timeout: Math.max(1, deadline - Date.now()),
+                });
+                this.keys.recordSuccess(entry);
+                return response;
+
+            } catch (error) {
+                const status = error.response?.status;
+                if (status !== 429 && status !== 503) {
+                    throw error;
+                }
+
+                const hint = retryAfterMs(error.response);
+                let delay = 0;
+                if (status === 429) {
+                    this.keys.recordThrottle(entry, hint);
+                } else {
+                    this.keys.recordUnavailable(entry);
+                    delay = hint ?? this.keys.backoffDelay(attempt + 1);
+                }
+
+                if (attempt >= this.maxRetries || Date.now() + delay >= deadline) {
+                    throw error;
+                }
+                error.response.data?.destroy?.();
+                await sleep(delay);
+            }
+        }
+    }
+
+    /**
+     * generateContent request body: fixed system instruction, the message(s)
+     * as the only user content, and a JSON response schema
+     */
+    _requestBody({ systemInstruction, userText, responseSchema, maxOutputTokens = 1024 }) {
+        return {
+            systemInstruction: {
+                parts: [{ text: systemInstruction }]
+            },
+            contents: [{
+                role: 'user',
+                parts: [{ text: userText }]
+            }],
+            generationConfig: {
+                temperature: 0.2,
+                topK: 40,
+                topP: 0.95,
+                maxOutputTokens,
+                responseMimeType: 'application/json',
+                responseSchema,
+            },
+            safetySettings: [
+                {
+                    category: 'HARM_CATEGORY_HARASSMENT',
+                    threshold: 'BLOCK_NONE'
+                },
+                {
+                    category: 'HARM_CATEGORY_HATE_SPEECH',
+                    threshold: 'BLOCK_NONE'
+                },
+                {
+                    category: 'HARM_CATEGORY_SEXUALLY_EXPLICIT',
+                    threshold: 'BLOCK_NONE'
+                },
+                {
+                    category: 'HARM_CATEGORY_DANGEROUS_CONTENT',
+                    threshold: 'BLOCK_NONE'
+                }
+            ]
+        };
+    }
+}
+
+export default GeminiProvider;
@@ -0,0 +1,58 @@
+/**
+ * AI Providers
+ *
+ * Transports behind the AI service. The service owns prompts, schemas,
+ * caching, queueing and the circuit breaker; a provider only turns one
+ * request into reply text. Every provider exposes:
+ *
+ *   name         Label used in logs
+ *   id           Model identity mixed into the verdict cache namespace
+ *   modelName    Model name reported on verdicts
+ *   enabled      Whether it is configured
+ *   generate(request)        -> Promise<string>                 JSON reply text
+ *   generateStream(request)  -> Promise<AsyncIterable<string>>  reply fragments
+ *   warmUp()                 -> Promise                         open a connection early
+ *   socketStats()            -> Object|null                     connection pool counters
+ *   keyStats()               -> Object   (optional)             API key pool counters
+ *
+ * A request is { systemInstruction, userText, responseSchema,
+ * maxOutputTokens, timeout, signal }. Failed calls reject with
+ * axios-shaped errors (error.response.status, or error.request for
+ * network errors and timeouts) so the breaker can classify them. A call
+ * shed locally before reaching the upstream (e.g., every API key out of
+ * quota) rejects with QueueRejectedError instead.
+ */
+
+import config from '../../config.js';
+import { GeminiProvider } from './geminiProvider.js';
+import { MockProvider } from './mockProvider.js';
+import { OpenAICompatibleProvider } from './openAIProvider.js';
+
+/**
+ * AI_PROVIDER values
+ */
+export const AIProviderName = {
+    GEMINI: 'gemini',
+    OPENAI: 'openai',
+    MOCK: 'mock',
+};
+
+/**
+ * Build the configured provider
+ * @param {string} name - One of AIProviderName
+ * @param {Object} options - Provider constructor overrides
+ */
+export const createAIProvider = (name = config.ai.provider, options = {}) => {
+    switch (name) {
+    case AIProviderName.GEMINI:
+        return new GeminiProvider(options);
+    case AIProviderName.OPENAI:
+        return new OpenAICompatibleProvider(options);
+    case AIProviderName.MOCK:
+        return new MockProvider(options);
+    default:
+        throw new Error(`Unknown AI provider: ${name}`);
+    }
+};
+
+export { GeminiProvider, MockProvider, OpenAICompatibleProvider };
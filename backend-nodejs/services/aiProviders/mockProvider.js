@@ -0,0 +1,227 @@
+/**
+ * Mock AI Provider
+ *
+ * Deterministic stand-in for a remote model, for capacity tests that run
+ * the full pipeline with no network. Latency is drawn from a configurable
+ * distribution and a share of calls fail (HTTP 503) or return malformed
+ * text, all from a seeded generator so a run replays exactly. Verdicts are
+ * derived from a hash of each message: the mock measures throughput and
+ * failure handling, not accuracy.
+ */
+
+import config from '../../config.js';
+import { seededRandom } from '../../utils/seededRandom.js';
+import { fingerprint } from '../aiCache.js';
+
+/**
+ * Supported latency distributions. latencyMs is the fixed value, the
+ * uniform/normal mean or the log-normal median; spread is the relative
+ * half-width, relative standard deviation or log-space sigma respectively.
+ */
+export const LatencyDistribution = {
+    FIXED: 'fixed',
+    UNIFORM: 'uniform',
+    NORMAL: 'normal',
+    LOGNORMAL: 'lognormal',
+};
+
+// Numbered, delimited messages as built by the AI service for a batch
+const BATCH_MESSAGE = /\*\*Message (\d+):\*\*\n"""\n([\s\S]*?)\n"""(?=\n\n\*\*Message \d+:\*\*\n|$)/g;
+const MALFORMED_REPLY = 'I cannot help with that.';
+const STREAM_CHUNKS = 4;
+
+/**
+ * Axios-shaped errors, so the breaker classifies them like real failures
+ */
+const httpError = (status, statusText) => Object.assign(
+    new Error(`Request failed with status code ${status}`),
+    { response: { status, statusText, data: { error: { message: 'mock provider error' } } } }
+);
+
+const timeoutError = (timeout) => Object.assign(
+    new Error(`timeout of ${timeout}ms exceeded`),
+    { code: 'ECONNABORTED', request: {} }
+);
+
+const canceledError = () => Object.assign(new Error('canceled'), { code: 'ERR_CANCELED' });
+
+/**
+ * setTimeout as a promise that rejects early when the signal aborts
+ */
+const sleep = (ms, signal) => new Promise((resolve, reject) => {
+    if (signal?.aborted) {
+        reject(canceledError());
+        return;
+    }
+
+    const onAbort = () => {
+        clearTimeout(timer);
+        reject(canceledError());
+    };
+    const timer = setTimeout(() => {
+        signal?.removeEventListener('abort', onAbort);
+        resolve();
+    }, ms);
+    signal?.addEventListener('abort', onAbort, { once: true });
+});
+
+/**
+ * Stable pseudo-verdict for a message
+ */
+const verdictFor = (text) => {
+    const phishingProbability = Math.round((parseInt(fingerprint(text).slice(0, 8), 16) / 0xffffffff) * 1000) / 1000;
+    const isPhishing = phishingProbability >= 0.5;
+
+    return {
+        isPhishing,
+        confidence: Math.round((0.5 + Math.abs(phishingProbability - 0.5)) * 1000) / 1000,
+        phishingProbability,
+        legitimateProbability: Math.round((1 - phishingProbability) * 1000) / 1000,
+        riskFactors: isPhishing ? ['Synthetic verdict (mock provider)'] : [],
+    };
+};
+
+/**
+ * In-process provider with synthetic latency and failures
+ */
+export class MockProvider {
+    /**
+     * @param {Object} options
+     * @param {string} options.distribution - One of LatencyDistribution
+     * @param {number} options.latencyMs - Typical latency in milliseconds
+     * @param {number} options.spread - Distribution width (see LatencyDistribution)
+     * @param {number} options.errorRate - Share of calls failing with HTTP 503
+     * @param {number} options.malformedRate - Share of calls answering with non-JSON text
+     * @param {number} options.seed - Random seed
+     */
+    constructor({
+        distribution = config.ai.mock.latencyDistribution,
+        latencyMs = config.ai.mock.latencyMs,
+        spread = config.ai.mock.latencySpread,
+        errorRate = config.ai.mock.errorRate,
+        malformedRate = config.ai.mock.malformedRate,
+        seed = config.ai.mock.seed,
+    } = {}) {
+        if (!Object.values(LatencyDistribution).includes(distribution)) {
+            throw new Error(`Unknown mock latency distribution: ${distribution}`);
+        }
+
+        this.name = 'Mock AI';
+        this.id = 'mock';
+        this.modelName = 'PhishGuard AI v2.0 (mock provider)';
+        this.enabled = true;
+
+        this.distribution = distribution;
+        this.latencyMs = latencyMs;
+        this.spread = spread;
+        this.errorRate = errorRate;
+        this.malformedRate = malformedRate;
+        this._random = seededRandom(seed);
+    }
+
+    /**
+     * Nothing to connect to
+     */
+    async warmUp() {}
+
+    /**
+     * No connection pool
+     */
+    socketStats() {
+        return null;
+    }
+
+    /**
+     * Draw one latency sample in milliseconds
+     */
+    sampleLatency() {
+        // Always draw twice so every call advances the generator equally
+        const u1 = this._random();
+        const u2 = this._random();
+        const gaussian = () => Math.sqrt(-2 * Math.log(1 - u1)) * Math.cos(2 * Math.PI * u2);
+
+        switch (this.distribution) {
+        case LatencyDistribution.UNIFORM:
+            return Math.max(0, this.latencyMs * (1 + this.spread * (2 * u1 - 1)));
+        case LatencyDistribution.NORMAL:
+            return Math.max(0, this.latencyMs * (1 + this.spread * gaussian()));
+        case LatencyDistribution.LOGNORMAL:
+            return this.latencyMs * Math.exp(this.spread * gaussian());
+        default:
+            return this.latencyMs;
+        }
+    }
+
+    /**
+     * Latency and outcome of the next call
+     */
+    _plan() {
+        const delayMs = Math.round(this.sampleLatency());
+        const roll = this._random();
+        const outcome = roll < this.errorRate ? 'error'
+            : roll < this.errorRate + this.malformedRate ? 'malformed'
+                : 'ok';
+        return { delayMs, outcome };
+    }
+
+    /**
+     * Reply text for a request: one verdict, or one per numbered message
+     * when a batch (ARRAY) schema is requested
+     */
+    _reply({ userText, responseSchema }, outcome) {
+        if (outcome === 'malformed') {
+            return MALFORMED_REPLY;
+        }
+        if (responseSchema?.type !== 'ARRAY') {
+            return JSON.stringify(verdictFor(userText));
+        }
+
+        return JSON.stringify([...userText.matchAll(BATCH_MESSAGE)]
+            .map(([, id, message]) => ({ id: Number(id), ...verdictFor(message) })));
+    }
+
+    /**
+     * One synthetic call
+     * @returns {Promise<string>} JSON reply text
+     */
+    async generate(request) {
+        const { delayMs, outcome } = this._plan();
+
+        if (delayMs > request.timeout) {
+            await sleep(request.timeout, request.signal);
+            throw timeoutError(request.timeout);
+        }
+        await sleep(delayMs, request.signal);
+
+        if (outcome === 'error') {
+            throw httpError(503, 'Service Unavailable');
+        }
+        return this._reply(request, outcome);
+    }
+
+    /**
+     * One synthetic streamed call: the reply arrives in equal fragments
+     * spread over the sampled latency. The caller's abort signal bounds it.
+     * @returns {Promise<AsyncIterable<string>>}
+     */
+    async generateStream(request) {
+        const { delayMs, outcome } = this._plan();
+
+        if (outcome === 'error') {
+            await sleep(delayMs, request.signal);
+            throw httpError(503, 'Service Unavailable');
+        }
+
+        const text = this._reply(request, outcome);
+        const size = Math.ceil(text.length / STREAM_CHUNKS);
+
+        return (async function* fragments() {
+            for (let i = 0; i < text.length; i += size) {
+                await sleep(delayMs / STREAM_CHUNKS, request.signal);
+                yield text.slice(i, i + size);
+            }
+        })();
+    }
+}
+
+export default MockProvider;
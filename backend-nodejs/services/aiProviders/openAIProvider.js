@@ -0,0 +1,145 @@
+/**
+ * OpenAI-Compatible Provider
+ *
+ * Chat-completions transport for self-hosted model servers that speak the
+ * OpenAI API (vLLM, llama.cpp server, Ollama, LM Studio, ...). The verdict
+ * schema is sent as a json_schema response format so constrained decoding
+ * yields the same JSON the Gemini provider returns.
+ */
+
+import config from '../../config.js';
+import { createKeepAliveClient, getSocketStats } from '../../utils/httpClient.js';
+import { readSseEvents } from '../../utils/sseStream.js';
+
+const CHAT_COMPLETIONS_PATH = 'chat/completions';
+
+/**
+ * Convert a Gemini-style schema (upper-case types, propertyOrdering) to
+ * plain JSON Schema. Property order is kept, so fields still stream in
+ * schema order on servers that decode by grammar.
+ */
+export const toJsonSchema = (schema) => {
+    if (Array.isArray(schema)) {
+        return schema.map(toJsonSchema);
+    }
+    if (!schema || typeof schema !== 'object') {
+        return schema;
+    }
+
+    const converted = {};
+    for (const [key, value] of Object.entries(schema)) {
+        if (key === 'propertyOrdering') continue;
+        converted[key] = key === 'type' && typeof value === 'string' ? value.toLowerCase() : toJsonSchema(value);
+    }
+    return converted;
+};
+
+/**
+ * OpenAI chat-completions transport
+ */
+export class OpenAICompatibleProvider {
+    /**
+     * @param {Object} options
+     * @param {string} options.baseURL - API root including the version (e.g., 'http://127.0.0.1:8000/v1')
+     * @param {string} options.apiKey - Bearer token, if the server requires one
+     * @param {string} options.model - Model name served by the endpoint
+     * @param {Object} options.tls - Extra TLS options for the connection pool
+     */
+    constructor({
+        baseURL = config.ai.openai.baseUrl,
+        apiKey = config.ai.openai.apiKey,
+        model = config.ai.openai.model,
+        tls = {},
+    } = {}) {
+        this.name = 'OpenAI-compatible';
+        this.model = model;
+        // Same model name on another server may be a different build or quantization
+        this.id = `openai:${model}@${baseURL}`;
+        this.modelName = `PhishGuard AI v2.0 (${model})`;
+        this.enabled = !!baseURL && !!model;
+
+        this.http = createKeepAliveClient({
+            // Trailing slash so relative paths resolve under the version prefix
+            baseURL: baseURL.replace(/\/*$/, '/'),
+            timeout: config.ai.timeout,
+            maxSockets: config.ai.maxSockets,
+            maxFreeSockets: config.ai.maxFreeSockets,
+            tls,
+            headers: apiKey ? { Authorization: `Bearer ${apiKey}` } : {},
+        });
+    }
+
+    /**
+     * Open one pooled connection; any HTTP response will do
+     */
+    async warmUp() {
+        await this.http.head('', { validateStatus: () => true });
+    }
+
+    /**
+     * Connection pool snapshot
+     */
+    socketStats() {
+        return getSocketStats(this.http.agent);
+    }
+
+    /**
+     * One chat-completions call
+     * @returns {Promise<string|undefined>} JSON reply text
+     */
+    async generate(request) {
+        const response = await this.http.post(
+            CHAT_COMPLETIONS_PATH,
+            this._requestBody(request),
+            { timeout: request.timeout }
+        );
+        return response.data?.choices?.[0]?.message?.content;
+    }
+
+    /**
+     * One streamed chat-completions call. Resolves once the response
+     * starts, with the content deltas as they arrive.
+     * @returns {Promise<AsyncIterable<string>>}
+     */
+    async generateStream(request) {
+        const response = await this.http.post(
+            CHAT_COMPLETIONS_PATH,
+            { ...this._requestBody(request), stream: true },
+            { timeout: request.timeout, responseType: 'stream', signal: request.signal }
+        );
+
+        return (async function* fragments() {
+            try {
+                for await (const event of readSseEvents(response.data)) {
+                    const text = event.choices?.[0]?.delta?.content;
+                    if (text) yield text;
+                }
+            } finally {
+                response.data.destroy?.();
+            }
+        })();
+    }
+
+    /**
+     * Chat-completions request body: system and user messages plus a JSON
+     * schema response format
+     */
+    _requestBody({ systemInstruction, userText, responseSchema, maxOutputTokens = 1024 }) {
+        return {
+            model: this.model,
+            messages: [
+                { role: 'system', content: systemInstruction },
+                { role: 'user', content: userText },
+            ],
+            temperature: 0.2,
+            top_p: 0.95,
+            max_tokens: maxOutputTokens,
+            response_format: {
+                type: 'json_schema',
+                json_schema: { name: 'phishing_verdict', schema: toJsonSchema(responseSchema) },
+            },
+        };
+    }
+}
+
+export default OpenAICompatibleProvider;
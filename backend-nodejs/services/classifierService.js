@@ -0,0 +1,67 @@
+/**
+ * Local Classifier Service
+ *
+ * Scores messages with the offline-trained hashed n-gram model
+ * (LOCAL_MODEL_PATH). Runs in-process on the CPU, so it adds a statistical
+ * signal between the keyword rules and the remote AI tier at no network
+ * cost. Disabled when no model file is configured.
+ */
+
+import config from '../config.js';
+import logger from '../utils/logger.js';
+import { LatencyWindow } from '../utils/latencyWindow.js';
+import { TextClassifier } from '../utils/textClassifier.js';
+
+/**
+ * Load the trained model, if configured
+ */
+const loadClassifier = () => {
+    if (!config.localModel.path) {
+        return null;
+    }
+
+    try {
+        const model = TextClassifier.load(config.localModel.path);
+        logger.info(`Local classifier loaded: ${model.dims} hashed features`);
+        return model;
+    } catch (error) {
+        logger.error(`Failed to load local classifier: ${error.message}`);
+        return null;
+    }
+};
+
+const CLASSIFIER = loadClassifier();
+const latency = new LatencyWindow(500);
+let predictions = 0;
+
+/**
+ * Score a message with the local model
+ * @returns {Object|null} { phishingProbability } or null when no model is loaded
+ */
+export const classifyLocally = (text) => {
+    if (!CLASSIFIER) {
+        return null;
+    }
+
+    const start = performance.now();
+    const phishingProbability = CLASSIFIER.predict(text);
+    latency.record(performance.now() - start);
+    predictions++;
+
+    return { phishingProbability };
+};
+
+/**
+ * Local model counters (for health/metrics)
+ */
+export const getLocalModelStats = () => {
+    const round = (ms) => (Number.isNaN(ms) ? null : Math.round(ms * 1000) / 1000);
+    return {
+        loaded: !!CLASSIFIER,
+        dims: CLASSIFIER ? CLASSIFIER.dims : 0,
+        weight: config.localModel.weight,
+        predictions,
+        latency_p50_ms: round(latency.percentile(0.5)),
+        latency_p99_ms: round(latency.percentile(0.99)),
+    };
+};
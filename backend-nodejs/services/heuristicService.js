@@ -7,6 +7,7 @@
 
 import { analyzeHeuristics } from './keywordService.js';
 import { analyzeUrls, checkLinkMismatches } from './urlService.js';
+import { buildTextFeatures } from './textFeatures.js';
 import logger from '../utils/logger.js';
 
 /**
@@ -16,14 +17,17 @@ export const analyzeHeuristic = (text) => {
     try {
         logger.debug('Starting heuristic analysis');
 
+        // Shared features: lowercased text, tokens, counters and URLs computed once
+        const features = buildTextFeatures(text);
+
         // Keyword and behavioral analysis
-        const keywordResult = analyzeHeuristics(text);
+        const keywordResult = analyzeHeuristics(features);
 
         // URL analysis
-        const urlResult = analyzeUrls(text);
+        const urlResult = analyzeUrls(features);
 
         // Link mismatch detection
-        const mismatchResult = checkLinkMismatches(text);
+        const mismatchResult = checkLinkMismatches(features);
 
         // Combine scores
         const totalScore = keywordResult.score + urlResult.score + mismatchResult.score;
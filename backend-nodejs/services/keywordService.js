@@ -6,6 +6,8 @@
  */
 
 import logger from '../utils/logger.js';
+import { AhoCorasick } from '../utils/ahoCorasick.js';
+import { toTextFeatures } from './textFeatures.js';
 
 /**
  * Phishing keyword categories with scores
@@ -145,20 +147,111 @@ const HIGH_RISK_PHRASES = [
     'restore wallet now',
 ];
 
+/**
+ * Personal information requests
+ */
+const SENSITIVE_REQUESTS = [
+    'social security', 'ssn', 'date of birth', 'dob',
+    'mother\'s maiden name', 'passport number', 'driver\'s license',
+    'account number', 'routing number', 'pin number', 'cvv',
+    'seed phrase', 'recovery phrase', 'private key', 'wallet phrase'
+];
+
+/**
+ * Ranking weights for located phrase and sensitive-request hits
+ * (keyword categories use their own score)
+ */
+const PHRASE_WEIGHT = 30;
+const SENSITIVE_WEIGHT = 45;
+
+/**
+ * Compile every literal list into one automaton.
+ *
+ * Each distinct literal gets a single pattern id; the category, phrase and
+ * sensitive-term buckets keep their original ordering as lists of ids so
+ * reasons are reported exactly as the per-keyword scans did.
+ */
+const compileKeywordMatcher = () => {
+    const ids = new Map();
+    const idOf = (literal) => {
+        if (!ids.has(literal)) {
+            ids.set(literal, ids.size);
+        }
+        return ids.get(literal);
+    };
+
+    const categories = Object.entries(KEYWORD_CATEGORIES).map(([category, data]) => ({
+        category,
+        score: data.score,
+        ids: data.keywords.map(idOf),
+    }));
+    const phrases = HIGH_RISK_PHRASES.map(idOf);
+    const sensitive = SENSITIVE_REQUESTS.map(idOf);
+
+    // Strongest bucket weight per literal, used to rank located hits
+    const weights = new Uint8Array(ids.size);
+    const weigh = (bucketIds, weight) => {
+        for (const id of bucketIds) {
+            weights[id] = Math.max(weights[id], weight);
+        }
+    };
+    categories.forEach(({ ids: bucketIds, score }) => weigh(bucketIds, score));
+    weigh(phrases, PHRASE_WEIGHT);
+    weigh(sensitive, SENSITIVE_WEIGHT);
+
+    return {
+        automaton: new AhoCorasick([...ids.keys()]),
+        categories,
+        phrases,
+        sensitive,
+        weights,
+    };
+};
+
+const KEYWORD_MATCHER = compileKeywordMatcher();
+
+/**
+ * Automaton hits per feature object, so keyword and behavior scans share one pass
+ */
+const keywordHitsCache = new WeakMap();
+
+const getKeywordHits = (features) => {
+    let hits = keywordHitsCache.get(features);
+    if (!hits) {
+        hits = KEYWORD_MATCHER.automaton.search(features.lower);
+        keywordHitsCache.set(features, hits);
+    }
+    return hits;
+};
+
+/**
+ * Resolve the literals of a bucket that were hit, in bucket order
+ */
+const collectMatches = (bucketIds, hits) => {
+    const matches = [];
+    for (const id of bucketIds) {
+        if (hits[id] === 1) {
+            matches.push(KEYWORD_MATCHER.automaton.patterns[id]);
+        }
+    }
+    return matches;
+};
+
 /**
  * Scan text for phishing keywords
  */
-export const scanKeywords = (text) => {
-    const textLower = text.toLowerCase();
+export const scanKeywords = (input) => {
+    const features = toTextFeatures(input);
+    const hits = getKeywordHits(features);
     let score = 0;
     const reasons = [];
 
     // Check keyword categories
-    for (const [category, data] of Object.entries(KEYWORD_CATEGORIES)) {
-        const matches = data.keywords.filter(keyword => textLower.includes(keyword));
+    for (const { category, score: categoryScore, ids } of KEYWORD_MATCHER.categories) {
+        const matches = collectMatches(ids, hits);
 
         if (matches.length > 0) {
-            score += data.score;
+            score += categoryScore;
             reasons.push(
                 `${category.charAt(0).toUpperCase() + category.slice(1)} indicators detected: ${matches.slice(0, 3).join(', ')}`
             );
@@ -166,14 +259,14 @@ export const scanKeywords = (text) => {
     }
 
     // Check high-risk phrases
-    const phraseMatches = HIGH_RISK_PHRASES.filter(phrase => textLower.includes(phrase));
+    const phraseMatches = collectMatches(KEYWORD_MATCHER.phrases, hits);
     if (phraseMatches.length > 0) {
         score += phraseMatches.length * 15;
         reasons.push(`Critical phishing phrases found: ${phraseMatches.slice(0, 2).join(', ')}`);
     }
 
     // Contextual wallet-drain scam patterns
-    const contextMatches = CONTEXT_SCAM_PATTERNS.filter((pattern) => pattern.test(text));
+    const contextMatches = CONTEXT_SCAM_PATTERNS.filter((pattern) => pattern.test(features.text));
     if (contextMatches.length > 0) {
         score += 30;
         reasons.push('Contextual wallet recovery scam language detected');
@@ -182,16 +275,29 @@ export const scanKeywords = (text) => {
     return { score, reasons };
 };
 
+/**
+ * Locate every keyword, phrase and sensitive-request occurrence
+ * @returns {Array<{start: number, end: number, weight: number}>} Hits with their bucket weight
+ */
+export const locateKeywords = (input) => {
+    const features = toTextFeatures(input);
+    return KEYWORD_MATCHER.automaton.findAll(features.lower).map(({ id, start, end }) => ({
+        start,
+        end,
+        weight: KEYWORD_MATCHER.weights[id],
+    }));
+};
+
 /**
  * Analyze behavioral manipulation tactics
  */
-export const analyzeBehavior = (text) => {
+export const analyzeBehavior = (input) => {
+    const features = toTextFeatures(input);
     let score = 0;
     const reasons = [];
-    const textLower = text.toLowerCase();
 
     // Excessive exclamation marks
-    const exclamationCount = (text.match(/!/g) || []).length;
+    const { exclamationCount } = features;
     if (exclamationCount >= 5) {
         score += 8;
         reasons.push(`Excessive exclamation marks (${exclamationCount})`);
@@ -201,37 +307,23 @@ export const analyzeBehavior = (text) => {
     }
 
     // All caps words (shouting)
-    const words = text.split(/\s+/);
-    const capsWords = words.filter(word =>
-        word.length > 3 &&
-        word === word.toUpperCase() &&
-        /^[A-Z]+$/.test(word)
-    );
-
-    if (capsWords.length >= 5) {
+    const { capsWordCount } = features;
+    if (capsWordCount >= 5) {
         score += 7;
-        reasons.push(`Multiple all-caps words (${capsWords.length})`);
-    } else if (capsWords.length >= 3) {
+        reasons.push(`Multiple all-caps words (${capsWordCount})`);
+    } else if (capsWordCount >= 3) {
         score += 3;
         reasons.push('All-caps words detected');
     }
 
     // Multiple question marks
-    const questionCount = (text.match(/\?/g) || []).length;
-    if (questionCount >= 3) {
+    if (features.questionCount >= 3) {
         score += 3;
         reasons.push('Excessive questioning detected');
     }
 
     // Check for personal information requests
-    const sensitiveRequests = [
-        'social security', 'ssn', 'date of birth', 'dob',
-        'mother\'s maiden name', 'passport number', 'driver\'s license',
-        'account number', 'routing number', 'pin number', 'cvv',
-        'seed phrase', 'recovery phrase', 'private key', 'wallet phrase'
-    ];
-
-    const sensitiveMatches = sensitiveRequests.filter(term => textLower.includes(term));
+    const sensitiveMatches = collectMatches(KEYWORD_MATCHER.sensitive, getKeywordHits(features));
     if (sensitiveMatches.length > 0) {
         score += 15;
         reasons.push(`Requests sensitive information: ${sensitiveMatches.slice(0, 2).join(', ')}`);
@@ -241,12 +333,12 @@ export const analyzeBehavior = (text) => {
     const grammarIssues = [];
 
     // Multiple spaces
-    if (/\s{3,}/.test(text)) {
+    if (features.hasIrregularSpacing) {
         grammarIssues.push('irregular spacing');
     }
 
     // Unusual punctuation
-    if (/[.!?]{3,}/.test(text)) {
+    if (features.hasExcessivePunctuation) {
         grammarIssues.push('excessive punctuation');
     }
 
@@ -261,10 +353,11 @@ export const analyzeBehavior = (text) => {
 /**
  * Combined keyword and behavioral analysis
  */
-export const analyzeHeuristics = (text) => {
+export const analyzeHeuristics = (input) => {
     try {
-        const keywordResult = scanKeywords(text);
-        const behaviorResult = analyzeBehavior(text);
+        const features = toTextFeatures(input);
+        const keywordResult = scanKeywords(features);
+        const behaviorResult = analyzeBehavior(features);
 
         const totalScore = keywordResult.score + behaviorResult.score;
         const allReasons = [...keywordResult.reasons, ...behaviorResult.reasons];
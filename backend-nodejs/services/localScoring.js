@@ -0,0 +1,28 @@
+/**
+ * Local Scoring
+ *
+ * The CPU-only tiers of the pipeline: keyword/URL heuristics and the local
+ * classifier, combined into the pre-AI score the cascade routes on. Shared
+ * by the request path and the batch worker threads.
+ */
+
+import { analyzeHeuristic } from './heuristicService.js';
+import { classifyLocally } from './classifierService.js';
+import { combineScores } from '../utils/riskScorer.js';
+
+/**
+ * Score a message without the AI tier
+ * @returns {Object} { heuristicResult, localResult, preAiScore }
+ */
+export const scoreLocally = (text) => {
+    const heuristicResult = analyzeHeuristic(text);
+    const localResult = classifyLocally(text);
+
+    return {
+        heuristicResult,
+        localResult,
+        preAiScore: combineScores(null, heuristicResult.score, localResult),
+    };
+};
+
+export default scoreLocally;
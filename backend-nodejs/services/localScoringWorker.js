@@ -0,0 +1,18 @@
+/**
+ * Local Scoring Worker
+ *
+ * Worker-thread entry for the batch endpoint's WorkerPool: scores one
+ * message per task with the heuristics and local classifier, off the
+ * event loop. Each worker loads its own blocklist and model.
+ */
+
+import { parentPort } from 'worker_threads';
+import { scoreLocally } from './localScoring.js';
+
+parentPort.on('message', ({ id, data }) => {
+    try {
+        parentPort.postMessage({ id, result: scoreLocally(data) });
+    } catch (error) {
+        parentPort.postMessage({ id, error: error.message });
+    }
+});
@@ -0,0 +1,158 @@
+/**
+ * Message Condenser Service
+ *
+ * Shrinks long messages to a token budget before they are sent to the AI
+ * tier. Keeps the head and tail plus windows around the highest-signal
+ * spots (sensitive-data requests, URLs, phishing keywords) and marks every
+ * elided gap, so newsletters and HTML dumps cost a few thousand tokens
+ * instead of the whole body.
+ */
+
+import { locateKeywords } from './keywordService.js';
+import { toTextFeatures } from './textFeatures.js';
+
+/**
+ * Rough chars-per-token ratio for English text with Gemini's tokenizer
+ */
+const CHARS_PER_TOKEN = 4;
+
+/**
+ * URL windows rank above every keyword category, below sensitive requests
+ */
+const URL_WEIGHT = 42;
+
+/**
+ * Marker inserted where text was dropped
+ */
+const elision = (omitted) => `\n[... ${omitted} characters omitted ...]\n`;
+
+/**
+ * Space reserved per gap for its elision marker
+ */
+const ELISION_RESERVE = 40;
+
+/**
+ * Estimated token count for text
+ */
+export const estimateTokens = (text) => Math.ceil(text.length / CHARS_PER_TOKEN);
+
+/**
+ * Signal anchors in text, strongest first
+ */
+const findAnchors = (features) => {
+    const anchors = locateKeywords(features);
+
+    for (const url of features.urls) {
+        const start = features.text.indexOf(url);
+        anchors.push({ start, end: start + url.length, weight: URL_WEIGHT });
+    }
+
+    return anchors.sort((a, b) => b.weight - a.weight || a.start - b.start);
+};
+
+/**
+ * Merge [start, end) into a sorted, disjoint span list
+ * @returns {Array<number[]>} New span list
+ */
+const mergeSpan = (spans, start, end) => {
+    const merged = [];
+    let placed = false;
+
+    for (const [s, e] of spans) {
+        if (e < start) {
+            merged.push([s, e]);
+        } else if (s > end) {
+            if (!placed) {
+                merged.push([start, end]);
+                placed = true;
+            }
+            merged.push([s, e]);
+        } else {
+            start = Math.min(start, s);
+            end = Math.max(end, e);
+        }
+    }
+
+    if (!placed) {
+        merged.push([start, end]);
+    }
+    return merged;
+};
+
+/**
+ * Characters the condensed text would need for a span list
+ */
+const condensedLength = (spans, textLength) => {
+    let length = 0;
+    let gaps = 0;
+    let cursor = 0;
+
+    for (const [start, end] of spans) {
+        length += end - start;
+        if (start > cursor) gaps++;
+        cursor = end;
+    }
+    if (cursor < textLength) gaps++;
+
+    return length + gaps * ELISION_RESERVE;
+};
+
+/**
+ * Condense a message to fit a token budget
+ * @param {string} text - Full message
+ * @param {Object} options
+ * @param {number} options.tokenBudget - Max estimated tokens to keep (0 = no condensation)
+ * @param {number} options.windowChars - Context kept on each side of an anchor
+ * @param {number} options.headChars - Leading characters always kept
+ * @param {number} options.tailChars - Trailing characters always kept
+ * @returns {Object} { text, condensed, windows, originalBytes, sentBytes, bytesSaved }
+ */
+export const condenseMessage = (text, {
+    tokenBudget = 0,
+    windowChars = 200,
+    headChars = 1000,
+    tailChars = 500,
+} = {}) => {
+    const originalBytes = Buffer.byteLength(text, 'utf8');
+    const budget = tokenBudget * CHARS_PER_TOKEN;
+
+    if (tokenBudget <= 0 || text.length <= budget) {
+        return { text, condensed: false, windows: 1, originalBytes, sentBytes: originalBytes, bytesSaved: 0 };
+    }
+
+    // Head and tail always survive, but never take more than half the budget
+    const edge = Math.floor(budget / 4);
+    let spans = mergeSpan([[0, Math.min(headChars, edge)]], text.length - Math.min(tailChars, edge), text.length);
+
+    for (const anchor of findAnchors(toTextFeatures(text))) {
+        const candidate = mergeSpan(
+            spans,
+            Math.max(0, anchor.start - windowChars),
+            Math.min(text.length, anchor.end + windowChars)
+        );
+        if (condensedLength(candidate, text.length) <= budget) {
+            spans = candidate;
+        }
+    }
+
+    const parts = [];
+    let cursor = 0;
+    for (const [start, end] of spans) {
+        if (start > cursor) parts.push(elision(start - cursor));
+        parts.push(text.slice(start, end));
+        cursor = end;
+    }
+    if (cursor < text.length) parts.push(elision(text.length - cursor));
+
+    const condensedText = parts.join('');
+    const sentBytes = Buffer.byteLength(condensedText, 'utf8');
+
+    return {
+        text: condensedText,
+        condensed: true,
+        windows: spans.length,
+        originalBytes,
+        sentBytes,
+        bytesSaved: originalBytes - sentBytes,
+    };
+};
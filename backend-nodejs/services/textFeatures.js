@@ -0,0 +1,159 @@
+/**
+ * Text Features Service
+ *
+ * Builds one immutable feature object per message so every detector reads
+ * the same lowercased text, token offsets, punctuation counters and
+ * extracted URLs instead of recomputing them.
+ */
+
+/**
+ * HTTP/HTTPS URL pattern
+ */
+const URL_PATTERN = /https?:\/\/[^\s<>"']+/gi;
+
+/**
+ * Extract all unique URLs from text, in order of first appearance
+ */
+export const extractUrls = (text) => {
+    const urls = [];
+    for (const match of text.matchAll(URL_PATTERN)) {
+        urls.push(match[0]);
+    }
+    return [...new Set(urls)];
+};
+
+const CHAR_EXCLAMATION = 0x21;
+const CHAR_QUESTION = 0x3f;
+const CHAR_PERIOD = 0x2e;
+const CHAR_UPPER_A = 0x41;
+const CHAR_UPPER_Z = 0x5a;
+
+/**
+ * Whitespace test matching the regex \s class
+ */
+const isWhitespace = (code) => {
+    if (code <= 0x20) {
+        return code === 0x20 || (code >= 0x09 && code <= 0x0d);
+    }
+    if (code < 0xa0) {
+        return false;
+    }
+    return code === 0xa0 || code === 0x1680 ||
+        (code >= 0x2000 && code <= 0x200a) ||
+        code === 0x2028 || code === 0x2029 || code === 0x202f ||
+        code === 0x205f || code === 0x3000 || code === 0xfeff;
+};
+
+/**
+ * Single linear pass computing every character-level counter.
+ *
+ * Equivalent to the previous regex/split implementation:
+ * - exclamationCount / questionCount: text.match(/!/g) / text.match(/\?/g)
+ * - tokenOffsets: spans of text.split(/\s+/) that are non-empty
+ * - capsWordCount: tokens longer than 3 chars matching /^[A-Z]+$/
+ * - hasIrregularSpacing: /\s{3,}/
+ * - hasExcessivePunctuation: /[.!?]{3,}/
+ *
+ * @returns {Object} Counters plus token offsets as flat [start, end) pairs
+ */
+export const scanText = (text) => {
+    let offsets = new Uint32Array(64);
+    let offsetCount = 0;
+    let exclamationCount = 0;
+    let questionCount = 0;
+    let capsWordCount = 0;
+    let whitespaceRun = 0;
+    let punctuationRun = 0;
+    let hasIrregularSpacing = false;
+    let hasExcessivePunctuation = false;
+    let tokenStart = -1;
+    let tokenAllCaps = false;
+
+    const closeToken = (end) => {
+        if (offsetCount + 2 > offsets.length) {
+            const grown = new Uint32Array(offsets.length * 2);
+            grown.set(offsets);
+            offsets = grown;
+        }
+        offsets[offsetCount++] = tokenStart;
+        offsets[offsetCount++] = end;
+        if (tokenAllCaps && end - tokenStart > 3) {
+            capsWordCount++;
+        }
+        tokenStart = -1;
+    };
+
+    for (let i = 0; i < text.length; i++) {
+        const code = text.charCodeAt(i);
+
+        if (isWhitespace(code)) {
+            if (tokenStart !== -1) {
+                closeToken(i);
+            }
+            if (++whitespaceRun >= 3) {
+                hasIrregularSpacing = true;
+            }
+            punctuationRun = 0;
+            continue;
+        }
+
+        whitespaceRun = 0;
+        if (tokenStart === -1) {
+            tokenStart = i;
+            tokenAllCaps = true;
+        }
+        if (code < CHAR_UPPER_A || code > CHAR_UPPER_Z) {
+            tokenAllCaps = false;
+        }
+
+        if (code === CHAR_EXCLAMATION || code === CHAR_QUESTION || code === CHAR_PERIOD) {
+            if (code === CHAR_EXCLAMATION) {
+                exclamationCount++;
+            } else if (code === CHAR_QUESTION) {
+                questionCount++;
+            }
+            if (++punctuationRun >= 3) {
+                hasExcessivePunctuation = true;
+            }
+        } else {
+            punctuationRun = 0;
+        }
+    }
+
+    if (tokenStart !== -1) {
+        closeToken(text.length);
+    }
+
+    return {
+        tokenOffsets: offsets.slice(0, offsetCount),
+        exclamationCount,
+        questionCount,
+        capsWordCount,
+        hasIrregularSpacing,
+        hasExcessivePunctuation,
+    };
+};
+
+/**
+ * Build the shared feature object for a message
+ * @param {string} text - Raw message content
+ * @returns {Readonly<Object>} Text features
+ */
+export const buildTextFeatures = (text) => {
+    const counters = scanText(text);
+
+    return Object.freeze({
+        text,
+        lower: text.toLowerCase(),
+        ...counters,
+        tokenCount: counters.tokenOffsets.length / 2,
+        urls: Object.freeze(extractUrls(text)),
+    });
+};
+
+/**
+ * Accept either raw text or an already-built feature object
+ */
+export const toTextFeatures = (input) => {
+    return typeof input === 'string' ? buildTextFeatures(input) : input;
+};
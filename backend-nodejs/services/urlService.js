@@ -5,7 +5,16 @@
  * Detects IP addresses, suspicious domains, shortened URLs, and mismatches.
  */
 
+import fs from 'fs';
+import config from '../config.js';
 import logger from '../utils/logger.js';
+import { BlocklistIndex } from '../utils/blocklistIndex.js';
+import { findCryptoAddresses } from '../utils/cryptoAddress.js';
+import { DomainSuffixIndex } from '../utils/domainSuffixIndex.js';
+import { analyzeLabel } from '../utils/homograph.js';
+import { LRUCache } from '../utils/lruCache.js';
+import { TyposquatIndex } from '../utils/typosquatIndex.js';
+import { toTextFeatures } from './textFeatures.js';
 
 /**
  * Known phishing and suspicious domains
@@ -14,8 +23,6 @@ const SUSPICIOUS_DOMAINS = [
     // Common URL shorteners
     'bit.ly', 'tinyurl.com', 'goo.gl', 'ow.ly', 't.co', 'clck.ru', 'cutt.ly',
     'short.io', 's.id', 'rebrand.ly', 'tiny.cc', 'is.gd', 'buff.ly', 'shorturl.at',
-    // Typosquatting examples
-    'paypa1.com', 'gooogle.com', 'microsft.com', 'netfIix.com', 'arnaz0n.com',
     // Suspicious TLDs - Free/cheap domains often used for scams
     '.tk', '.ml', '.ga', '.cf', '.gq', '.xyz', '.top', '.work', '.click',
     '.link', '.online', '.site', '.website', '.space', '.tech', '.store',
@@ -26,82 +33,191 @@ const SUSPICIOUS_DOMAINS = [
 ];
 
 /**
- * Regex patterns for URL detection
+ * Host suffix index over SUSPICIOUS_DOMAINS: matches TLDs, exact domains and
+ * their subdomains in O(host labels) regardless of list size
  */
-const URL_PATTERNS = {
-    // HTTP/HTTPS URLs
-    standard: /https?:\/\/[^\s<>"']+/gi,
-    // IP addresses in URLs
-    ipAddress: /https?:\/\/(?:\d{1,3}\.){3}\d{1,3}(?::\d+)?/gi,
-    // URLs with @ symbol (credential phishing)
-    withCredentials: /https?:\/\/[^@]+@[^\s<>"']+/gi,
-    // Suspicious port numbers
-    suspiciousPorts: /https?:\/\/[^:\/]+:(?:8080|8888|3000|4444|5555)/gi,
+const SUSPICIOUS_DOMAIN_INDEX = new DomainSuffixIndex(SUSPICIOUS_DOMAINS);
+
+/**
+ * Load the compiled threat-intel blocklist, if configured
+ */
+const loadBlocklist = () => {
+    if (!config.blocklist.path) {
+        return null;
+    }
+
+    try {
+        const index = BlocklistIndex.load(config.blocklist.path);
+        logger.info(`Threat-intel blocklist loaded: ${index.size} entries`);
+        return index;
+    } catch (error) {
+        logger.error(`Failed to load threat-intel blocklist: ${error.message}`);
+        return null;
+    }
 };
 
+const BLOCKLIST = loadBlocklist();
+
 /**
- * Extract all URLs from text
+ * Build the typosquat index from configured brands plus the optional brands file
  */
-const extractUrls = (text) => {
-    const urls = [];
-    const matches = text.matchAll(URL_PATTERNS.standard);
+const loadTyposquatIndex = () => {
+    const brands = [...config.typosquat.brands];
+
+    if (config.typosquat.brandsFile) {
+        try {
+            const lines = fs.readFileSync(config.typosquat.brandsFile, 'utf8').split(/\r?\n/);
+            for (const line of lines) {
+                const brand = line.trim();
+                if (brand && !brand.startsWith('#')) {
+                    brands.push(brand);
+                }
+            }
+        } catch (error) {
+            logger.error(`Failed to load protected brands file: ${error.message}`);
+        }
+    }
+
+    const index = new TyposquatIndex(brands, {
+        maxDistance: config.typosquat.maxDistance,
+        suspiciousSuffixes: SUSPICIOUS_DOMAINS,
+    });
+    logger.debug(`Typosquat index built: ${index.size} protected brands`);
+    return index;
+};
 
-    for (const match of matches) {
-        urls.push(match[0]);
+const TYPOSQUAT_INDEX = loadTyposquatIndex();
+
+/**
+ * Brands commonly placed in the userinfo part of a URL
+ * (e.g., https://facebook.com-recovery@malicious.com)
+ */
+const POPULAR_BRANDS = [
+    'facebook', 'google', 'microsoft', 'apple', 'amazon', 'paypal',
+    'netflix', 'instagram', 'twitter', 'linkedin', 'dropbox', 'adobe',
+    'bank', 'secure', 'account', 'verify', 'login', 'signin', 'coinbase',
+    'binance', 'kraken', 'metamask', 'trustwallet', 'blockchain'
+];
+
+/**
+ * Investment/ponzi scam keywords found in URLs
+ */
+const SCAM_PATTERNS = [
+    'invest', 'profit', 'earn', 'crypto', 'bitcoin', 'mining',
+    'double', 'triple', 'roi', 'passive-income', 'guaranteed',
+    'bonus', 'referral', 'reward', 'claim', 'prize', 'winner',
+    'giveaway', 'airdrop', 'presale', 'ido', 'nft-mint'
+];
+
+/**
+ * Parse a URL once into a compact record shared by every predicate.
+ *
+ * Hand-written rather than WHATWG URL: the extracted URLs are frequently
+ * malformed, and the raw host casing and characters must be preserved for
+ * the obfuscation and homograph checks.
+ *
+ * @param {string} url - URL as extracted from the message
+ * @returns {Object} Parsed URL record
+ */
+export const parseUrl = (url) => {
+    const schemeEnd = url.indexOf('://');
+    const authorityStart = schemeEnd === -1 ? 0 : schemeEnd + 3;
+
+    let authorityEnd = authorityStart;
+    while (authorityEnd < url.length) {
+        const char = url[authorityEnd];
+        if (char === '/' || char === '?' || char === '#') break;
+        authorityEnd++;
     }
 
-    return [...new Set(urls)]; // Remove duplicates
+    const authority = url.slice(authorityStart, authorityEnd);
+    const at = authority.lastIndexOf('@');
+    const userinfo = at === -1 ? '' : authority.slice(0, at);
+    const hostPort = authority.slice(at + 1);
+
+    // Port separator is the last colon outside an IPv6 literal
+    const bracketEnd = hostPort.startsWith('[') ? hostPort.indexOf(']') : -1;
+    const colon = hostPort.indexOf(':', bracketEnd + 1);
+    const host = colon === -1 ? hostPort : hostPort.slice(0, colon);
+    const port = colon === -1 ? '' : hostPort.slice(colon + 1);
+    const hostLower = host.toLowerCase();
+
+    return {
+        url,
+        lower: url.toLowerCase(),
+        scheme: schemeEnd === -1 ? '' : url.slice(0, schemeEnd).toLowerCase(),
+        hasUserinfo: at !== -1,
+        userinfo,
+        userinfoLower: userinfo.toLowerCase(),
+        host,
+        hostLower,
+        hostLabels: hostLower.split('.'),
+        port,
+        path: url.slice(authorityEnd),
+    };
 };
 
 /**
  * Check if URL uses IP address instead of domain
  */
-const hasIpAddress = (url) => {
-    return /https?:\/\/(?:\d{1,3}\.){3}\d{1,3}/.test(url);
+const hasIpAddress = (record) => {
+    return /^(?:\d{1,3}\.){3}\d{1,3}/.test(record.host);
 };
 
 /**
  * Check if URL contains suspicious domain
  */
-const hasSuspiciousDomain = (url) => {
-    const urlLower = url.toLowerCase();
-    return SUSPICIOUS_DOMAINS.some(domain => urlLower.includes(domain));
+const hasSuspiciousDomain = (record) => {
+    return SUSPICIOUS_DOMAIN_INDEX.has(record.hostLower);
+};
+
+/**
+ * Check if URL host (or a parent domain) or the exact URL is in the blocklist
+ */
+const isBlocklisted = (record) => {
+    if (!BLOCKLIST) return false;
+    return BLOCKLIST.hasHost(record.hostLower) || BLOCKLIST.has(record.url);
+};
+
+/**
+ * Find a protected brand the URL host imitates (e.g., paypa1.com, gooogle.com)
+ */
+const findTyposquat = (record) => {
+    if (hasIpAddress(record)) return null;
+    return TYPOSQUAT_INDEX.match(record.hostLower);
 };
 
 /**
  * Check if URL has embedded credentials
  */
-const hasEmbeddedCredentials = (url) => {
-    return /@/.test(url.split('/')[2] || '');
+const hasEmbeddedCredentials = (record) => {
+    return record.hasUserinfo;
 };
 
 /**
  * Check if URL uses suspicious port
  */
-const hasSuspiciousPort = (url) => {
-    return /:\d{4}/.test(url);
+const hasSuspiciousPort = (record) => {
+    return /^\d{4}/.test(record.port);
 };
 
 /**
  * Check for URL obfuscation techniques
  */
-const isObfuscated = (url) => {
+const isObfuscated = (record) => {
     // Excessive subdomains
-    const hostname = url.split('/')[2] || '';
-    const subdomains = hostname.split('.');
-
-    if (subdomains.length > 4) {
+    if (record.hostLabels.length > 4) {
         return true;
     }
 
     // Very long URLs (potential hiding technique)
-    if (url.length > 200) {
+    if (record.url.length > 200) {
         return true;
     }
 
     // Mixed case in domain (possible obfuscation)
-    const domain = hostname.toLowerCase();
-    if (hostname !== domain && hostname !== domain.toUpperCase()) {
+    const { host, hostLower } = record;
+    if (host !== hostLower && host !== hostLower.toUpperCase()) {
         return true;
     }
 
@@ -109,79 +225,186 @@ const isObfuscated = (url) => {
 };
 
 /**
- * Check for homograph attacks (look-alike characters)
+ * Check for homograph attacks (look-alike characters) in host labels.
+ *
+ * Punycode labels are decoded and every IDN label is reduced to its Latin
+ * skeleton; mixed-script labels and skeletons matching a protected brand
+ * are flagged.
+ * @returns {{brand: string|null}|null}
  */
-const hasHomographAttack = (url) => {
-    // Common homograph characters
-    const homographs = /[а-яіїєА-ЯІЇЄ]/; // Cyrillic characters that look like Latin
-    return homographs.test(url);
+const findHomograph = (record) => {
+    const { hostLower } = record;
+    if (!/[^\x00-\x7f]/.test(hostLower) && !hostLower.includes('xn--')) {
+        return null;
+    }
+
+    let mixedScript = false;
+    for (const label of record.hostLabels) {
+        const analysis = analyzeLabel(label);
+        if (!analysis.isIdn) continue;
+
+        if (analysis.hasConfusables) {
+            const brand = TYPOSQUAT_INDEX.matchLabel(label, analysis.skeleton);
+            if (brand) {
+                return { brand: brand.brand };
+            }
+        }
+        mixedScript = mixedScript || analysis.mixedScript;
+    }
+
+    return mixedScript ? { brand: null } : null;
 };
 
 /**
  * Check for brand impersonation in URL (e.g., facebook.com-recovery@malicious.com)
  */
-const hasBrandImpersonation = (url) => {
-    const popularBrands = [
-        'facebook', 'google', 'microsoft', 'apple', 'amazon', 'paypal',
-        'netflix', 'instagram', 'twitter', 'linkedin', 'dropbox', 'adobe',
-        'bank', 'secure', 'account', 'verify', 'login', 'signin', 'coinbase',
-        'binance', 'kraken', 'metamask', 'trustwallet', 'blockchain'
-    ];
-
-    // Extract the part before @ in URLs with credentials
-    if (!/@/.test(url)) return false;
-
-    const beforeAt = url.split('@')[0].toLowerCase();
-    return popularBrands.some(brand => beforeAt.includes(brand));
+const hasBrandImpersonation = (record) => {
+    // Only the userinfo part before @ can disguise the real host
+    if (!record.hasUserinfo) return false;
+
+    return POPULAR_BRANDS.some(brand => record.userinfoLower.includes(brand));
 };
 
 /**
  * Check for investment/ponzi scam patterns in URL
  */
-const hasScamPattern = (url) => {
-    const scamPatterns = [
-        'invest', 'profit', 'earn', 'crypto', 'bitcoin', 'mining',
-        'double', 'triple', 'roi', 'passive-income', 'guaranteed',
-        'bonus', 'referral', 'reward', 'claim', 'prize', 'winner',
-        'giveaway', 'airdrop', 'presale', 'ido', 'nft-mint'
-    ];
-
-    const urlLower = url.toLowerCase();
-    const matchCount = scamPatterns.filter(pattern => urlLower.includes(pattern)).length;
-
-    // Multiple scam keywords = very suspicious
-    return matchCount >= 2;
+const hasScamPattern = (record) => {
+    let matchCount = 0;
+    for (const pattern of SCAM_PATTERNS) {
+        if (record.lower.includes(pattern) && ++matchCount >= 2) {
+            // Multiple scam keywords = very suspicious
+            return true;
+        }
+    }
+    return false;
 };
 
 /**
- * Check for cryptocurrency wallet address patterns
+ * Score a single URL, parsed once
+ * @returns {{score: number, reasons: string[]}}
  */
-const hasCryptoAddress = (text) => {
-    const cryptoPatterns = {
-        bitcoin: /(?:^|[^a-zA-Z0-9])[13][a-km-zA-HJ-NP-Z1-9]{25,34}(?:[^a-zA-Z0-9]|$)/g, // BTC addresses
-        ethereum: /(?:^|[^a-zA-Z0-9])0x[a-fA-F0-9]{40}(?:[^a-zA-Z0-9]|$)/g, // ETH addresses
-        litecoin: /(?:^|[^a-zA-Z0-9])[LM3][a-km-zA-HJ-NP-Z1-9]{26,33}(?:[^a-zA-Z0-9]|$)/g, // LTC addresses
-        // Simpler catchall for common crypto addresses
-        genericCrypto: /(?:wallet|address|send to|transfer to)[\s:]+[a-zA-Z0-9]{26,50}/gi,
-    };
+const analyzeUrl = (url) => {
+    const record = parseUrl(url);
+    let score = 0;
+    const reasons = [];
 
-    for (const [type, pattern] of Object.entries(cryptoPatterns)) {
-        if (pattern.test(text)) {
-            return true;
-        }
+    // IP address URLs
+    if (hasIpAddress(record)) {
+        score += 20;
+        reasons.push(`Suspicious IP-based URL: ${url.substring(0, 50)}`);
     }
-    return false;
+
+    // Embedded credentials
+    if (hasEmbeddedCredentials(record)) {
+        score += 25;
+        reasons.push('URL contains embedded credentials');
+    }
+
+    // Brand impersonation in URL
+    if (hasBrandImpersonation(record)) {
+        score += 20;
+        reasons.push('URL contains brand impersonation attempt');
+    }
+
+    // Threat-intel blocklist
+    if (isBlocklisted(record)) {
+        score += 35;
+        reasons.push('URL found in threat-intelligence blocklist');
+    }
+
+    // Typosquatted brand domains (look-alike IDN hosts are reported as homographs below)
+    const homograph = findHomograph(record);
+    const typosquat = homograph?.brand ? null : findTyposquat(record);
+    if (typosquat) {
+        score += 25;
+        reasons.push(`Possible typosquat of protected brand: ${typosquat.brand}`);
+    }
+
+    // Known suspicious domains
+    if (hasSuspiciousDomain(record)) {
+        score += 15;
+        reasons.push(`Known suspicious domain in URL`);
+    }
+
+    // Investment/Ponzi scam patterns
+    if (hasScamPattern(record)) {
+        score += 25;
+        reasons.push('URL contains investment/scam-related keywords');
+    }
+
+    // Suspicious ports
+    if (hasSuspiciousPort(record)) {
+        score += 10;
+        reasons.push(`URL uses suspicious port number`);
+    }
+
+    // Obfuscation
+    if (isObfuscated(record)) {
+        score += 12;
+        reasons.push('URL appears obfuscated');
+    }
+
+    // Homograph attack
+    if (homograph?.brand) {
+        score += 30;
+        reasons.push(`Potential homograph attack in URL imitating ${homograph.brand}`);
+    } else if (homograph) {
+        score += 18;
+        reasons.push('Potential homograph attack in URL');
+    }
+
+    // HTTP instead of HTTPS
+    if (record.scheme === 'http') {
+        score += 5;
+        reasons.push('Insecure HTTP URL detected');
+    }
+
+    return Object.freeze({ score, reasons: Object.freeze(reasons) });
+};
+
+/**
+ * Process-wide cache of per-URL verdicts.
+ *
+ * Keyed by the exact extracted URL: host casing feeds the obfuscation check,
+ * so case-folding the key would merge URLs with different verdicts.
+ */
+const urlVerdictCache = new LRUCache({
+    maxEntries: config.urlCache.maxEntries,
+    ttlMs: config.urlCache.ttlMs,
+});
+
+/**
+ * Score a URL, reusing a cached verdict when available
+ */
+const getUrlVerdict = (url) => {
+    let verdict = urlVerdictCache.get(url);
+    if (verdict === undefined) {
+        verdict = analyzeUrl(url);
+        urlVerdictCache.set(url, verdict);
+    }
+    return verdict;
 };
 
+/**
+ * URL verdict cache counters
+ */
+export const getUrlCacheStats = () => urlVerdictCache.stats();
+
+/**
+ * Drop all cached URL verdicts (e.g., after the blocklist changes)
+ */
+export const clearUrlCache = () => urlVerdictCache.clear();
+
 /**
  * Analyze URLs in text
  */
-export const analyzeUrls = (text) => {
+export const analyzeUrls = (input) => {
     let score = 0;
     const reasons = [];
 
     try {
-        const urls = extractUrls(text);
+        const features = toTextFeatures(input);
+        const { urls } = features;
 
         if (urls.length === 0) {
             return { score: 0, reasons: [], urlCount: 0 };
@@ -193,67 +416,19 @@ export const analyzeUrls = (text) => {
             reasons.push(`Excessive URLs detected (${urls.length})`);
         }
 
-        // Analyze each URL
+        // Per-URL verdicts, served from the process-wide cache when seen before
         for (const url of urls) {
-            // IP address URLs
-            if (hasIpAddress(url)) {
-                score += 20;
-                reasons.push(`Suspicious IP-based URL: ${url.substring(0, 50)}`);
-            }
-
-            // Embedded credentials
-            if (hasEmbeddedCredentials(url)) {
-                score += 25;
-                reasons.push('URL contains embedded credentials');
-            }
-
-            // Brand impersonation in URL
-            if (hasBrandImpersonation(url)) {
-                score += 20;
-                reasons.push('URL contains brand impersonation attempt');
-            }
-
-            // Known suspicious domains
-            if (hasSuspiciousDomain(url)) {
-                score += 15;
-                reasons.push(`Known suspicious domain in URL`);
-            }
-
-            // Investment/Ponzi scam patterns
-            if (hasScamPattern(url)) {
-                score += 25;
-                reasons.push('URL contains investment/scam-related keywords');
-            }
-
-            // Suspicious ports
-            if (hasSuspiciousPort(url)) {
-                score += 10;
-                reasons.push(`URL uses suspicious port number`);
-            }
-
-            // Obfuscation
-            if (isObfuscated(url)) {
-                score += 12;
-                reasons.push('URL appears obfuscated');
-            }
-
-            // Homograph attack
-            if (hasHomographAttack(url)) {
-                score += 18;
-                reasons.push('Potential homograph attack in URL');
-            }
-
-            // HTTP instead of HTTPS
-            if (url.startsWith('http://')) {
-                score += 5;
-                reasons.push('Insecure HTTP URL detected');
-            }
+            const verdict = getUrlVerdict(url);
+            score += verdict.score;
+            reasons.push(...verdict.reasons);
         }
 
-        // Check for cryptocurrency addresses in text (major red flag)
-        if (hasCryptoAddress(text)) {
+        // Check for checksum-valid cryptocurrency addresses in text (major red flag)
+        const addresses = findCryptoAddresses(features.text);
+        if (addresses.length > 0) {
+            const types = [...new Set(addresses.map(({ type }) => type))];
             score += 30;
-            reasons.push('Cryptocurrency wallet address detected - potential scam');
+            reasons.push(`Cryptocurrency wallet address detected (${types.join(', ')}) - potential scam`);
         }
 
         logger.debug(`URL analysis: ${urls.length} URLs found, score=${score}`);
@@ -277,7 +452,8 @@ export const analyzeUrls = (text) => {
 /**
  * Check for link-text mismatches (displayed text vs actual URL)
  */
-export const checkLinkMismatches = (text) => {
+export const checkLinkMismatches = (input) => {
+    const { text } = toTextFeatures(input);
     const reasons = [];
     let score = 0;
 
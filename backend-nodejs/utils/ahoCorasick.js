@@ -0,0 +1,142 @@
+/**
+ * Aho-Corasick Multi-Pattern Matcher
+ *
+ * Compiles a list of literal patterns into a single automaton so that every
+ * occurrence of every pattern can be found in one linear pass over the text.
+ */
+
+const ROOT = 0;
+
+/**
+ * Compiled literal-pattern automaton
+ */
+export class AhoCorasick {
+    /**
+     * @param {string[]} patterns - Literal patterns (matched case-sensitively)
+     */
+    constructor(patterns) {
+        this.patterns = [...patterns];
+        this._goto = [new Map()];
+        this._fail = [ROOT];
+        this._output = [[]];
+
+        this.patterns.forEach((pattern, id) => this._insert(pattern, id));
+        this._link();
+    }
+
+    /**
+     * Add a pattern to the trie
+     */
+    _insert(pattern, id) {
+        let node = ROOT;
+
+        for (let i = 0; i < pattern.length; i++) {
+            const code = pattern.charCodeAt(i);
+            let next = this._goto[node].get(code);
+
+            if (next === undefined) {
+                next = this._goto.length;
+                this._goto.push(new Map());
+                this._fail.push(ROOT);
+                this._output.push([]);
+                this._goto[node].set(code, next);
+            }
+            node = next;
+        }
+
+        this._output[node].push(id);
+    }
+
+    /**
+     * Compute failure links breadth-first and merge suffix outputs
+     */
+    _link() {
+        const queue = [...this._goto[ROOT].values()];
+
+        for (let head = 0; head < queue.length; head++) {
+            const node = queue[head];
+
+            for (const [code, child] of this._goto[node]) {
+                let fallback = this._fail[node];
+                while (fallback !== ROOT && !this._goto[fallback].has(code)) {
+                    fallback = this._fail[fallback];
+                }
+
+                const target = this._goto[fallback].get(code);
+                this._fail[child] = target !== undefined && target !== child ? target : ROOT;
+
+                const inherited = this._output[this._fail[child]];
+                if (inherited.length > 0) {
+                    this._output[child] = this._output[child].concat(inherited);
+                }
+
+                queue.push(child);
+            }
+        }
+    }
+
+    /**
+     * Scan text once and flag every pattern that occurs in it
+     * @param {string} text - Text to scan
+     * @returns {Uint8Array} hits[id] === 1 when patterns[id] occurs in text
+     */
+    search(text) {
+        const hits = new Uint8Array(this.patterns.length);
+        const goto = this._goto;
+        const fail = this._fail;
+        const output = this._output;
+        let node = ROOT;
+
+        for (let i = 0; i < text.length; i++) {
+            const code = text.charCodeAt(i);
+
+            let next = goto[node].get(code);
+            while (next === undefined && node !== ROOT) {
+                node = fail[node];
+                next = goto[node].get(code);
+            }
+            node = next === undefined ? ROOT : next;
+
+            const matched = output[node];
+            for (let j = 0; j < matched.length; j++) {
+                hits[matched[j]] = 1;
+            }
+        }
+
+        return hits;
+    }
+
+    /**
+     * Scan text once and report every occurrence with its position
+     * @param {string} text - Text to scan
+     * @returns {Array<{id: number, start: number, end: number}>} Occurrences in end order
+     */
+    findAll(text) {
+        const found = [];
+        const goto = this._goto;
+        const fail = this._fail;
+        const output = this._output;
+        let node = ROOT;
+
+        for (let i = 0; i < text.length; i++) {
+            const code = text.charCodeAt(i);
+
+            let next = goto[node].get(code);
+            while (next === undefined && node !== ROOT) {
+                node = fail[node];
+                next = goto[node].get(code);
+            }
+            node = next === undefined ? ROOT : next;
+
+            const matched = output[node];
+            for (let j = 0; j < matched.length; j++) {
+                const id = matched[j];
+                found.push({ id, start: i + 1 - this.patterns[id].length, end: i + 1 });
+            }
+        }
+
+        return found;
+    }
+}
+
+export default AhoCorasick;
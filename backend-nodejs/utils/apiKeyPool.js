@@ -0,0 +1,193 @@
+/**
+ * API Key Pool
+ *
+ * Spreads upstream calls across several API keys, each with its own
+ * per-minute budget (a token bucket). Calls go to the usable key with the
+ * most budget left. A throttled key (HTTP 429) cools down for the server's
+ * Retry-After, or for an exponentially growing, fully jittered backoff
+ * when none is given. When every key is spent, callers wait for the next
+ * usable one up to their deadline, then are shed.
+ */
+
+import { QueueRejectedError } from './concurrencyLimiter.js';
+import { TokenBucket } from './tokenBucket.js';
+
+/**
+ * Bucket capacity in seconds of budget, so a minute's quota is not spent
+ * in one burst
+ */
+const BURST_SECONDS = 6;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Key label safe for logs and metrics
+ */
+export const maskKey = (key) => `...${key.slice(-4)}`;
+
+/**
+ * Quota-aware scheduler over a set of API keys
+ */
+export class ApiKeyPool {
+    /**
+     * @param {Array<{key: string, rpm: number}>} keys - Keys and their requests per minute (0 = no local budget)
+     * @param {Object} options
+     * @param {number} options.backoffBaseMs - Cool-down after a first throttle without Retry-After
+     * @param {number} options.backoffMaxMs - Backoff ceiling
+     * @param {Function} options.random - Jitter source, injectable for tests
+     * @param {Function} options.now - Clock, injectable for tests
+     */
+    constructor(keys, {
+        backoffBaseMs = 500,
+        backoffMaxMs = 30000,
+        random = Math.random,
+        now = Date.now,
+    } = {}) {
+        this.backoffBaseMs = backoffBaseMs;
+        this.backoffMaxMs = backoffMaxMs;
+        this._random = random;
+        this._now = now;
+        this._sequence = 0;
+
+        this._entries = keys.map(({ key, rpm = 0 }, i) => ({
+            key,
+            label: `${i + 1}:${maskKey(key)}`,
+            rpm,
+            bucket: rpm > 0
+                ? new TokenBucket({ ratePerSec: rpm / 60, burst: Math.max(1, Math.ceil((rpm / 60) * BURST_SECONDS)), now })
+                : null,
+            coolUntil: 0,
+            strikes: 0,
+            lastUsed: 0,
+            requests: 0,
+            throttled: 0,
+            unavailable: 0,
+        }));
+
+        this.waits = 0;
+        this.exhausted = 0;
+    }
+
+    /**
+     * Number of keys
+     */
+    get size() {
+        return this._entries.length;
+    }
+
+    /**
+     * Milliseconds until a key may be used again
+     */
+    _readyIn(entry, now) {
+        const cooling = Math.max(0, entry.coolUntil - now);
+        return Math.max(cooling, entry.bucket ? entry.bucket.msUntil(1) : 0);
+    }
+
+    /**
+     * Usable key with the largest share of its budget left; least
+     * recently used on ties, so unbudgeted keys rotate round-robin
+     */
+    _pick(now) {
+        let best = null;
+        let bestShare = -1;
+
+        for (const entry of this._entries) {
+            if (this._readyIn(entry, now) > 0) continue;
+
+            const share = entry.bucket ? entry.bucket.available / entry.bucket.burst : 1;
+            if (share > bestShare || (share === bestShare && entry.lastUsed < best.lastUsed)) {
+                best = entry;
+                bestShare = share;
+            }
+        }
+        return best;
+    }
+
+    /**
+     * Take a key for one call, waiting for one to become usable
+     * @param {number} deadline - Epoch ms after which waiting is pointless
+     * @returns {Promise<Object>} Key entry ({ key, label }), handed back to the record* methods
+     * @throws {QueueRejectedError} 'quota_exhausted' if no key frees up before the deadline
+     */
+    async acquire(deadline = Infinity) {
+        for (;;) {
+            const now = this._now();
+            const entry = this._pick(now);
+            if (entry) {
+                entry.bucket?.tryTake(1);
+                entry.lastUsed = ++this._sequence;
+                entry.requests++;
+                return entry;
+            }
+
+            const wait = Math.min(...this._entries.map((candidate) => this._readyIn(candidate, now)));
+            if (this._entries.length === 0 || now + wait > deadline) {
+                this.exhausted++;
+                throw new QueueRejectedError('quota_exhausted');
+            }
+
+            this.waits++;
+            await sleep(wait);
+        }
+    }
+
+    /**
+     * The key's call went through; its backoff starts over
+     */
+    recordSuccess(entry) {
+        entry.strikes = 0;
+    }
+
+    /**
+     * The key was throttled (429): cool it down for retryAfterMs, or for a
+     * jittered exponential backoff when the server gave no hint
+     * @returns {number} Cool-down in milliseconds
+     */
+    recordThrottle(entry, retryAfterMs = null) {
+        entry.throttled++;
+        entry.strikes++;
+
+        const delay = retryAfterMs ?? this.backoffDelay(entry.strikes);
+        entry.coolUntil = Math.max(entry.coolUntil, this._now() + delay);
+        return delay;
+    }
+
+    /**
+     * The upstream was unavailable (503) on this key's call
+     */
+    recordUnavailable(entry) {
+        entry.unavailable++;
+    }
+
+    /**
+     * Full-jitter exponential backoff for the given attempt (1-based)
+     */
+    backoffDelay(attempt) {
+        const ceiling = Math.min(this.backoffMaxMs, this.backoffBaseMs * 2 ** (attempt - 1));
+        return Math.round(this._random() * ceiling);
+    }
+
+    /**
+     * Pool-wide and per-key counters (keys are masked)
+     */
+    stats() {
+        const now = this._now();
+        return {
+            keys: this._entries.length,
+            usable: this._entries.filter((entry) => this._readyIn(entry, now) === 0).length,
+            waits: this.waits,
+            exhausted: this.exhausted,
+            per_key: this._entries.map((entry) => ({
+                key: entry.label,
+                rpm: entry.rpm,
+                requests: entry.requests,
+                throttled: entry.throttled,
+                unavailable: entry.unavailable,
+                tokens: entry.bucket ? Math.floor(entry.bucket.available) : null,
+                cooldown_ms: Math.max(0, entry.coolUntil - now),
+            })),
+        };
+    }
+}
+
+export default ApiKeyPool;
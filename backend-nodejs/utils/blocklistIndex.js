@@ -0,0 +1,307 @@
+/**
+ * Compact Blocklist Index
+ *
+ * Threat-intel feeds of domains/URLs compiled offline into a sorted table of
+ * 64-bit hashes. The whole index is a single Buffer (read once, off the V8
+ * heap) queried with binary search, so millions of entries load instantly
+ * and each lookup is a handful of array reads.
+ *
+ * File layout (little-endian):
+ *   0   4 bytes  magic "PGBL"
+ *   4   u32      format version
+ *   8   u32      entry count
+ *   12  u32      reserved
+ *   16  count * (u32 hi, u32 lo) sorted ascending by (hi, lo)
+ */
+
+import fs from 'fs';
+import os from 'os';
+import { normalizeDomain } from './domainSuffixIndex.js';
+
+const MAGIC = 'PGBL';
+const FORMAT_VERSION = 1;
+const HEADER_BYTES = 16;
+
+/**
+ * Final avalanche step of MurmurHash3
+ */
+const fmix32 = (value) => {
+    let h = value;
+    h ^= h >>> 16;
+    h = Math.imul(h, 0x85ebca6b);
+    h ^= h >>> 13;
+    h = Math.imul(h, 0xc2b2ae35);
+    h ^= h >>> 16;
+    return h >>> 0;
+};
+
+/**
+ * Two independent 32-bit hashes of a key, used together as a 64-bit hash
+ * @returns {[number, number]} [hi, lo]
+ */
+export const hashKey = (key) => {
+    let h1 = 0x811c9dc5;
+    let h2 = 0x9747b28c ^ key.length;
+
+    for (let i = 0; i < key.length; i++) {
+        const code = key.charCodeAt(i);
+        h1 = Math.imul(h1 ^ code, 0x01000193);
+        h2 = Math.imul(h2 ^ code, 0x5bd1e995);
+        h2 ^= h2 >>> 15;
+    }
+
+    return [fmix32(h1), fmix32(h2)];
+};
+
+/**
+ * Normalize a feed entry (domain or URL) into its lookup key.
+ *
+ * Domains become bare lowercase hostnames; URLs drop the scheme, fragment
+ * and trailing slash so "http://Evil.com/login/" and "evil.com/login" agree.
+ */
+export const normalizeBlocklistKey = (entry) => {
+    let key = String(entry).trim();
+    if (!key) return '';
+
+    key = key.replace(/^[a-z][a-z0-9+.-]*:\/\//i, '');
+
+    const hash = key.indexOf('#');
+    if (hash !== -1) {
+        key = key.slice(0, hash);
+    }
+
+    const slash = key.search(/[/?]/);
+    if (slash === -1) {
+        return normalizeDomain(key);
+    }
+
+    const host = normalizeDomain(key.slice(0, slash));
+    const rest = key.slice(slash).replace(/\/+$/, '');
+    return rest ? `${host}${rest}` : host;
+};
+
+/**
+ * Split one CSV record into fields (RFC 4180 quoting: commas inside
+ * double quotes are kept and "" is an escaped quote). Records spanning
+ * several lines are not supported; feeds are read line by line.
+ */
+export const splitCsvLine = (line) => {
+    const fields = [];
+    let field = '';
+    let quoted = false;
+
+    for (let i = 0; i < line.length; i++) {
+        const char = line[i];
+        if (quoted) {
+            if (char !== '"') {
+                field += char;
+            } else if (line[i + 1] === '"') {
+                field += '"';
+                i++;
+            } else {
+                quoted = false;
+            }
+        } else if (char === '"') {
+            quoted = true;
+        } else if (char === ',') {
+            fields.push(field);
+            field = '';
+        } else {
+            field += char;
+        }
+    }
+
+    fields.push(field);
+    return fields;
+};
+
+/**
+ * Extract the domain/URL from one feed line.
+ *
+ * Supports plain lists, hosts files ("0.0.0.0 evil.com") and CSV feeds
+ * (column selected by index). Returns '' for blanks, comments and fields
+ * that cannot be a domain or URL (such as CSV headers).
+ */
+export const parseFeedLine = (line, { column = 0 } = {}) => {
+    const trimmed = line.trim();
+    if (!trimmed || trimmed.startsWith('#') || trimmed.startsWith('//')) {
+        return '';
+    }
+
+    let entry;
+    if (trimmed.includes(',')) {
+        entry = (splitCsvLine(trimmed)[column] || '').trim();
+    } else {
+        const fields = trimmed.split(/\s+/);
+        entry = fields[fields.length - 1];
+    }
+
+    return entry.includes('.') ? entry : '';
+};
+
+/**
+ * 64-bit index hash of a feed entry, or null if it has no usable key
+ * @param {string} entry - Domain or URL
+ * @returns {bigint|null}
+ */
+export const hashBlocklistEntry = (entry) => {
+    const key = normalizeBlocklistKey(entry);
+    if (!key) return null;
+
+    const [hi, lo] = hashKey(key);
+    return (BigInt(hi) << 32n) | BigInt(lo);
+};
+
+/**
+ * Compile entries into index bytes
+ * @param {Iterable<string>} entries - Domains or URLs
+ * @returns {Buffer}
+ */
+export const buildBlocklistBuffer = (entries) => {
+    const hashes = [];
+    for (const entry of entries) {
+        const hash = hashBlocklistEntry(entry);
+        if (hash !== null) {
+            hashes.push(hash);
+        }
+    }
+
+    return encodeBlocklistHashes(BigUint64Array.from(hashes));
+};
+
+/**
+ * Compile entry hashes into index bytes. Sorts hashes in place.
+ * @param {BigUint64Array} hashes - Hashes from hashBlocklistEntry
+ * @returns {Buffer}
+ */
+export const encodeBlocklistHashes = (hashes) => {
+    const sorted = hashes.sort();
+    let count = 0;
+    for (let i = 0; i < sorted.length; i++) {
+        if (i === 0 || sorted[i] !== sorted[i - 1]) {
+            sorted[count++] = sorted[i];
+        }
+    }
+
+    const buffer = Buffer.alloc(HEADER_BYTES + count * 8);
+    buffer.write(MAGIC, 0, 'ascii');
+    buffer.writeUInt32LE(FORMAT_VERSION, 4);
+    buffer.writeUInt32LE(count, 8);
+
+    for (let i = 0; i < count; i++) {
+        const offset = HEADER_BYTES + i * 8;
+        buffer.writeUInt32LE(Number(sorted[i] >> 32n), offset);
+        buffer.writeUInt32LE(Number(sorted[i] & 0xffffffffn), offset + 4);
+    }
+
+    return buffer;
+};
+
+/**
+ * Read-only view over a compiled blocklist
+ */
+export class BlocklistIndex {
+    /**
+     * @param {Buffer} buffer - Bytes produced by buildBlocklistBuffer
+     */
+    constructor(buffer) {
+        if (buffer.length < HEADER_BYTES || buffer.toString('ascii', 0, 4) !== MAGIC) {
+            throw new Error('Invalid blocklist index: bad magic header');
+        }
+
+        const version = buffer.readUInt32LE(4);
+        if (version !== FORMAT_VERSION) {
+            throw new Error(`Unsupported blocklist index version: ${version}`);
+        }
+
+        this.size = buffer.readUInt32LE(8);
+        if (buffer.length < HEADER_BYTES + this.size * 8) {
+            throw new Error('Invalid blocklist index: truncated table');
+        }
+
+        this._table = BlocklistIndex._tableView(buffer, this.size);
+    }
+
+    /**
+     * Zero-copy Uint32Array over the hash table when alignment and
+     * endianness allow it, otherwise a decoded copy
+     */
+    static _tableView(buffer, size) {
+        const byteOffset = buffer.byteOffset + HEADER_BYTES;
+
+        if (os.endianness() === 'LE' && byteOffset % 4 === 0) {
+            return new Uint32Array(buffer.buffer, byteOffset, size * 2);
+        }
+
+        const table = new Uint32Array(size * 2);
+        for (let i = 0; i < table.length; i++) {
+            table[i] = buffer.readUInt32LE(HEADER_BYTES + i * 4);
+        }
+        return table;
+    }
+
+    /**
+     * Load a compiled index file with a single read
+     */
+    static load(filePath) {
+        return new BlocklistIndex(fs.readFileSync(filePath));
+    }
+
+    /**
+     * Check an already-normalized key
+     */
+    _hasKey(key) {
+        const [hi, lo] = hashKey(key);
+        const table = this._table;
+        let low = 0;
+        let high = this.size - 1;
+
+        while (low <= high) {
+            const mid = (low + high) >>> 1;
+            const midHi = table[mid * 2];
+            const midLo = table[mid * 2 + 1];
+
+            if (midHi < hi || (midHi === hi && midLo < lo)) {
+                low = mid + 1;
+            } else if (midHi > hi || midLo > lo) {
+                high = mid - 1;
+            } else {
+                return true;
+            }
+        }
+
+        return false;
+    }
+
+    /**
+     * Check a domain or URL exactly as listed in the feed
+     */
+    has(entry) {
+        const key = normalizeBlocklistKey(entry);
+        return key !== '' && this._hasKey(key);
+    }
+
+    /**
+     * Check whether a host or any of its parent domains is listed
+     */
+    hasHost(host) {
+        const name = normalizeDomain(host);
+        let dot = name.lastIndexOf('.');
+
+        if (dot === -1) {
+            return name !== '' && this._hasKey(name);
+        }
+
+        // Walk parent domains from "example.tk" up to the full host; bare TLDs are skipped
+        while (dot > 0) {
+            dot = name.lastIndexOf('.', dot - 1);
+            if (this._hasKey(dot === -1 ? name : name.slice(dot + 1))) {
+                return true;
+            }
+        }
+
+        return false;
+    }
+}
+
+export default BlocklistIndex;
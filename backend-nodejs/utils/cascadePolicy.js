@@ -0,0 +1,135 @@
+/**
+ * Heuristic-Gated AI Cascade
+ *
+ * Decides per message whether the AI tier is worth calling. Messages the
+ * heuristics already score as clearly malicious or clearly benign are
+ * answered locally; only the ambiguous middle band goes upstream.
+ */
+
+import { calculateRiskLevel, combineScores } from './riskScorer.js';
+
+/**
+ * Cascade branches (also used as the ai_skipped reason)
+ */
+export const CascadeBranch = {
+    HEURISTIC_HIGH: 'heuristic_high',
+    HEURISTIC_LOW: 'heuristic_low',
+    AMBIGUOUS: 'ambiguous',
+};
+
+/**
+ * Score-band routing policy with per-branch counters
+ */
+export class CascadePolicy {
+    /**
+     * @param {Object} options
+     * @param {boolean} options.enabled - When false every message goes to AI
+     * @param {number} options.highScore - Heuristic score at or above which AI is skipped
+     * @param {number} options.lowScore - Heuristic score at or below which AI is skipped
+     */
+    constructor({ enabled = false, highScore = 85, lowScore = 0 } = {}) {
+        this.enabled = enabled;
+        this.highScore = highScore;
+        this.lowScore = lowScore;
+        this.counts = {
+            [CascadeBranch.HEURISTIC_HIGH]: 0,
+            [CascadeBranch.HEURISTIC_LOW]: 0,
+            [CascadeBranch.AMBIGUOUS]: 0,
+        };
+    }
+
+    /**
+     * Branch for a heuristic score, without touching the counters
+     */
+    classify(heuristicScore) {
+        if (!this.enabled) return CascadeBranch.AMBIGUOUS;
+        if (heuristicScore >= this.highScore) return CascadeBranch.HEURISTIC_HIGH;
+        if (heuristicScore <= this.lowScore) return CascadeBranch.HEURISTIC_LOW;
+        return CascadeBranch.AMBIGUOUS;
+    }
+
+    /**
+     * Route one message and count the decision
+     * @returns {string} CascadeBranch value; only AMBIGUOUS should call AI
+     */
+    route(heuristicScore) {
+        const branch = this.classify(heuristicScore);
+        this.counts[branch]++;
+        return branch;
+    }
+
+    /**
+     * Counter snapshot
+     */
+    stats() {
+        const total = Object.values(this.counts).reduce((sum, count) => sum + count, 0);
+        const avoided = total - this.counts[CascadeBranch.AMBIGUOUS];
+        return {
+            enabled: this.enabled,
+            high_score: this.highScore,
+            low_score: this.lowScore,
+            branches: { ...this.counts },
+            ai_calls_avoided: avoided,
+            avoided_ratio: total > 0 ? Math.round((avoided / total) * 1000) / 1000 : 0,
+        };
+    }
+}
+
+/**
+ * Offline evaluation: compare verdicts with AI on every message against
+ * verdicts under the cascade policy. Routing uses the pre-AI score
+ * (heuristics blended with the local model, when present) as live
+ * requests do.
+ * @param {Array<{heuristicScore: number, localResult: Object|null, aiResult: Object|null}>} samples
+ * @param {CascadePolicy} policy - Policy under evaluation (counters are not touched)
+ * @returns {Object} Report of AI calls avoided and verdict changes
+ */
+export const evaluateCascade = (samples, policy) => {
+    const branches = {
+        [CascadeBranch.HEURISTIC_HIGH]: 0,
+        [CascadeBranch.HEURISTIC_LOW]: 0,
+        [CascadeBranch.AMBIGUOUS]: 0,
+    };
+    const transitions = {};
+    let levelChanges = 0;
+    let totalDelta = 0;
+    let maxDelta = 0;
+
+    for (const { heuristicScore, localResult = null, aiResult } of samples) {
+        const preAiScore = combineScores(null, heuristicScore, localResult);
+        const branch = policy.classify(preAiScore);
+        branches[branch]++;
+
+        const fullScore = combineScores(aiResult, heuristicScore, localResult);
+        const cascadeScore = branch === CascadeBranch.AMBIGUOUS ? fullScore : preAiScore;
+        const delta = Math.abs(cascadeScore - fullScore);
+        totalDelta += delta;
+        maxDelta = Math.max(maxDelta, delta);
+
+        const fullLevel = calculateRiskLevel(fullScore);
+        const cascadeLevel = calculateRiskLevel(cascadeScore);
+        if (fullLevel !== cascadeLevel) {
+            levelChanges++;
+            const key = `${fullLevel}->${cascadeLevel}`;
+            transitions[key] = (transitions[key] || 0) + 1;
+        }
+    }
+
+    const total = samples.length;
+    const avoided = total - branches[CascadeBranch.AMBIGUOUS];
+    const ratio = (value) => (total > 0 ? Math.round((value / total) * 1000) / 1000 : 0);
+
+    return {
+        messages: total,
+        branches,
+        ai_calls_avoided: avoided,
+        avoided_ratio: ratio(avoided),
+        risk_level_changes: levelChanges,
+        changed_ratio: ratio(levelChanges),
+        transitions,
+        mean_score_delta: total > 0 ? Math.round((totalDelta / total) * 100) / 100 : 0,
+        max_score_delta: Math.round(maxDelta * 100) / 100,
+    };
+};
+
+export default CascadePolicy;
@@ -0,0 +1,201 @@
+/**
+ * Circuit Breaker
+ *
+ * Tracks the outcome of recent upstream calls and stops sending traffic
+ * when too many fail or run slow. While open, callers are refused
+ * immediately so they can fall back without waiting on a timeout. After a
+ * cool-down a limited number of probe calls decide whether to close again.
+ *
+ *   closed --(error/slow rate over threshold)--> open
+ *   open --(cool-down elapsed)--> half_open
+ *   half_open --(probe succeeds)--> closed
+ *   half_open --(probe fails)--> open
+ */
+
+export const CircuitState = {
+    CLOSED: 'closed',
+    OPEN: 'open',
+    HALF_OPEN: 'half_open',
+};
+
+/**
+ * Outcome codes stored in the rolling window
+ */
+const OK = 0;
+const SLOW = 1;
+const FAILED = 2;
+
+/**
+ * Error/latency based circuit breaker
+ */
+export class CircuitBreaker {
+    /**
+     * @param {Object} options
+     * @param {number} options.windowSize - Number of recent calls considered
+     * @param {number} options.minRequests - Calls needed before the rates are trusted
+     * @param {number} options.errorThreshold - Failure ratio (0..1) that opens the circuit
+     * @param {number} options.slowCallMs - Calls slower than this count as slow
+     * @param {number} options.slowThreshold - Slow-call ratio (0..1) that opens the circuit
+     * @param {number} options.openMs - Cool-down before probing again
+     * @param {number} options.halfOpenProbes - Concurrent probe calls allowed when half-open
+     * @param {Function} options.now - Clock, injectable for tests
+     */
+    constructor({
+        windowSize = 50,
+        minRequests = 10,
+        errorThreshold = 0.5,
+        slowCallMs = Infinity,
+        slowThreshold = 0.8,
+        openMs = 30000,
+        halfOpenProbes = 1,
+        now = Date.now,
+    } = {}) {
+        this.minRequests = minRequests;
+        this.errorThreshold = errorThreshold;
+        this.slowCallMs = slowCallMs;
+        this.slowThreshold = slowThreshold;
+        this.openMs = openMs;
+        this.halfOpenProbes = halfOpenProbes;
+        this._now = now;
+
+        this._outcomes = new Uint8Array(windowSize);
+        this._next = 0;
+        this._count = 0;
+        this._failures = 0;
+        this._slow = 0;
+
+        this.state = CircuitState.CLOSED;
+        this._openedAt = 0;
+        this._probes = 0;
+
+        this.opened = 0;
+        this.rejected = 0;
+    }
+
+    /**
+     * Whether a call may proceed now. Every permitted call must be
+     * followed by recordSuccess, recordFailure or recordSkipped.
+     */
+    allowRequest() {
+        if (this.state === CircuitState.OPEN) {
+            if (this._now() - this._openedAt < this.openMs) {
+                this.rejected++;
+                return false;
+            }
+            this.state = CircuitState.HALF_OPEN;
+            this._probes = 0;
+        }
+
+        if (this.state === CircuitState.HALF_OPEN) {
+            if (this._probes >= this.halfOpenProbes) {
+                this.rejected++;
+                return false;
+            }
+            this._probes++;
+        }
+
+        return true;
+    }
+
+    /**
+     * Record a successful call and its latency
+     */
+    recordSuccess(latencyMs = 0) {
+        if (this.state === CircuitState.HALF_OPEN) {
+            this._close();
+            return;
+        }
+        this._push(latencyMs > this.slowCallMs ? SLOW : OK);
+    }
+
+    /**
+     * Record a failed call (error or timeout)
+     */
+    recordFailure() {
+        if (this.state === CircuitState.HALF_OPEN) {
+            this._open();
+            return;
+        }
+        this._push(FAILED);
+    }
+
+    /**
+     * A permitted call never reached the upstream (e.g., shed locally):
+     * free its probe slot without recording an outcome
+     */
+    recordSkipped() {
+        if (this.state === CircuitState.HALF_OPEN && this._probes > 0) {
+            this._probes--;
+        }
+    }
+
+    /**
+     * Failure ratio over the window
+     */
+    get errorRate() {
+        return this._count > 0 ? this._failures / this._count : 0;
+    }
+
+    /**
+     * Slow-call ratio over the window
+     */
+    get slowRate() {
+        return this._count > 0 ? this._slow / this._count : 0;
+    }
+
+    /**
+     * Add an outcome to the ring buffer and trip when thresholds are crossed
+     */
+    _push(outcome) {
+        const size = this._outcomes.length;
+
+        if (this._count === size) {
+            const evicted = this._outcomes[this._next];
+            if (evicted === FAILED) this._failures--;
+            if (evicted === SLOW) this._slow--;
+        } else {
+            this._count++;
+        }
+
+        this._outcomes[this._next] = outcome;
+        this._next = (this._next + 1) % size;
+        if (outcome === FAILED) this._failures++;
+        if (outcome === SLOW) this._slow++;
+
+        if (this.state === CircuitState.CLOSED && this._count >= this.minRequests &&
+            (this.errorRate >= this.errorThreshold || this.slowRate >= this.slowThreshold)) {
+            this._open();
+        }
+    }
+
+    _open() {
+        this.state = CircuitState.OPEN;
+        this._openedAt = this._now();
+        this.opened++;
+    }
+
+    _close() {
+        this.state = CircuitState.CLOSED;
+        this._outcomes.fill(OK);
+        this._next = 0;
+        this._count = 0;
+        this._failures = 0;
+        this._slow = 0;
+    }
+
+    /**
+     * Counter snapshot
+     */
+    stats() {
+        return {
+            state: this.state,
+            error_rate: Math.round(this.errorRate * 1000) / 1000,
+            slow_rate: Math.round(this.slowRate * 1000) / 1000,
+            window_calls: this._count,
+            opened: this.opened,
+            rejected: this.rejected,
+        };
+    }
+}
+
+export default CircuitBreaker;
@@ -0,0 +1,134 @@
+/**
+ * Concurrency Limiter
+ *
+ * Caps how many calls run at once and holds the overflow in a bounded
+ * FIFO queue. A call that cannot be queued, or waits longer than its
+ * queue deadline, is rejected right away so the caller can degrade
+ * instead of piling more work onto a saturated upstream.
+ */
+
+import { LatencyWindow } from './latencyWindow.js';
+
+/**
+ * Raised when a call is shed instead of run
+ */
+export class QueueRejectedError extends Error {
+    /**
+     * @param {string} reason - 'queue_full', 'queue_timeout' or 'quota_exhausted'
+     */
+    constructor(reason) {
+        super(`Request shed: ${reason.replace('_', ' ')}`);
+        this.reason = reason;
+        Error.captureStackTrace(this, this.constructor);
+    }
+}
+
+/**
+ * Bounded-concurrency scheduler with a bounded wait queue
+ */
+export class ConcurrencyLimiter {
+    /**
+     * @param {Object} options
+     * @param {number} options.maxConcurrent - Calls allowed to run at once
+     * @param {number} options.maxQueue - Calls allowed to wait for a slot
+     * @param {number} options.queueTimeoutMs - Max time a call may wait (0 = no deadline)
+     * @param {Function} options.now - Clock, injectable for tests
+     */
+    constructor({ maxConcurrent = 8, maxQueue = 100, queueTimeoutMs = 0, now = Date.now } = {}) {
+        this.maxConcurrent = maxConcurrent;
+        this.maxQueue = maxQueue;
+        this.queueTimeoutMs = queueTimeoutMs;
+        this._now = now;
+        this._queue = [];
+        this._waits = new LatencyWindow(500);
+
+        this.active = 0;
+        this.completed = 0;
+        this.shed = 0;
+        this.timedOut = 0;
+    }
+
+    /**
+     * Calls currently waiting for a slot
+     */
+    get queued() {
+        return this._queue.length;
+    }
+
+    /**
+     * Run fn when a slot is free
+     * @param {Function} fn - Async function to run
+     * @returns {Promise<*>} fn's result, or a QueueRejectedError rejection
+     */
+    run(fn) {
+        if (this.active < this.maxConcurrent) {
+            return this._start(fn, 0);
+        }
+
+        if (this._queue.length >= this.maxQueue) {
+            this.shed++;
+            return Promise.reject(new QueueRejectedError('queue_full'));
+        }
+
+        return new Promise((resolve, reject) => {
+            const waiter = { fn, resolve, reject, enqueuedAt: this._now(), timer: null };
+
+            if (this.queueTimeoutMs > 0) {
+                waiter.timer = setTimeout(() => {
+                    this._queue.splice(this._queue.indexOf(waiter), 1);
+                    this.timedOut++;
+                    reject(new QueueRejectedError('queue_timeout'));
+                }, this.queueTimeoutMs);
+            }
+
+            this._queue.push(waiter);
+        });
+    }
+
+    /**
+     * Occupy a slot for fn and hand the slot on when it settles
+     */
+    _start(fn, waitedMs) {
+        this.active++;
+        this._waits.record(waitedMs);
+
+        return Promise.resolve()
+            .then(fn)
+            .finally(() => {
+                this.active--;
+                this.completed++;
+                this._drain();
+            });
+    }
+
+    /**
+     * Start queued calls while slots are free
+     */
+    _drain() {
+        while (this.active < this.maxConcurrent && this._queue.length > 0) {
+            const waiter = this._queue.shift();
+            clearTimeout(waiter.timer);
+            this._start(waiter.fn, this._now() - waiter.enqueuedAt).then(waiter.resolve, waiter.reject);
+        }
+    }
+
+    /**
+     * Counter snapshot
+     */
+    stats() {
+        const round = (ms) => (Number.isNaN(ms) ? null : Math.round(ms));
+        return {
+            active: this.active,
+            queued: this._queue.length,
+            max_concurrent: this.maxConcurrent,
+            max_queue: this.maxQueue,
+            completed: this.completed,
+            shed: this.shed,
+            timed_out: this.timedOut,
+            wait_p50_ms: round(this._waits.percentile(0.5)),
+            wait_p99_ms: round(this._waits.percentile(0.99)),
+        };
+    }
+}
+
+export default ConcurrencyLimiter;
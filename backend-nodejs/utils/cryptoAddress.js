@@ -0,0 +1,353 @@
+/**
+ * Cryptocurrency Address Detection
+ *
+ * A single pass splits text into alphanumeric runs; only runs shaped like
+ * an address are decoded and accepted when their checksum verifies
+ * (Base58Check, bech32/bech32m or EIP-55). Random base58-looking strings
+ * therefore no longer count as wallet addresses.
+ */
+
+import { createHash } from 'crypto';
+import { keccak256 } from './keccak.js';
+
+const BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz';
+const BECH32_ALPHABET = 'qpzry9x8gf2tvdw0s3jn54khce6mua7l';
+
+const BECH32_CONST = 1;
+const BECH32M_CONST = 0x2bc830a3;
+
+const MIN_ADDRESS_LENGTH = 26;
+const MAX_ADDRESS_LENGTH = 90;
+
+/**
+ * Wallet wording that must appear near an unchecksummed (SOL) address
+ */
+const SOLANA_CONTEXT = /\b(?:sol|solana|phantom|wallet|deposit|send\s+(?:\w+\s+)?to|transfer\s+(?:\w+\s+)?to)\b/i;
+const SOLANA_CONTEXT_CHARS = 80;
+
+/**
+ * Marks of a URL in the whitespace-delimited word around a token
+ */
+const URL_MARKERS = /:\/\/|^www\.|[/?=&#]/i;
+
+/**
+ * Character -> digit lookup tables (-1 = not in alphabet)
+ */
+const buildLookup = (alphabet) => {
+    const table = new Int8Array(128).fill(-1);
+    for (let i = 0; i < alphabet.length; i++) {
+        table[alphabet.charCodeAt(i)] = i;
+    }
+    return table;
+};
+
+const BASE58_LOOKUP = buildLookup(BASE58_ALPHABET);
+const BECH32_LOOKUP = buildLookup(BECH32_ALPHABET);
+
+/**
+ * Base58Check version byte -> address type
+ */
+const BASE58_VERSIONS = new Map([
+    [0x00, 'BTC'], // P2PKH (1...)
+    [0x05, 'BTC'], // P2SH (3...), also used by legacy Litecoin P2SH
+    [0x30, 'LTC'], // P2PKH (L...)
+    [0x32, 'LTC'], // P2SH (M...)
+    [0x41, 'TRON'], // T...
+]);
+
+/**
+ * Leading characters produced by the versions above; anything else skips hashing
+ */
+const BASE58_LEADING_CHARS = new Set(['1', '3', 'L', 'M', 'T']);
+
+/**
+ * Bech32 human-readable part -> address type
+ */
+const BECH32_PREFIXES = new Map([
+    ['bc', 'BTC'],
+    ['ltc', 'LTC'],
+]);
+
+const isAlphanumeric = (code) =>
+    (code >= 0x30 && code <= 0x39) || (code >= 0x41 && code <= 0x5a) || (code >= 0x61 && code <= 0x7a);
+
+const sha256 = (data) => createHash('sha256').update(data).digest();
+
+/**
+ * Decode a base58 string into bytes; null when a character is outside the alphabet
+ */
+export const decodeBase58 = (input) => {
+    const bytes = [];
+
+    for (let i = 0; i < input.length; i++) {
+        const code = input.charCodeAt(i);
+        let carry = code < 128 ? BASE58_LOOKUP[code] : -1;
+        if (carry === -1) {
+            return null;
+        }
+        for (let j = 0; j < bytes.length; j++) {
+            carry += bytes[j] * 58;
+            bytes[j] = carry & 0xff;
+            carry >>= 8;
+        }
+        while (carry > 0) {
+            bytes.push(carry & 0xff);
+            carry >>= 8;
+        }
+    }
+
+    // Each leading '1' encodes a leading zero byte
+    for (let i = 0; i < input.length && input[i] === '1'; i++) {
+        bytes.push(0);
+    }
+
+    return Uint8Array.from(bytes.reverse());
+};
+
+/**
+ * Decode and verify a Base58Check string
+ * @returns {Uint8Array|null} Payload (version byte included) without the checksum
+ */
+export const decodeBase58Check = (input) => {
+    const bytes = decodeBase58(input);
+    if (!bytes || bytes.length < 5) {
+        return null;
+    }
+
+    const payload = bytes.subarray(0, bytes.length - 4);
+    const checksum = sha256(sha256(payload));
+    for (let i = 0; i < 4; i++) {
+        if (checksum[i] !== bytes[payload.length + i]) {
+            return null;
+        }
+    }
+    return payload;
+};
+
+/**
+ * BIP-173 checksum polymod
+ */
+const bech32Polymod = (values) => {
+    const generators = [0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3];
+    let checksum = 1;
+
+    for (const value of values) {
+        const top = checksum >>> 25;
+        checksum = ((checksum & 0x1ffffff) << 5) ^ value;
+        for (let i = 0; i < 5; i++) {
+            if ((top >>> i) & 1) {
+                checksum ^= generators[i];
+            }
+        }
+    }
+
+    return checksum >>> 0;
+};
+
+/**
+ * Decode a bech32 or bech32m string
+ * @returns {{prefix: string, data: number[], encoding: number}|null}
+ */
+export const decodeBech32 = (input) => {
+    // Mixed case is invalid by specification
+    if (input !== input.toLowerCase() && input !== input.toUpperCase()) {
+        return null;
+    }
+
+    const lower = input.toLowerCase();
+    const separator = lower.lastIndexOf('1');
+    if (separator < 1 || separator + 7 > lower.length || lower.length > MAX_ADDRESS_LENGTH) {
+        return null;
+    }
+
+    const prefix = lower.slice(0, separator);
+    const values = [];
+    for (let i = 0; i < prefix.length; i++) {
+        values.push(prefix.charCodeAt(i) >> 5);
+    }
+    values.push(0);
+    for (let i = 0; i < prefix.length; i++) {
+        values.push(prefix.charCodeAt(i) & 31);
+    }
+
+    const data = [];
+    for (let i = separator + 1; i < lower.length; i++) {
+        const value = BECH32_LOOKUP[lower.charCodeAt(i)];
+        if (value === undefined || value === -1) {
+            return null;
+        }
+        data.push(value);
+    }
+
+    const encoding = bech32Polymod(values.concat(data));
+    if (encoding !== BECH32_CONST && encoding !== BECH32M_CONST) {
+        return null;
+    }
+
+    return { prefix, data: data.slice(0, -6), encoding };
+};
+
+/**
+ * Validate a segwit address (BIP-173 / BIP-350) for a known prefix
+ * @returns {string|null} Address type
+ */
+const validateSegwit = (input) => {
+    const decoded = decodeBech32(input);
+    const type = decoded && BECH32_PREFIXES.get(decoded.prefix);
+    if (!type || decoded.data.length === 0) {
+        return null;
+    }
+
+    const [version, ...words] = decoded.data;
+    if (version > 16) {
+        return null;
+    }
+    if ((version === 0) !== (decoded.encoding === BECH32_CONST)) {
+        return null;
+    }
+
+    // Witness program length in bytes after 5-bit -> 8-bit regrouping
+    const programBits = words.length * 5;
+    const programLength = Math.floor(programBits / 8);
+    if (programBits % 8 >= 5 || programLength < 2 || programLength > 40) {
+        return null;
+    }
+    if (version === 0 && programLength !== 20 && programLength !== 32) {
+        return null;
+    }
+
+    return type;
+};
+
+/**
+ * Validate an EIP-55 address. All-lowercase and all-uppercase hex carry no
+ * checksum and are accepted as-is; mixed case must match the Keccak-256 mask.
+ */
+export const isValidEthereumAddress = (input) => {
+    if (!/^0x[0-9a-fA-F]{40}$/.test(input)) {
+        return false;
+    }
+
+    const hex = input.slice(2);
+    const lower = hex.toLowerCase();
+    if (hex === lower || hex === hex.toUpperCase()) {
+        return true;
+    }
+
+    const hash = keccak256(lower);
+    for (let i = 0; i < 40; i++) {
+        const nibble = (hash[i >> 1] >> (i % 2 === 0 ? 4 : 0)) & 0x0f;
+        const char = hex[i];
+        if (char >= 'a' && char <= 'f' && nibble >= 8) return false;
+        if (char >= 'A' && char <= 'F' && nibble < 8) return false;
+    }
+    return true;
+};
+
+/**
+ * Solana addresses are bare base58 public keys with no checksum, so the
+ * shape has to carry the weight: 32 decoded bytes and a mix of digits,
+ * upper- and lowercase letters as produced by encoding random key bytes.
+ */
+const isLikelySolanaAddress = (input) => {
+    if (input.length < 32 || input.length > 44) {
+        return false;
+    }
+    if (!/[0-9]/.test(input) || !/[A-Z]/.test(input) || !/[a-z]/.test(input)) {
+        return false;
+    }
+    const bytes = decodeBase58(input);
+    return bytes !== null && bytes.length === 32;
+};
+
+/**
+ * Whether the token at [start, end) sits inside a URL (path, query or
+ * fragment): session IDs and tracking tokens there look like SOL keys
+ */
+const isInsideUrl = (text, start, end) => {
+    let from = start;
+    let to = end;
+    while (from > 0 && !/\s/.test(text[from - 1])) from--;
+    while (to < text.length && !/\s/.test(text[to])) to++;
+    return URL_MARKERS.test(text.slice(from, to));
+};
+
+/**
+ * Whether wallet wording appears near the token at [start, end)
+ */
+const hasSolanaContext = (text, start, end) => SOLANA_CONTEXT.test(
+    text.slice(Math.max(0, start - SOLANA_CONTEXT_CHARS), Math.min(text.length, end + SOLANA_CONTEXT_CHARS))
+);
+
+/**
+ * Classify a single alphanumeric token. SOL is judged on shape alone;
+ * findCryptoAddresses additionally requires wallet context for it.
+ * @returns {string|null} Address type (BTC, ETH, LTC, SOL, TRON)
+ */
+export const classifyAddress = (token) => {
+    if (token.length < MIN_ADDRESS_LENGTH || token.length > MAX_ADDRESS_LENGTH) {
+        return null;
+    }
+
+    if (token[0] === '0' && (token[1] === 'x' || token[1] === 'X')) {
+        return token[1] === 'x' && isValidEthereumAddress(token) ? 'ETH' : null;
+    }
+
+    const lowerPrefix = token.slice(0, 4).toLowerCase();
+    if (lowerPrefix.startsWith('bc1') || lowerPrefix === 'ltc1') {
+        return validateSegwit(token);
+    }
+
+    if (token.length <= 35 && BASE58_LEADING_CHARS.has(token[0])) {
+        const payload = decodeBase58Check(token);
+        if (payload && payload.length === 21) {
+            const type = BASE58_VERSIONS.get(payload[0]);
+            if (type) {
+                return type;
+            }
+        }
+    }
+
+    return isLikelySolanaAddress(token) ? 'SOL' : null;
+};
+
+/**
+ * Find checksum-valid wallet addresses in text. SOL keys carry no
+ * checksum, so about 1 in 20 random 43-character tokens would pass; they
+ * are only reported next to wallet wording and never inside a URL.
+ * @param {string} text - Message text
+ * @returns {Array<{type: string, address: string}>} Unique addresses in order of appearance
+ */
+export const findCryptoAddresses = (text) => {
+    const found = [];
+    const seen = new Set();
+    const length = text.length;
+    let start = -1;
+
+    // i === length acts as a trailing delimiter so the final run is flushed
+    for (let i = 0; i <= length; i++) {
+        if (i < length && isAlphanumeric(text.charCodeAt(i))) {
+            if (start === -1) start = i;
+            continue;
+        }
+        if (start === -1) continue;
+
+        const runLength = i - start;
+        if (runLength >= MIN_ADDRESS_LENGTH && runLength <= MAX_ADDRESS_LENGTH) {
+            const token = text.slice(start, i);
+            let type = seen.has(token) ? null : classifyAddress(token);
+            if (type === 'SOL' && (isInsideUrl(text, start, i) || !hasSolanaContext(text, start, i))) {
+                type = null;
+            }
+            if (type) {
+                seen.add(token);
+                found.push({ type, address: token });
+            }
+        }
+        start = -1;
+    }
+
+    return found;
+};
+
+export default findCryptoAddresses;
@@ -0,0 +1,128 @@
+/**
+ * Domain Suffix Index
+ *
+ * Hash-of-suffixes lookup for domain lists. A host matches an entry when it
+ * equals the entry or is a subdomain of it, so TLD entries ('.tk'), exact
+ * domains ('bit.ly') and their subdomains are all resolved with one hash
+ * probe per host label, independent of the list size.
+ */
+
+/**
+ * Normalize a list entry or host: lowercase, no leading '*.' / '.', no trailing '.'
+ */
+export const normalizeDomain = (domain) => {
+    let normalized = String(domain).trim().toLowerCase();
+
+    if (normalized.startsWith('*.')) {
+        normalized = normalized.slice(2);
+    }
+    while (normalized.startsWith('.')) {
+        normalized = normalized.slice(1);
+    }
+    while (normalized.endsWith('.')) {
+        normalized = normalized.slice(0, -1);
+    }
+
+    return normalized;
+};
+
+/**
+ * Suffix index over a set of domains
+ */
+export class DomainSuffixIndex {
+    /**
+     * @param {Iterable<string>} domains - Domains or TLD suffixes to index
+     * @param {*} value - Value stored for each entry (e.g., a list category)
+     */
+    constructor(domains = [], value = true) {
+        this._entries = new Map();
+        for (const domain of domains) {
+            this.add(domain, value);
+        }
+    }
+
+    /**
+     * Number of indexed suffixes
+     */
+    get size() {
+        return this._entries.size;
+    }
+
+    /**
+     * Add a domain or suffix to the index
+     */
+    add(domain, value = true) {
+        const normalized = normalizeDomain(domain);
+        if (normalized) {
+            this._entries.set(normalized, value);
+        }
+        return this;
+    }
+
+    /**
+     * Find the most specific indexed suffix of a host
+     * @param {string} host - Hostname (lowercased hosts skip re-normalization)
+     * @returns {{suffix: string, value: *}|null}
+     */
+    match(host) {
+        let name = host;
+        if (name !== name.toLowerCase() || name.endsWith('.')) {
+            name = normalizeDomain(name);
+        }
+
+        let found = null;
+        let dot = name.length;
+
+        // Walk label boundaries from the TLD towards the full host
+        while (dot > 0) {
+            dot = name.lastIndexOf('.', dot - 1);
+            const suffix = dot === -1 ? name : name.slice(dot + 1);
+            const value = this._entries.get(suffix);
+            if (value !== undefined) {
+                found = { suffix, value };
+            }
+            if (dot === -1) break;
+        }
+
+        return found;
+    }
+
+    /**
+     * Check whether a host equals or is a subdomain of any indexed entry
+     */
+    has(host) {
+        return this.match(host) !== null;
+    }
+}
+
+/**
+ * Multi-label public suffixes under which names are registered one level
+ * down (example.co.uk). Any other host registers directly under its TLD.
+ */
+const PUBLIC_SUFFIXES = new DomainSuffixIndex([
+    'co.uk', 'org.uk', 'me.uk', 'ltd.uk', 'plc.uk', 'ac.uk', 'gov.uk', 'net.uk',
+    'com.au', 'net.au', 'org.au', 'edu.au', 'gov.au',
+    'co.nz', 'org.nz', 'net.nz', 'co.za', 'org.za', 'co.in', 'net.in', 'org.in', 'gov.in',
+    'co.jp', 'ne.jp', 'or.jp', 'ac.jp', 'co.kr', 'or.kr', 'co.id', 'co.il', 'co.th',
+    'com.br', 'net.br', 'org.br', 'com.mx', 'com.ar', 'com.co', 'com.pe', 'com.ve',
+    'com.cn', 'net.cn', 'org.cn', 'com.hk', 'com.tw', 'com.sg', 'com.my', 'com.ph',
+    'com.tr', 'com.ua', 'com.pl', 'com.sa', 'com.eg', 'com.ng', 'com.pk', 'com.vn',
+]);
+
+/**
+ * Registrable domain of a host: its public suffix plus one label
+ * ('maps.google.co.uk' -> 'google.co.uk'). Returns '' for bare suffixes.
+ */
+export const registrableDomain = (host) => {
+    const name = normalizeDomain(host);
+    const labels = name.split('.');
+    const suffix = PUBLIC_SUFFIXES.match(name);
+    const suffixLabels = suffix ? suffix.suffix.split('.').length : 1;
+
+    if (labels.length <= suffixLabels) {
+        return '';
+    }
+    return labels.slice(-suffixLabels - 1).join('.');
+};
+
+export default DomainSuffixIndex;
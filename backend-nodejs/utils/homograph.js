@@ -0,0 +1,141 @@
+/**
+ * Homograph / IDN Host Analysis
+ *
+ * Decodes punycode (xn--) labels and reduces each label to a Latin
+ * "skeleton" through a confusables table built once at module load. A
+ * single pass per label yields the skeleton and the set of scripts used,
+ * which is enough to spot mixed-script labels and whole-script look-alikes
+ * of protected brands.
+ */
+
+import { domainToUnicode } from 'url';
+
+/**
+ * Script bits
+ */
+export const Script = {
+    LATIN: 1,
+    GREEK: 2,
+    CYRILLIC: 4,
+    ARMENIAN: 8,
+    OTHER: 16,
+};
+
+const CONFUSABLE_SCRIPTS = Script.LATIN | Script.GREEK | Script.CYRILLIC | Script.ARMENIAN;
+
+/**
+ * Look-alike characters (lowercase; hosts are lowercased before analysis)
+ * mapped to their Latin skeleton, derived from Unicode confusables.txt
+ */
+const CONFUSABLE_PAIRS = [
+    // Cyrillic
+    ['а', 'a'], ['в', 'b'], ['е', 'e'], ['ё', 'e'], ['к', 'k'], ['м', 'm'], ['н', 'h'],
+    ['о', 'o'], ['р', 'p'], ['с', 'c'], ['т', 't'], ['у', 'y'], ['х', 'x'], ['ь', 'b'],
+    ['ѕ', 's'], ['і', 'i'], ['ї', 'i'], ['ј', 'j'], ['һ', 'h'], ['ԁ', 'd'], ['ԛ', 'q'],
+    ['ԝ', 'w'], ['ӏ', 'l'], ['ү', 'y'], ['ҫ', 'c'], ['ѵ', 'v'], ['є', 'e'],
+    // Greek
+    ['α', 'a'], ['β', 'b'], ['γ', 'y'], ['ε', 'e'], ['η', 'n'], ['ι', 'i'], ['κ', 'k'],
+    ['ν', 'v'], ['ο', 'o'], ['ρ', 'p'], ['τ', 't'], ['υ', 'u'], ['χ', 'x'], ['ω', 'w'],
+    ['ϲ', 'c'], ['ϳ', 'j'], ['ά', 'a'], ['έ', 'e'], ['ί', 'i'], ['ό', 'o'], ['ύ', 'u'],
+    // Armenian
+    ['գ', 'q'], ['զ', 'q'], ['հ', 'h'], ['ո', 'n'], ['ս', 'u'], ['ց', 'g'],
+    ['ք', 'p'], ['օ', 'o'], ['ւ', 'l'],
+    // Latin look-alikes outside ASCII
+    ['ı', 'i'], ['ɩ', 'i'], ['ɡ', 'g'], ['ɑ', 'a'], ['ɒ', 'a'], ['ʀ', 'r'], ['ʏ', 'y'], ['ɴ', 'n'],
+    ['ᴄ', 'c'], ['ᴅ', 'd'], ['ᴇ', 'e'], ['ᴋ', 'k'], ['ᴍ', 'm'], ['ᴏ', 'o'], ['ᴘ', 'p'],
+    ['ᴛ', 't'], ['ᴜ', 'u'], ['ᴠ', 'v'], ['ᴡ', 'w'], ['ᴢ', 'z'], ['ł', 'l'], ['ƅ', 'b'],
+    ['à', 'a'], ['á', 'a'], ['â', 'a'], ['ã', 'a'], ['ä', 'a'], ['å', 'a'], ['ç', 'c'],
+    ['è', 'e'], ['é', 'e'], ['ê', 'e'], ['ë', 'e'], ['ì', 'i'], ['í', 'i'], ['î', 'i'],
+    ['ï', 'i'], ['ñ', 'n'], ['ò', 'o'], ['ó', 'o'], ['ô', 'o'], ['õ', 'o'], ['ö', 'o'],
+    ['ø', 'o'], ['ù', 'u'], ['ú', 'u'], ['û', 'u'], ['ü', 'u'], ['ý', 'y'], ['ÿ', 'y'],
+];
+
+/**
+ * Code point -> skeleton string
+ */
+const CONFUSABLES = new Map(CONFUSABLE_PAIRS.map(([char, latin]) => [char.codePointAt(0), latin]));
+
+/**
+ * Script of a code point; digits, hyphen and other ASCII are script-neutral
+ */
+export const scriptOf = (codePoint) => {
+    if (codePoint < 0x80) {
+        return (codePoint >= 0x61 && codePoint <= 0x7a) || (codePoint >= 0x41 && codePoint <= 0x5a)
+            ? Script.LATIN
+            : 0;
+    }
+    if ((codePoint >= 0xc0 && codePoint <= 0x24f) || (codePoint >= 0x250 && codePoint <= 0x2af) ||
+        (codePoint >= 0x1d00 && codePoint <= 0x1d7f) || (codePoint >= 0x1e00 && codePoint <= 0x1eff)) {
+        return codePoint === 0xd7 || codePoint === 0xf7 ? 0 : Script.LATIN;
+    }
+    if ((codePoint >= 0x370 && codePoint <= 0x3ff) || (codePoint >= 0x1f00 && codePoint <= 0x1fff)) {
+        return Script.GREEK;
+    }
+    if (codePoint >= 0x400 && codePoint <= 0x52f) {
+        return Script.CYRILLIC;
+    }
+    if (codePoint >= 0x530 && codePoint <= 0x58f) {
+        return Script.ARMENIAN;
+    }
+    return Script.OTHER;
+};
+
+/**
+ * Decode a punycode label; returns the input when it is not valid punycode
+ */
+export const decodeLabel = (label) => {
+    if (!label.startsWith('xn--')) {
+        return label;
+    }
+    const decoded = domainToUnicode(label);
+    return decoded || label;
+};
+
+/**
+ * Count set bits among the confusable scripts
+ */
+const countScripts = (scripts) => {
+    let count = 0;
+    for (let bits = scripts & CONFUSABLE_SCRIPTS; bits !== 0; bits &= bits - 1) {
+        count++;
+    }
+    return count;
+};
+
+/**
+ * Analyze one host label in a single pass over its code points
+ * @param {string} label - Lowercased host label (punycode or Unicode)
+ * @returns {{unicode: string, skeleton: string, scripts: number,
+ *            mixedScript: boolean, hasConfusables: boolean, isIdn: boolean}}
+ */
+export const analyzeLabel = (label) => {
+    let unicode = decodeLabel(label);
+    const isIdn = unicode !== label || /[^\x00-\x7f]/.test(label);
+
+    if (isIdn) {
+        // Fold fullwidth and mathematical alphanumerics to their plain forms
+        unicode = unicode.normalize('NFKC').toLowerCase();
+    }
+
+    let skeleton = '';
+    let scripts = 0;
+
+    for (const char of unicode) {
+        const codePoint = char.codePointAt(0);
+        scripts |= scriptOf(codePoint);
+
+        const latin = CONFUSABLES.get(codePoint);
+        skeleton += latin !== undefined ? latin : char;
+    }
+
+    return {
+        unicode,
+        skeleton,
+        scripts,
+        mixedScript: countScripts(scripts) > 1,
+        hasConfusables: isIdn && skeleton !== label,
+        isIdn,
+    };
+};
+
+export default analyzeLabel;
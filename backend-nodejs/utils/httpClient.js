@@ -0,0 +1,100 @@
+/**
+ * Keep-Alive HTTP Client
+ *
+ * Dedicated axios instance on top of a keep-alive agent so repeated
+ * calls to the same upstream reuse warm TCP/TLS connections instead of
+ * paying a fresh handshake every time. The socket pool is bounded and can
+ * be inspected for metrics.
+ */
+
+import http from 'http';
+import https from 'https';
+import axios from 'axios';
+
+/**
+ * Agent that counts the connections it opens, so reuse is observable
+ */
+const countingAgent = (Agent) => class PooledAgent extends Agent {
+    constructor(options) {
+        super(options);
+        this.connectionsOpened = 0;
+    }
+
+    createConnection(...args) {
+        this.connectionsOpened++;
+        return super.createConnection(...args);
+    }
+};
+
+const PooledHttpAgent = countingAgent(http.Agent);
+const PooledHttpsAgent = countingAgent(https.Agent);
+
+/**
+ * Create a pooled client for one upstream
+ * @param {Object} options
+ * @param {string} options.baseURL - Upstream origin (e.g., 'https://api.example.com')
+ * @param {number} options.timeout - Request timeout in milliseconds
+ * @param {number} options.maxSockets - Max concurrent sockets to the upstream
+ * @param {number} options.maxFreeSockets - Max idle sockets kept open
+ * @param {number} options.keepAliveMsecs - TCP keep-alive initial delay
+ * @param {number} options.idleTimeoutMs - Close idle sockets after this long
+ * @param {Object} options.tls - Extra TLS options (e.g., { ca } for a test server)
+ * @param {Object} options.headers - Extra default headers (e.g., Authorization)
+ * @returns {import('axios').AxiosInstance & {agent: http.Agent}} Client with its agent attached
+ */
+export const createKeepAliveClient = ({
+    baseURL,
+    timeout = 30000,
+    maxSockets = 50,
+    maxFreeSockets = 10,
+    keepAliveMsecs = 1000,
+    idleTimeoutMs = 60000,
+    tls = {},
+    headers = {},
+} = {}) => {
+    // Plain-http origins (e.g., a self-hosted model server) get a pooled http.Agent
+    const secure = !String(baseURL).startsWith('http:');
+    const Agent = secure ? PooledHttpsAgent : PooledHttpAgent;
+    const agent = new Agent({
+        keepAlive: true,
+        keepAliveMsecs,
+        maxSockets,
+        maxFreeSockets,
+        timeout: idleTimeoutMs,
+        scheduling: 'lifo', // Reuse the most recently used (warmest) socket
+        ...tls,
+    });
+
+    const client = axios.create({
+        baseURL,
+        timeout,
+        [secure ? 'httpsAgent' : 'httpAgent']: agent,
+        headers: {
+            'Content-Type': 'application/json',
+            ...headers,
+        },
+    });
+
+    client.agent = agent;
+    return client;
+};
+
+/**
+ * Count sockets across every origin in an agent's pool
+ */
+const countSockets = (pool) => Object.values(pool).reduce((total, list) => total + list.length, 0);
+
+/**
+ * Socket pool snapshot for an agent
+ * @param {http.Agent} agent
+ */
+export const getSocketStats = (agent) => ({
+    active: countSockets(agent.sockets),
+    idle: countSockets(agent.freeSockets),
+    queued: countSockets(agent.requests),
+    max_sockets: agent.maxSockets,
+    max_free_sockets: agent.maxFreeSockets,
+    connections_opened: agent.connectionsOpened ?? 0,
+});
+
+export default createKeepAliveClient;
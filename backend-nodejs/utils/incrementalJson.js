@@ -0,0 +1,117 @@
+/**
+ * Incremental JSON Object Parser
+ *
+ * Consumes a JSON object in arbitrary text chunks and exposes each
+ * top-level field as soon as its value is complete, so a streamed model
+ * reply can be acted on before the closing brace arrives.
+ */
+
+const isWhitespace = (ch) => ch === ' ' || ch === '\n' || ch === '\r' || ch === '\t';
+
+/**
+ * Resumable scanner over one top-level JSON object
+ */
+export class IncrementalJsonObject {
+    constructor() {
+        this.buffer = '';
+        this.fields = {};
+        this.done = false;
+
+        this._pos = 0;
+        this._depth = 0;
+        this._inString = false;
+        this._escape = false;
+        this._key = null;
+        this._valueStart = -1;
+    }
+
+    /**
+     * Feed the next chunk of text
+     * @returns {string[]} Keys whose values completed in this chunk
+     * @throws {SyntaxError} When a completed value is not valid JSON
+     */
+    push(chunk) {
+        this.buffer += chunk;
+        const completed = [];
+        const buffer = this.buffer;
+
+        for (; this._pos < buffer.length && !this.done; this._pos++) {
+            const ch = buffer[this._pos];
+
+            if (this._inString) {
+                if (this._escape) {
+                    this._escape = false;
+                } else if (ch === '\\') {
+                    this._escape = true;
+                } else if (ch === '"') {
+                    this._inString = false;
+                    if (this._depth === 1) {
+                        this._closeToken(this._pos + 1, completed);
+                    }
+                }
+                continue;
+            }
+
+            if (ch === '"') {
+                this._inString = true;
+                if (this._depth === 1) {
+                    this._valueStart = this._pos;
+                }
+            } else if (ch === '{' || ch === '[') {
+                if (this._depth === 1) {
+                    this._valueStart = this._pos;
+                }
+                this._depth++;
+            } else if (ch === '}' || ch === ']') {
+                if (this._depth === 1) {
+                    this._closePrimitive(this._pos, completed);
+                    this.done = true;
+                }
+                this._depth--;
+                if (this._depth === 1) {
+                    this._closeToken(this._pos + 1, completed);
+                }
+            } else if (this._depth === 1) {
+                if (ch === ',') {
+                    this._closePrimitive(this._pos, completed);
+                } else if (ch !== ':' && !isWhitespace(ch) && this._valueStart === -1 && this._key !== null) {
+                    this._valueStart = this._pos;
+                }
+            }
+        }
+
+        return completed;
+    }
+
+    /**
+     * A string or container at depth 1 just ended: it is either a key or a value
+     */
+    _closeToken(end, completed) {
+        const token = JSON.parse(this.buffer.slice(this._valueStart, end));
+        this._valueStart = -1;
+
+        if (this._key === null) {
+            this._key = token;
+        } else {
+            this.fields[this._key] = token;
+            completed.push(this._key);
+            this._key = null;
+        }
+    }
+
+    /**
+     * A number/boolean/null value ends at the next ',' or '}'
+     */
+    _closePrimitive(end, completed) {
+        if (this._key === null || this._valueStart === -1) {
+            return;
+        }
+
+        this.fields[this._key] = JSON.parse(this.buffer.slice(this._valueStart, end).trim());
+        completed.push(this._key);
+        this._key = null;
+        this._valueStart = -1;
+    }
+}
+
+export default IncrementalJsonObject;
@@ -0,0 +1,137 @@
+/**
+ * Keccak-256
+ *
+ * Original Keccak padding (as used by Ethereum), which differs from the
+ * NIST SHA3-256 exposed by node:crypto. Lanes are kept as 32-bit halves
+ * in a Uint32Array so no BigInt arithmetic is needed.
+ */
+
+const RATE_BYTES = 136;
+
+// Round constants as [lo, hi] pairs
+const ROUND_CONSTANTS = new Uint32Array([
+    0x00000001, 0x00000000, 0x00008082, 0x00000000, 0x0000808a, 0x80000000, 0x80008000, 0x80000000,
+    0x0000808b, 0x00000000, 0x80000001, 0x00000000, 0x80008081, 0x80000000, 0x00008009, 0x80000000,
+    0x0000008a, 0x00000000, 0x00000088, 0x00000000, 0x80008009, 0x00000000, 0x8000000a, 0x00000000,
+    0x8000808b, 0x00000000, 0x0000008b, 0x80000000, 0x00008089, 0x80000000, 0x00008003, 0x80000000,
+    0x00008002, 0x80000000, 0x00000080, 0x80000000, 0x0000800a, 0x00000000, 0x8000000a, 0x80000000,
+    0x80008081, 0x80000000, 0x00008080, 0x80000000, 0x80000001, 0x00000000, 0x80008008, 0x80000000,
+]);
+
+// Rotation offsets indexed by lane x + 5y
+const ROTATIONS = [
+    0, 1, 62, 28, 27,
+    36, 44, 6, 55, 20,
+    3, 10, 43, 25, 39,
+    41, 45, 15, 21, 8,
+    18, 2, 61, 56, 14,
+];
+
+/**
+ * Keccak-f[1600] permutation over 25 lanes stored as (lo, hi) pairs
+ */
+const permute = (state) => {
+    const c = new Uint32Array(10);
+    const b = new Uint32Array(50);
+
+    for (let round = 0; round < 24; round++) {
+        // Theta
+        for (let x = 0; x < 5; x++) {
+            c[x * 2] = state[x * 2] ^ state[(x + 5) * 2] ^ state[(x + 10) * 2] ^
+                state[(x + 15) * 2] ^ state[(x + 20) * 2];
+            c[x * 2 + 1] = state[x * 2 + 1] ^ state[(x + 5) * 2 + 1] ^ state[(x + 10) * 2 + 1] ^
+                state[(x + 15) * 2 + 1] ^ state[(x + 20) * 2 + 1];
+        }
+        for (let x = 0; x < 5; x++) {
+            const prev = ((x + 4) % 5) * 2;
+            const next = ((x + 1) % 5) * 2;
+            const dLo = c[prev] ^ ((c[next] << 1) | (c[next + 1] >>> 31));
+            const dHi = c[prev + 1] ^ ((c[next + 1] << 1) | (c[next] >>> 31));
+            for (let y = 0; y < 25; y += 5) {
+                state[(x + y) * 2] ^= dLo;
+                state[(x + y) * 2 + 1] ^= dHi;
+            }
+        }
+
+        // Rho and Pi
+        for (let x = 0; x < 5; x++) {
+            for (let y = 0; y < 5; y++) {
+                const lane = x + 5 * y;
+                const lo = state[lane * 2];
+                const hi = state[lane * 2 + 1];
+                const shift = ROTATIONS[lane];
+                const target = (y + 5 * ((2 * x + 3 * y) % 5)) * 2;
+
+                if (shift === 0) {
+                    b[target] = lo;
+                    b[target + 1] = hi;
+                } else if (shift < 32) {
+                    b[target] = (lo << shift) | (hi >>> (32 - shift));
+                    b[target + 1] = (hi << shift) | (lo >>> (32 - shift));
+                } else if (shift === 32) {
+                    b[target] = hi;
+                    b[target + 1] = lo;
+                } else {
+                    const m = shift - 32;
+                    b[target] = (hi << m) | (lo >>> (32 - m));
+                    b[target + 1] = (lo << m) | (hi >>> (32 - m));
+                }
+            }
+        }
+
+        // Chi
+        for (let y = 0; y < 25; y += 5) {
+            for (let x = 0; x < 5; x++) {
+                const lane = (x + y) * 2;
+                const lane1 = (((x + 1) % 5) + y) * 2;
+                const lane2 = (((x + 2) % 5) + y) * 2;
+                state[lane] = b[lane] ^ (~b[lane1] & b[lane2]);
+                state[lane + 1] = b[lane + 1] ^ (~b[lane1 + 1] & b[lane2 + 1]);
+            }
+        }
+
+        // Iota
+        state[0] ^= ROUND_CONSTANTS[round * 2];
+        state[1] ^= ROUND_CONSTANTS[round * 2 + 1];
+    }
+};
+
+/**
+ * XOR a rate-sized block into the state (little-endian lanes)
+ */
+const absorbBlock = (state, block) => {
+    for (let i = 0; i < RATE_BYTES; i += 4) {
+        state[i >> 2] ^= block[i] | (block[i + 1] << 8) | (block[i + 2] << 16) | (block[i + 3] << 24);
+    }
+};
+
+/**
+ * Keccak-256 digest
+ * @param {Buffer|Uint8Array|string} input - Bytes or UTF-8 string
+ * @returns {Buffer} 32-byte digest
+ */
+export const keccak256 = (input) => {
+    const data = typeof input === 'string' ? Buffer.from(input, 'utf8') : input;
+    const state = new Uint32Array(50);
+
+    let offset = 0;
+    for (; offset + RATE_BYTES <= data.length; offset += RATE_BYTES) {
+        absorbBlock(state, data.subarray(offset, offset + RATE_BYTES));
+        permute(state);
+    }
+
+    const last = new Uint8Array(RATE_BYTES);
+    last.set(data.subarray(offset));
+    last[data.length - offset] ^= 0x01;
+    last[RATE_BYTES - 1] ^= 0x80;
+    absorbBlock(state, last);
+    permute(state);
+
+    const digest = Buffer.alloc(32);
+    for (let i = 0; i < 8; i++) {
+        digest.writeUInt32LE(state[i] >>> 0, i * 4);
+    }
+    return digest;
+};
+
+export default keccak256;
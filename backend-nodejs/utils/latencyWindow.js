@@ -0,0 +1,46 @@
+/**
+ * Rolling Latency Window
+ *
+ * Fixed-size ring buffer of recent latencies with percentile queries.
+ * Used to derive timeouts from what the upstream is actually doing rather
+ * than a single hard-coded worst case.
+ */
+
+/**
+ * Ring buffer of the most recent latency samples
+ */
+export class LatencyWindow {
+    /**
+     * @param {number} size - Number of samples kept
+     */
+    constructor(size = 200) {
+        this._samples = new Float64Array(size);
+        this._next = 0;
+        this.count = 0;
+    }
+
+    /**
+     * Add a latency sample in milliseconds
+     */
+    record(ms) {
+        this._samples[this._next] = ms;
+        this._next = (this._next + 1) % this._samples.length;
+        this.count = Math.min(this.count + 1, this._samples.length);
+    }
+
+    /**
+     * Latency at quantile q (0..1) over the window, nearest-rank
+     * @returns {number} Milliseconds, or NaN when empty
+     */
+    percentile(q) {
+        if (this.count === 0) {
+            return NaN;
+        }
+
+        const sorted = this._samples.slice(0, this.count).sort();
+        const rank = Math.min(this.count - 1, Math.max(0, Math.ceil(q * this.count) - 1));
+        return sorted[rank];
+    }
+}
+
+export default LatencyWindow;
@@ -0,0 +1,138 @@
+/**
+ * LRU Cache with TTL
+ *
+ * Bounded in-memory cache built on Map insertion order: reads move an entry
+ * to the most-recent end and inserts evict from the least-recent end.
+ * Entries also expire after a time-to-live. Hit/miss/eviction counters are
+ * kept for observability.
+ */
+
+/**
+ * Bounded least-recently-used cache
+ */
+export class LRUCache {
+    /**
+     * @param {Object} options
+     * @param {number} options.maxEntries - Maximum number of entries kept
+     * @param {number} options.ttlMs - Entry lifetime in milliseconds (0 = no expiry)
+     * @param {Function} options.now - Clock, injectable for tests
+     */
+    constructor({ maxEntries = 1000, ttlMs = 0, now = Date.now } = {}) {
+        if (!Number.isInteger(maxEntries) || maxEntries < 1) {
+            throw new Error('LRUCache maxEntries must be a positive integer');
+        }
+
+        this.maxEntries = maxEntries;
+        this.ttlMs = ttlMs;
+        this._now = now;
+        this._entries = new Map();
+        this.hits = 0;
+        this.misses = 0;
+        this.evictions = 0;
+        this.expirations = 0;
+    }
+
+    /**
+     * Current number of entries (including not-yet-purged expired ones)
+     */
+    get size() {
+        return this._entries.size;
+    }
+
+    /**
+     * Look up a key, refreshing its recency
+     * @returns {*} Cached value or undefined
+     */
+    get(key) {
+        const entry = this._entries.get(key);
+
+        if (entry === undefined) {
+            this.misses++;
+            return undefined;
+        }
+
+        if (entry.expiresAt !== 0 && entry.expiresAt <= this._now()) {
+            this._entries.delete(key);
+            this.expirations++;
+            this.misses++;
+            return undefined;
+        }
+
+        this._entries.delete(key);
+        this._entries.set(key, entry);
+        this.hits++;
+        return entry.value;
+    }
+
+    /**
+     * Check for a live entry without touching recency or counters
+     */
+    has(key) {
+        const entry = this._entries.get(key);
+        return entry !== undefined && (entry.expiresAt === 0 || entry.expiresAt > this._now());
+    }
+
+    /**
+     * Insert or replace a value
+     * @param {number} ttlMs - Optional per-entry TTL override
+     */
+    set(key, value, ttlMs = this.ttlMs) {
+        if (this._entries.has(key)) {
+            this._entries.delete(key);
+        } else if (this._entries.size >= this.maxEntries) {
+            const oldest = this._entries.keys().next().value;
+            this._entries.delete(oldest);
+            this.evictions++;
+        }
+
+        this._entries.set(key, {
+            value,
+            expiresAt: ttlMs > 0 ? this._now() + ttlMs : 0,
+        });
+        return this;
+    }
+
+    /**
+     * Remove a single key
+     */
+    delete(key) {
+        return this._entries.delete(key);
+    }
+
+    /**
+     * Remove every entry (counters are kept)
+     */
+    clear() {
+        this._entries.clear();
+    }
+
+    /**
+     * Iterate live [key, value, expiresAt] entries from least to most recently used
+     */
+    *entries() {
+        const now = this._now();
+        for (const [key, entry] of this._entries) {
+            if (entry.expiresAt === 0 || entry.expiresAt > now) {
+                yield [key, entry.value, entry.expiresAt];
+            }
+        }
+    }
+
+    /**
+     * Counter snapshot
+     */
+    stats() {
+        const lookups = this.hits + this.misses;
+        return {
+            size: this._entries.size,
+            max_entries: this.maxEntries,
+            hits: this.hits,
+            misses: this.misses,
+            hit_ratio: lookups > 0 ? Math.round((this.hits / lookups) * 1000) / 1000 : 0,
+            evictions: this.evictions,
+            expirations: this.expirations,
+        };
+    }
+}
+
+export default LRUCache;
@@ -0,0 +1,90 @@
+/**
+ * Micro-Batcher
+ *
+ * Collects items submitted within a short window (or until a size cap is
+ * reached) and hands them to a handler as one batch. Each submitter gets
+ * back its own result, so callers stay unaware of the batching.
+ */
+
+/**
+ * Time/size bounded batch collector
+ */
+export class MicroBatcher {
+    /**
+     * @param {Object} options
+     * @param {number} options.windowMs - How long the first item waits for company
+     * @param {number} options.maxSize - Flush immediately at this many items
+     * @param {Function} options.handler - async (items) => results aligned with items;
+     *   an Error in a result slot rejects only that item
+     */
+    constructor({ windowMs = 5, maxSize = 8, handler }) {
+        this.windowMs = windowMs;
+        this.maxSize = maxSize;
+        this._handler = handler;
+        this._pending = [];
+        this._timer = null;
+
+        this.batches = 0;
+        this.items = 0;
+    }
+
+    /**
+     * Submit one item
+     * @returns {Promise<*>} This item's result
+     */
+    add(item) {
+        return new Promise((resolve, reject) => {
+            this._pending.push({ item, resolve, reject });
+
+            if (this._pending.length >= this.maxSize) {
+                this.flush();
+            } else if (!this._timer) {
+                this._timer = setTimeout(() => this.flush(), this.windowMs);
+            }
+        });
+    }
+
+    /**
+     * Send everything pending as one batch now
+     */
+    flush() {
+        clearTimeout(this._timer);
+        this._timer = null;
+
+        const batch = this._pending;
+        this._pending = [];
+        if (batch.length === 0) {
+            return;
+        }
+
+        this.batches++;
+        this.items += batch.length;
+
+        Promise.resolve()
+            .then(() => this._handler(batch.map(({ item }) => item)))
+            .then(
+                (results) => batch.forEach(({ resolve, reject }, i) => {
+                    if (results[i] instanceof Error) {
+                        reject(results[i]);
+                    } else {
+                        resolve(results[i]);
+                    }
+                }),
+                (error) => batch.forEach(({ reject }) => reject(error))
+            );
+    }
+
+    /**
+     * Counter snapshot
+     */
+    stats() {
+        return {
+            pending: this._pending.length,
+            batches: this.batches,
+            items: this.items,
+            avg_batch_size: this.batches > 0 ? Math.round((this.items / this.batches) * 100) / 100 : 0,
+        };
+    }
+}
+
+export default MicroBatcher;
@@ -0,0 +1,57 @@
+/**
+ * NDJSON Line Reader
+ *
+ * Splits a streamed request body (application/x-ndjson) into lines as the
+ * chunks arrive. The stream is only read as fast as the caller consumes
+ * lines, so a slow consumer pushes back on the sender. A line longer than
+ * the limit is skipped up to its newline instead of being buffered.
+ */
+
+/**
+ * Iterate the non-blank lines of a stream
+ * @param {AsyncIterable<Buffer|string>} stream - Request body stream
+ * @param {Object} options
+ * @param {number} options.maxLineLength - Longest line kept, in characters
+ * @yields {{number: number, line: string|null}} 1-based line number and text (null if over the limit)
+ */
+export async function* readNdjsonLines(stream, { maxLineLength = Infinity } = {}) {
+    const decoder = new TextDecoder();
+    let pending = '';
+    let number = 0;
+    let overflow = false;
+
+    const finish = (line) => {
+        number++;
+        const text = overflow || line.length > maxLineLength ? null : line.replace(/\r$/, '');
+        overflow = false;
+        return text === null || text.trim() !== '' ? { number, line: text } : null;
+    };
+
+    for await (const chunk of stream) {
+        const text = typeof chunk === 'string' ? chunk : decoder.decode(chunk, { stream: true });
+        let start = 0;
+        let newline;
+
+        while ((newline = text.indexOf('\n', start)) !== -1) {
+            const record = finish(overflow ? '' : pending + text.slice(start, newline));
+            pending = '';
+            start = newline + 1;
+            if (record) yield record;
+        }
+
+        if (!overflow) {
+            pending += text.slice(start);
+            if (pending.length > maxLineLength) {
+                overflow = true;
+                pending = '';
+            }
+        }
+    }
+
+    // Last line may end without a newline
+    pending += decoder.decode();
+    if (overflow || pending.trim() !== '') {
+        const record = finish(pending);
+        if (record) yield record;
+    }
+}
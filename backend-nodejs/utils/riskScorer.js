@@ -30,14 +30,32 @@ export const calculateRiskLevel = (score) => {
 };
 
 /**
- * Combine AI and heuristic scores
+ * Blend the local model's probability into the rule-based heuristic score.
+ * The model can raise any score, but never pulls a suspicious heuristic
+ * finding back down.
+ */
+const blendLocalScore = (heuristicScore, localResult) => {
+    if (!localResult) {
+        return heuristicScore;
+    }
+
+    const weight = config.localModel.weight;
+    const blended = (heuristicScore * (1 - weight)) + (localResult.phishingProbability * 100 * weight);
+    return heuristicScore >= config.risk.suspiciousThreshold ? Math.max(heuristicScore, blended) : blended;
+};
+
+/**
+ * Combine AI, heuristic and local model scores
  * 
  * Strategy:
+ * - The local model (if loaded) is blended into the heuristic score first
  * - If AI is available, weight it more heavily (70% AI, 30% heuristic)
  * - If AI indicates high risk, boost overall score
  * - Strong heuristic signals can override weak AI output
  */
-export const combineScores = (aiResult, heuristicScore) => {
+export const combineScores = (aiResult, heuristicScore, localResult = null) => {
+    heuristicScore = blendLocalScore(heuristicScore, localResult);
+
     if (!aiResult) {
         // Heuristics only
         return Math.min(heuristicScore, 100);
@@ -102,9 +120,38 @@ export const mergeRiskFactors = (aiResult, heuristicReasons) => {
 
 /**
  * Create final analysis result
+ * @param {Object} options
+ * @param {string} options.aiSkipReason - Why AI was skipped (e.g., 'queue_full'), if it was
+ * @param {Object} options.aiInput - Bytes sent to AI after condensation, when AI was called
+ * @param {Object} options.localResult - Local model output, when a model is loaded
  */
-export const createAnalysisResult = (score, riskFactors, aiResult = null) => {
+export const createAnalysisResult = (score, riskFactors, aiResult = null, {
+    aiSkipReason = null,
+    aiInput = null,
+    localResult = null,
+} = {}) => {
     const riskLevel = calculateRiskLevel(score);
+    const detectionLayers = aiResult ? ['ai', 'heuristic'] : ['heuristic'];
+    if (localResult) {
+        detectionLayers.push('local_model');
+    }
+    if (!aiResult && aiSkipReason) {
+        detectionLayers.push(`ai_skipped:${aiSkipReason}`);
+    }
+
+    const metadata = {
+        analysis_version: '2.0',
+        timestamp: new Date().toISOString(),
+        detection_layers: detectionLayers,
+    };
+    if (aiInput) {
+        metadata.ai_input = aiInput;
+    }
+    if (localResult) {
+        metadata.local_model = {
+            phishing_probability: Math.round(localResult.phishingProbability * 1000) / 1000,
+        };
+    }
 
     return {
         risk_score: Math.round(score),
@@ -116,13 +163,11 @@ export const createAnalysisResult = (score, riskFactors, aiResult = null) => {
             model: aiResult.modelName,
         } : {
             enabled: false,
-            message: 'AI analysis not available',
-        },
-        metadata: {
-            analysis_version: '2.0',
-            timestamp: new Date().toISOString(),
-            detection_layers: aiResult ? ['ai', 'heuristic'] : ['heuristic'],
+            message: aiSkipReason
+                ? `AI analysis skipped (${aiSkipReason.replace('_', ' ')})`
+                : 'AI analysis not available',
         },
+        metadata,
     };
 };
 
@@ -0,0 +1,24 @@
+/**
+ * Seeded Random Numbers
+ *
+ * Small deterministic PRNG (mulberry32) for anything that must replay
+ * identically from a seed: training shuffles, synthetic load, test data.
+ */
+
+/**
+ * Create a seeded generator
+ * @param {number} seed - 32-bit seed
+ * @returns {Function} Returns floats in [0, 1)
+ */
+export const seededRandom = (seed) => {
+    let state = seed >>> 0;
+    return () => {
+        state = (state + 0x6d2b79f5) >>> 0;
+        let t = state;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+};
+
+export default seededRandom;
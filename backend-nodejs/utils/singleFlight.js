@@ -0,0 +1,64 @@
+/**
+ * Single-Flight Request Coalescing
+ *
+ * Concurrent callers asking for the same key share one in-flight promise
+ * instead of each starting their own call. The entry is removed as soon
+ * as the call settles, so later callers start fresh and a failure is
+ * delivered to every waiter but never remembered.
+ */
+
+/**
+ * In-flight call registry keyed by string
+ */
+export class SingleFlight {
+    constructor() {
+        this._calls = new Map();
+        this.calls = 0;
+        this.coalesced = 0;
+    }
+
+    /**
+     * Number of distinct calls currently in flight
+     */
+    get size() {
+        return this._calls.size;
+    }
+
+    /**
+     * Run fn for key unless a call for key is already running, in which
+     * case its promise is shared
+     * @param {string} key - Coalescing key
+     * @param {Function} fn - Async function producing the value
+     * @returns {Promise<*>}
+     */
+    do(key, fn) {
+        const existing = this._calls.get(key);
+        if (existing) {
+            this.coalesced++;
+            return existing;
+        }
+
+        this.calls++;
+        // fn starts on the next microtask so the entry is registered before
+        // the cleanup can run, even when fn throws synchronously
+        const promise = Promise.resolve()
+            .then(fn)
+            .finally(() => this._calls.delete(key));
+
+        this._calls.set(key, promise);
+        return promise;
+    }
+
+    /**
+     * Counter snapshot
+     */
+    stats() {
+        return {
+            in_flight: this._calls.size,
+            calls: this.calls,
+            coalesced: this.coalesced,
+        };
+    }
+}
+
+export default SingleFlight;
@@ -0,0 +1,50 @@
+/**
+ * Server-Sent Events Reader
+ *
+ * Turns a streamed HTTP response body (text/event-stream) into parsed
+ * JSON events, one per "data:" payload. The OpenAI-style "[DONE]"
+ * end-of-stream sentinel is skipped.
+ */
+
+const DONE_SENTINEL = '[DONE]';
+
+/**
+ * Iterate the JSON payloads of an event stream
+ * @param {AsyncIterable<Buffer|string>} stream - Response body stream
+ * @yields {Object} Parsed data payload of each event
+ */
+export async function* readSseEvents(stream) {
+    const decoder = new TextDecoder();
+    let pending = '';
+    let data = [];
+
+    const dispatch = () => {
+        const payload = data.join('\n');
+        data = [];
+        return payload && payload !== DONE_SENTINEL ? JSON.parse(payload) : null;
+    };
+
+    for await (const chunk of stream) {
+        pending += typeof chunk === 'string' ? chunk : decoder.decode(chunk, { stream: true });
+
+        let newline;
+        while ((newline = pending.indexOf('\n')) !== -1) {
+            const line = pending.slice(0, newline).replace(/\r$/, '');
+            pending = pending.slice(newline + 1);
+
+            if (line === '') {
+                const event = dispatch();
+                if (event) yield event;
+            } else if (line.startsWith('data:')) {
+                data.push(line.slice(5).trimStart());
+            }
+        }
+    }
+
+    // Final event may end without a blank line
+    if (pending.startsWith('data:')) {
+        data.push(pending.slice(5).trimStart());
+    }
+    const event = dispatch();
+    if (event) yield event;
+}
@@ -0,0 +1,264 @@
+/**
+ * Hashed N-gram Text Classifier
+ *
+ * Logistic regression over hashed word unigrams/bigrams and character
+ * 3/4-grams. The model is a single Float32Array of weights, trained offline
+ * (scripts/train-classifier.js) and loaded with one file read, so scoring a
+ * message is one linear pass over its text with no network calls.
+ *
+ * File layout (little-endian):
+ *   0   4 bytes  magic "PGTC"
+ *   4   u32      format version
+ *   8   u32      feature dimensions (power of two)
+ *   12  f32      bias
+ *   16  dims * f32 weights
+ */
+
+import fs from 'fs';
+import os from 'os';
+import { seededRandom } from './seededRandom.js';
+
+const MAGIC = 'PGTC';
+const FORMAT_VERSION = 1;
+const HEADER_BYTES = 16;
+
+/**
+ * Only the start of very long messages is featurized
+ */
+const MAX_FEATURE_CHARS = 20000;
+
+const FNV_PRIME = 0x01000193;
+const SEED_WORD = 0x811c9dc5;
+const SEED_BIGRAM = 0x9e3779b1;
+const SEED_CHAR = 0x85ebca77;
+const CHAR_NGRAMS = [3, 4];
+
+/**
+ * Final avalanche step of MurmurHash3
+ */
+const fmix32 = (value) => {
+    let h = value;
+    h ^= h >>> 16;
+    h = Math.imul(h, 0x85ebca6b);
+    h ^= h >>> 13;
+    h = Math.imul(h, 0xc2b2ae35);
+    h ^= h >>> 16;
+    return h >>> 0;
+};
+
+/**
+ * Letters, digits and any non-ASCII character belong to words
+ */
+const isWordChar = (code) => (code >= 0x61 && code <= 0x7a) || (code >= 0x30 && code <= 0x39) || code > 0x7f;
+
+const sigmoid = (z) => 1 / (1 + Math.exp(-z));
+
+/**
+ * Hashed feature indices of a message (repeats are kept as term counts)
+ * @param {string} text - Message text
+ * @param {number} dims - Feature space size (power of two)
+ * @returns {Uint32Array} Feature indices
+ */
+export const hashFeatures = (text, dims) => {
+    const lower = text.slice(0, MAX_FEATURE_CHARS).toLowerCase();
+    const mask = dims - 1;
+    const features = new Uint32Array(lower.length * (2 + CHAR_NGRAMS.length) + 2);
+    let count = 0;
+
+    // Word unigrams and bigrams
+    let wordHash = SEED_WORD;
+    let wordLength = 0;
+    let previousWord = -1;
+    for (let i = 0; i <= lower.length; i++) {
+        const code = i < lower.length ? lower.charCodeAt(i) : 0x20;
+        if (isWordChar(code)) {
+            wordHash = Math.imul(wordHash ^ code, FNV_PRIME);
+            wordLength++;
+            continue;
+        }
+        if (wordLength > 0) {
+            const word = fmix32(wordHash);
+            features[count++] = word & mask;
+            if (previousWord !== -1) {
+                features[count++] = fmix32(Math.imul(previousWord ^ SEED_BIGRAM, FNV_PRIME) ^ word) & mask;
+            }
+            previousWord = word;
+        }
+        wordHash = SEED_WORD;
+        wordLength = 0;
+    }
+
+    // Character n-grams catch obfuscated spellings and URL fragments
+    for (const n of CHAR_NGRAMS) {
+        for (let i = 0; i + n <= lower.length; i++) {
+            let h = SEED_CHAR ^ n;
+            for (let k = 0; k < n; k++) {
+                h = Math.imul(h ^ lower.charCodeAt(i + k), FNV_PRIME);
+            }
+            features[count++] = fmix32(h) & mask;
+        }
+    }
+
+    return features.subarray(0, count);
+};
+
+/**
+ * Logistic regression scorer over hashed features
+ */
+export class TextClassifier {
+    /**
+     * @param {Object} model
+     * @param {number} model.dims - Feature space size (power of two)
+     * @param {Float32Array} model.weights - One weight per feature
+     * @param {number} model.bias - Intercept
+     */
+    constructor({ dims, weights, bias = 0 }) {
+        if (!(dims > 0 && (dims & (dims - 1)) === 0) || weights.length !== dims) {
+            throw new Error('Invalid classifier: dims must be a power of two matching the weights');
+        }
+
+        this.dims = dims;
+        this.weights = weights;
+        this.bias = bias;
+    }
+
+    /**
+     * Logit for pre-hashed features (term counts scaled by 1/sqrt(n))
+     */
+    _logit(features) {
+        if (features.length === 0) {
+            return this.bias;
+        }
+
+        let sum = 0;
+        for (let i = 0; i < features.length; i++) {
+            sum += this.weights[features[i]];
+        }
+        return this.bias + sum / Math.sqrt(features.length);
+    }
+
+    /**
+     * Phishing probability for a message
+     * @returns {number} 0.0 - 1.0
+     */
+    predict(text) {
+        return sigmoid(this._logit(hashFeatures(text, this.dims)));
+    }
+
+    /**
+     * Serialize to the model file layout
+     */
+    toBuffer() {
+        const buffer = Buffer.alloc(HEADER_BYTES + this.dims * 4);
+        buffer.write(MAGIC, 0, 'ascii');
+        buffer.writeUInt32LE(FORMAT_VERSION, 4);
+        buffer.writeUInt32LE(this.dims, 8);
+        buffer.writeFloatLE(this.bias, 12);
+
+        for (let i = 0; i < this.dims; i++) {
+            buffer.writeFloatLE(this.weights[i], HEADER_BYTES + i * 4);
+        }
+        return buffer;
+    }
+
+    /**
+     * Read a model from its file bytes
+     */
+    static fromBuffer(buffer) {
+        if (buffer.length < HEADER_BYTES || buffer.toString('ascii', 0, 4) !== MAGIC) {
+            throw new Error('Invalid classifier model: bad magic header');
+        }
+
+        const version = buffer.readUInt32LE(4);
+        if (version !== FORMAT_VERSION) {
+            throw new Error(`Unsupported classifier model version: ${version}`);
+        }
+
+        const dims = buffer.readUInt32LE(8);
+        if (buffer.length < HEADER_BYTES + dims * 4) {
+            throw new Error('Invalid classifier model: truncated weights');
+        }
+
+        return new TextClassifier({
+            dims,
+            weights: TextClassifier._weightsView(buffer, dims),
+            bias: buffer.readFloatLE(12),
+        });
+    }
+
+    /**
+     * Zero-copy Float32Array over the weights when alignment and
+     * endianness allow it, otherwise a decoded copy
+     */
+    static _weightsView(buffer, dims) {
+        const byteOffset = buffer.byteOffset + HEADER_BYTES;
+
+        if (os.endianness() === 'LE' && byteOffset % 4 === 0) {
+            return new Float32Array(buffer.buffer, byteOffset, dims);
+        }
+
+        const weights = new Float32Array(dims);
+        for (let i = 0; i < dims; i++) {
+            weights[i] = buffer.readFloatLE(HEADER_BYTES + i * 4);
+        }
+        return weights;
+    }
+
+    /**
+     * Load a model file with a single read
+     */
+    static load(filePath) {
+        return TextClassifier.fromBuffer(fs.readFileSync(filePath));
+    }
+}
+
+/**
+ * Train a classifier with SGD on log loss
+ * @param {Array<{text: string, label: boolean|number}>} samples - label true/1 = phishing
+ * @param {Object} options
+ * @param {number} options.dims - Feature space size (power of two)
+ * @param {number} options.epochs - Passes over the data
+ * @param {number} options.learningRate - Initial step size (decays per epoch)
+ * @param {number} options.l2 - L2 regularization strength
+ * @param {number} options.seed - Shuffle seed
+ * @returns {TextClassifier}
+ */
+export const trainClassifier = (samples, {
+    dims = 1 << 18,
+    epochs = 5,
+    learningRate = 0.5,
+    l2 = 1e-6,
+    seed = 1,
+} = {}) => {
+    const model = new TextClassifier({ dims, weights: new Float32Array(dims) });
+    const encoded = samples.map(({ text, label }) => ({ features: hashFeatures(text, dims), label: label ? 1 : 0 }));
+    const order = encoded.map((_, i) => i);
+    const random = seededRandom(seed);
+
+    for (let epoch = 0; epoch < epochs; epoch++) {
+        // Fisher-Yates shuffle
+        for (let i = order.length - 1; i > 0; i--) {
+            const j = Math.floor(random() * (i + 1));
+            [order[i], order[j]] = [order[j], order[i]];
+        }
+
+        const rate = learningRate / (1 + epoch);
+        for (const index of order) {
+            const { features, label } = encoded[index];
+            const gradient = sigmoid(model._logit(features)) - label;
+            const scale = features.length > 0 ? 1 / Math.sqrt(features.length) : 0;
+
+            model.bias -= rate * gradient;
+            for (let i = 0; i < features.length; i++) {
+                const feature = features[i];
+                model.weights[feature] -= rate * (gradient * scale + l2 * model.weights[feature]);
+            }
+        }
+    }
+
+    // The model file stores the bias as f32
+    model.bias = Math.fround(model.bias);
+    return model;
+};
+
+export default TextClassifier;
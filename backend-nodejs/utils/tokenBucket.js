@@ -0,0 +1,79 @@
+/**
+ * Token Bucket
+ *
+ * Rate budget that refills continuously up to a burst capacity. Callers
+ * take one token per call (or several for heavier work); when the bucket
+ * runs short it reports how long until enough tokens have accrued.
+ */
+
+/**
+ * Continuously refilled token budget
+ */
+export class TokenBucket {
+    /**
+     * @param {Object} options
+     * @param {number} options.ratePerSec - Tokens added per second
+     * @param {number} options.burst - Bucket capacity (starts full)
+     * @param {Function} options.now - Clock, injectable for tests
+     */
+    constructor({ ratePerSec, burst = Math.max(1, ratePerSec), now = Date.now } = {}) {
+        if (!(ratePerSec > 0) || !(burst > 0)) {
+            throw new Error('TokenBucket ratePerSec and burst must be positive');
+        }
+
+        this.ratePerSec = ratePerSec;
+        this.burst = burst;
+        this._now = now;
+        this._tokens = burst;
+        this._updatedAt = now();
+    }
+
+    /**
+     * Add the tokens accrued since the last update
+     */
+    _refill() {
+        const now = this._now();
+        const elapsed = now - this._updatedAt;
+        if (elapsed > 0) {
+            this._tokens = Math.min(this.burst, this._tokens + (elapsed * this.ratePerSec) / 1000);
+            this._updatedAt = now;
+        }
+    }
+
+    /**
+     * Tokens available now
+     */
+    get available() {
+        this._refill();
+        return this._tokens;
+    }
+
+    /**
+     * Take tokens if the bucket holds enough
+     * @returns {boolean} Whether the tokens were taken
+     */
+    tryTake(count = 1) {
+        this._refill();
+        if (this._tokens < count) {
+            return false;
+        }
+        this._tokens -= count;
+        return true;
+    }
+
+    /**
+     * Milliseconds until count tokens are available (0 if they are now).
+     * Requests above the burst capacity can never be met.
+     */
+    msUntil(count = 1) {
+        if (count > this.burst) {
+            return Infinity;
+        }
+
+        this._refill();
+        const missing = count - this._tokens;
+        return missing > 0 ? Math.ceil((missing * 1000) / this.ratePerSec) : 0;
+    }
+}
+
+export default TokenBucket;
@@ -0,0 +1,338 @@
+/**
+ * Typosquat Index
+ *
+ * Symmetric-delete (SymSpell-style) edit-distance index over protected brand
+ * domains. Every brand name is expanded into its deletion variants once at
+ * startup; a host label is answered by generating its own deletions and
+ * probing the map, so lookups cost the same for ten brands or ten thousand.
+ *
+ * Only the registrable-domain label of a host is compared by edit distance.
+ * Brand names in subdomains count only under suspicious registrable domains,
+ * and a brand's own country sites (google.co.uk, amazon.de) are official.
+ */
+
+import { DomainSuffixIndex, normalizeDomain, registrableDomain } from './domainSuffixIndex.js';
+
+/**
+ * ASCII look-alike sequences folded before comparison
+ */
+const CONFUSABLE_SEQUENCES = [
+    ['rn', 'm'],
+    ['vv', 'w'],
+    ['cl', 'd'],
+];
+
+const CONFUSABLE_CHARS = {
+    0: 'o',
+    1: 'l',
+    3: 'e',
+    4: 'a',
+    5: 's',
+    7: 't',
+    8: 'b',
+    '@': 'a',
+    '$': 's',
+    '|': 'l',
+};
+
+/**
+ * QWERTY rows; keys in adjacent positions are plausible fat-finger typos
+ */
+const KEYBOARD_ROWS = ['1234567890', 'qwertyuiop', 'asdfghjkl', 'zxcvbnm'];
+
+const KEYBOARD_NEIGHBORS = (() => {
+    const neighbors = new Map();
+    const link = (a, b) => {
+        if (!a || !b) return;
+        neighbors.set(a, (neighbors.get(a) ?? '') + b);
+        neighbors.set(b, (neighbors.get(b) ?? '') + a);
+    };
+
+    KEYBOARD_ROWS.forEach((row, r) => {
+        for (let c = 0; c < row.length; c++) {
+            link(row[c], row[c + 1]);
+            // Each row is offset half a key to the right of the one above
+            link(row[c], KEYBOARD_ROWS[r + 1]?.[c]);
+            link(row[c + 1], KEYBOARD_ROWS[r + 1]?.[c]);
+        }
+    });
+    return neighbors;
+})();
+
+/**
+ * Substitution cost for typo matching: keyboard neighbours cost one edit,
+ * any other letter swap costs two (blockchair is not a typo of blockchain)
+ */
+const typoSubstitutionCost = (a, b) => (KEYBOARD_NEIGHBORS.get(a)?.includes(b) ? 1 : 2);
+
+/**
+ * Fold common look-alike characters to their canonical Latin form
+ */
+export const foldConfusables = (label) => {
+    let folded = '';
+    for (const char of label) {
+        folded += CONFUSABLE_CHARS[char] ?? char;
+    }
+    for (const [sequence, replacement] of CONFUSABLE_SEQUENCES) {
+        if (folded.includes(sequence)) {
+            folded = folded.split(sequence).join(replacement);
+        }
+    }
+    return folded;
+};
+
+/**
+ * Optimal string alignment distance (Levenshtein plus adjacent transpositions)
+ * with early exit once every cell in a row exceeds maxDistance
+ * @param {Function} substitutionCost - Cost of replacing one character with another (>= 1)
+ */
+export const editDistance = (a, b, maxDistance = Infinity, substitutionCost = () => 1) => {
+    if (Math.abs(a.length - b.length) > maxDistance) {
+        return maxDistance + 1;
+    }
+
+    let previousPrevious = new Array(b.length + 1).fill(0);
+    let previous = Array.from({ length: b.length + 1 }, (_, j) => j);
+    let current = new Array(b.length + 1).fill(0);
+
+    for (let i = 1; i <= a.length; i++) {
+        current[0] = i;
+        let rowMin = current[0];
+
+        for (let j = 1; j <= b.length; j++) {
+            const cost = a[i - 1] === b[j - 1] ? 0 : substitutionCost(a[i - 1], b[j - 1]);
+            let value = Math.min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + cost
+            );
+            if (i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+                value = Math.min(value, previousPrevious[j - 2] + 1);
+            }
+            current[j] = value;
+            rowMin = Math.min(rowMin, value);
+        }
+
+        if (rowMin > maxDistance) {
+            return maxDistance + 1;
+        }
+        [previousPrevious, previous, current] = [previous, current, previousPrevious];
+    }
+
+    return previous[b.length];
+};
+
+/**
+ * All strings reachable from word by deleting up to maxDeletes characters
+ */
+const deletionVariants = (word, maxDeletes) => {
+    const variants = new Set([word]);
+    let frontier = [word];
+
+    for (let depth = 0; depth < maxDeletes; depth++) {
+        const next = [];
+        for (const item of frontier) {
+            for (let i = 0; i < item.length; i++) {
+                const variant = item.slice(0, i) + item.slice(i + 1);
+                if (!variants.has(variant)) {
+                    variants.add(variant);
+                    next.push(variant);
+                }
+            }
+        }
+        frontier = next;
+    }
+
+    return variants;
+};
+
+/**
+ * Allowed edit distance for a brand name of a given length: short names
+ * need exact (folded) matches, six-letter names allow one edit only when
+ * the label also used look-alike characters, longer ones tolerate more typos
+ * @returns {{plain: number, confusable: number}}
+ */
+const allowedDistance = (length, maxDistance) => {
+    let plain = 0;
+    let confusable = 0;
+    if (length >= 12) {
+        plain = confusable = 2;
+    } else if (length >= 7) {
+        plain = confusable = 1;
+    } else if (length === 6) {
+        confusable = 1;
+    }
+    return { plain: Math.min(plain, maxDistance), confusable: Math.min(confusable, maxDistance) };
+};
+
+/**
+ * Edit-distance index over protected brand domains
+ */
+export class TyposquatIndex {
+    /**
+     * @param {Iterable<string>} brandDomains - Official domains (e.g., 'paypal.com'),
+     *   optionally followed by owned alternates ('dropbox.com|dropbox.net')
+     * @param {Object} options
+     * @param {number} options.maxDistance - Upper bound on edit distance
+     * @param {Iterable<string>} options.suspiciousSuffixes - TLDs and domains under which
+     *   brand names in subdomains are flagged and country sites are not trusted
+     */
+    constructor(brandDomains = [], { maxDistance = 2, suspiciousSuffixes = [] } = {}) {
+        this.maxDistance = maxDistance;
+        this._official = new DomainSuffixIndex();
+        this._suspicious = new DomainSuffixIndex(suspiciousSuffixes);
+        this._brandNames = new Set();
+        this._brands = [];
+        this._deletes = new Map();
+        this._longestName = 0;
+
+        for (const domain of brandDomains) {
+            this.add(domain);
+        }
+    }
+
+    /**
+     * Number of protected brands
+     */
+    get size() {
+        return this._brands.length;
+    }
+
+    /**
+     * Protect a brand domain
+     * @param {string} entry - Official domain, optionally with '|'-separated owned alternates
+     */
+    add(entry) {
+        const [normalized, ...alternates] = String(entry).split('|').map(normalizeDomain);
+        const name = normalized.split('.')[0];
+        for (const alternate of alternates) {
+            if (alternate) this._official.add(alternate);
+        }
+        if (!name || this._official.has(normalized)) {
+            return this;
+        }
+
+        const folded = foldConfusables(name);
+        const id = this._brands.length;
+        const allowed = allowedDistance(folded.length, this.maxDistance);
+        const brand = {
+            domain: normalized,
+            raw: name,
+            name: folded,
+            maxDistance: allowed.plain,
+            confusableDistance: allowed.confusable,
+        };
+        this._brands.push(brand);
+        this._brandNames.add(name);
+        this._official.add(normalized);
+        this._longestName = Math.max(this._longestName, folded.length);
+
+        for (const variant of deletionVariants(folded, brand.confusableDistance)) {
+            const ids = this._deletes.get(variant);
+            if (ids) {
+                ids.push(id);
+            } else {
+                this._deletes.set(variant, [id]);
+            }
+        }
+
+        return this;
+    }
+
+    /**
+     * Find a protected brand the label imitates or copies. The brand name
+     * itself matches at distance 0; callers decide whether the host is the
+     * brand's own domain (see match()).
+     * @param {string} label - Host label as written
+     * @param {string} skeleton - Label with non-ASCII look-alikes already mapped to Latin
+     * @param {Object} options
+     * @param {boolean} options.exact - Only match labels that fold to a brand name
+     * @returns {{brand: string, distance: number}|null}
+     */
+    matchLabel(label, skeleton = label, { exact = false } = {}) {
+        const folded = foldConfusables(skeleton);
+        const confusable = folded !== label;
+        const queryDeletes = Math.min(2, this.maxDistance);
+        if (folded.length > this._longestName + queryDeletes) {
+            return null;
+        }
+
+        let best = null;
+        const seen = new Set();
+
+        for (const variant of deletionVariants(folded, queryDeletes)) {
+            const ids = this._deletes.get(variant);
+            if (!ids) continue;
+
+            for (const id of ids) {
+                if (seen.has(id)) continue;
+                seen.add(id);
+
+                const brand = this._brands[id];
+                const allowed = exact ? 0 : confusable ? brand.confusableDistance : brand.maxDistance;
+                const distance = editDistance(folded, brand.name, allowed, typoSubstitutionCost);
+                if (distance > allowed) continue;
+
+                // Look-alike characters folded to the brand still count as an edit
+                const rawDistance = distance === 0 && label === brand.raw ? 0 : Math.max(distance, 1);
+                if (!best || rawDistance < best.distance) {
+                    best = { brand: brand.domain, distance: rawDistance };
+                }
+            }
+        }
+
+        return best;
+    }
+
+    /**
+     * Whether a registrable domain is a brand's own country site
+     * (google.co.uk, amazon.de, paypal.me) rather than a suspicious TLD
+     */
+    _isCountrySite(registrable) {
+        const dot = registrable.indexOf('.');
+        const tld = registrable.slice(registrable.lastIndexOf('.') + 1);
+        return tld.length === 2 &&
+            this._brandNames.has(registrable.slice(0, dot)) &&
+            !this._suspicious.has(registrable);
+    }
+
+    /**
+     * Check whether a host imitates a protected brand.
+     *
+     * The registrable-domain label is compared by edit distance (paypa1.com,
+     * paypal.net). A brand name in a subdomain (paypal.secure-login.tk) only
+     * counts when the registrable domain is itself suspicious. Official
+     * domains, owned alternates, country sites and their subdomains never match.
+     * @param {string} host - Hostname
+     * @returns {{brand: string, label: string, distance: number}|null}
+     */
+    match(host) {
+        const name = normalizeDomain(host);
+        const registrable = registrableDomain(name);
+        if (!registrable || this._official.has(name) || this._isCountrySite(registrable)) {
+            return null;
+        }
+
+        const label = registrable.split('.')[0];
+        const found = this.matchLabel(label);
+        if (found) {
+            return { ...found, label };
+        }
+
+        if (!this._suspicious.has(registrable)) {
+            return null;
+        }
+
+        const subdomains = name.split('.').slice(0, -registrable.split('.').length);
+        for (const subdomain of subdomains) {
+            const impersonated = this.matchLabel(subdomain, subdomain, { exact: true });
+            if (impersonated) {
+                return { ...impersonated, label: subdomain };
+            }
+        }
+
+        return null;
+    }
+}
+
+export default TyposquatIndex;
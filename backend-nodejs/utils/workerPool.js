@@ -0,0 +1,175 @@
+/**
+ * Worker Pool
+ *
+ * Fixed-size pool of worker threads for CPU-bound work that would otherwise
+ * block the event loop. Tasks are queued FIFO and handed to the first idle
+ * worker. Workers start on first use and only keep the process alive while
+ * busy; a worker that crashes fails its task and is replaced on the next one.
+ *
+ * A worker script receives { id, data } messages and answers each with
+ * { id, result } or { id, error } (see services/localScoringWorker.js).
+ */
+
+import { Worker } from 'worker_threads';
+import { LatencyWindow } from './latencyWindow.js';
+
+/**
+ * Pool of identical worker threads
+ */
+export class WorkerPool {
+    /**
+     * @param {URL|string} script - Worker module
+     * @param {Object} options
+     * @param {number} options.size - Number of worker threads
+     */
+    constructor(script, { size = 1 } = {}) {
+        if (!(size >= 1)) {
+            throw new Error('WorkerPool size must be at least 1');
+        }
+
+        this.script = script;
+        this.size = size;
+        this._workers = [];
+        this._idle = [];
+        this._queue = [];
+        this._nextId = 0;
+        this._latency = new LatencyWindow(500);
+
+        this.completed = 0;
+        this.failed = 0;
+        this.crashed = 0;
+    }
+
+    /**
+     * Tasks waiting for a worker
+     */
+    get queued() {
+        return this._queue.length;
+    }
+
+    /**
+     * Run one task on the next idle worker
+     * @param {*} data - Structured-cloneable task input
+     * @returns {Promise<*>} The worker's result
+     */
+    run(data) {
+        return new Promise((resolve, reject) => {
+            this._queue.push({ id: ++this._nextId, data, resolve, reject, startedAt: 0 });
+            this._dispatch();
+        });
+    }
+
+    /**
+     * Hand queued tasks to idle workers, starting workers up to the pool size
+     */
+    _dispatch() {
+        while (this._queue.length > 0) {
+            if (this._idle.length === 0 && this._workers.length < this.size) {
+                this._spawn();
+            }
+
+            const slot = this._idle.pop();
+            if (!slot) {
+                return;
+            }
+
+            const task = this._queue.shift();
+            task.startedAt = performance.now();
+            slot.task = task;
+            slot.worker.ref();
+            slot.worker.postMessage({ id: task.id, data: task.data });
+        }
+    }
+
+    /**
+     * Start one worker and wire its replies and failures
+     */
+    _spawn() {
+        const slot = { worker: new Worker(this.script), task: null };
+        slot.worker.unref();
+
+        slot.worker.on('message', ({ id, result, error }) => {
+            const { task } = slot;
+            if (!task || task.id !== id) {
+                return;
+            }
+
+            slot.task = null;
+            slot.worker.unref();
+            this._latency.record(performance.now() - task.startedAt);
+            if (error) {
+                this.failed++;
+                task.reject(new Error(error));
+            } else {
+                this.completed++;
+                task.resolve(result);
+            }
+
+            this._idle.push(slot);
+            this._dispatch();
+        });
+
+        const retire = (error) => {
+            if (!this._workers.includes(slot)) {
+                return;
+            }
+
+            this.crashed++;
+            this._workers.splice(this._workers.indexOf(slot), 1);
+            const idleAt = this._idle.indexOf(slot);
+            if (idleAt >= 0) {
+                this._idle.splice(idleAt, 1);
+            }
+
+            if (slot.task) {
+                this.failed++;
+                slot.task.reject(error);
+                slot.task = null;
+            }
+            this._dispatch();
+        };
+
+        slot.worker.on('error', retire);
+        slot.worker.on('exit', (code) => retire(new Error(`Worker exited with code ${code}`)));
+
+        this._workers.push(slot);
+        this._idle.push(slot);
+    }
+
+    /**
+     * Stop every worker; queued tasks are rejected
+     */
+    async close() {
+        const workers = this._workers.splice(0);
+        this._idle = [];
+
+        for (const task of this._queue.splice(0)) {
+            task.reject(new Error('Worker pool closed'));
+        }
+        for (const { task } of workers) {
+            task?.reject(new Error('Worker pool closed'));
+        }
+
+        await Promise.all(workers.map(({ worker }) => worker.terminate()));
+    }
+
+    /**
+     * Counter snapshot
+     */
+    stats() {
+        const round = (ms) => (Number.isNaN(ms) ? null : Math.round(ms * 1000) / 1000);
+        return {
+            size: this.size,
+            started: this._workers.length,
+            busy: this._workers.length - this._idle.length,
+            queued: this._queue.length,
+            completed: this.completed,
+            failed: this.failed,
+            crashed: this.crashed,
+            task_p50_ms: round(this._latency.percentile(0.5)),
+            task_p99_ms: round(this._latency.percentile(0.99)),
+        };
+    }
+}
+
+export default WorkerPool;